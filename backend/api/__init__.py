@@ -3,6 +3,7 @@ from .endpoints import router
 from .models import (
     ChartGenerationRequest,
     ChartGenerationResponse,
+    GenerationMode,
     AsyncJobResponse,
     JobStatusResponse,
     DatabaseStatusResponse,
@@ -14,6 +15,7 @@ __all__ = [
     'router',
     'ChartGenerationRequest',
     'ChartGenerationResponse',
+    'GenerationMode',
     'AsyncJobResponse', 
     'JobStatusResponse',
     'DatabaseStatusResponse',
@@ -2,10 +2,13 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import os
+import threading
 from dotenv import load_dotenv
 
-from .endpoints import router
+from .endpoints import router, chart_workers
+from .services import init_services, get_services
 from .models import ErrorResponse
+from database.index_advisor import INDEX_ADVISOR
 
 # Load environment variables
 load_dotenv()
@@ -92,12 +95,29 @@ async def startup_event():
         os.makedirs("chroma_db")
         print("📁 Created chroma_db directory for vector storage")
     
+    # Build the shared pipeline components once for every job
+    services = init_services()
+    print("✅ Pipeline services initialized")
+    
+    # Warm up in the background; /ready reports 503 until it finishes
+    if os.getenv("STARTUP_WARMUP", "true").lower() == "true":
+        threading.Thread(target=services.warm_up, name="startup-warm-up", daemon=True).start()
+        print("🔥 Warming up embedding model and schema catalog...")
+    else:
+        services.mark_ready()
+    
+    # Index hot columns of uploaded tables in the background
+    if INDEX_ADVISOR:
+        services.index_advisor.start()
+    
     print("✅ AI Dashboard API is ready!")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Shutdown event handler"""
     print("🛑 AI Dashboard API shutting down...")
+    chart_workers.shutdown()
+    get_services().index_advisor.stop()
 
 if __name__ == "__main__":
     import uvicorn
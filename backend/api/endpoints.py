@@ -1,35 +1,67 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import Dict, Any
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Dict, Any, List, Optional
 import uuid
 import asyncio
+import os
 from datetime import datetime
 import traceback
 
+from .job_events import JobEventBroker
+from .job_store import create_job_store
+from .services import ServiceContainer, get_services
 from .models import (
     ChartGenerationRequest, ChartGenerationResponse, AsyncJobResponse, 
     JobStatusResponse, DatabaseStatusResponse, DatabaseTable, 
     ErrorResponse, JobStatus
 )
 
-from prompt_enhancement import PromptEnhancer
-from query_generation import QueryExecutor, DataProcessor
-from chart_generation import ComponentGenerator
-from database import DatabaseManager
+from query_generation import DataProcessor
+from chart_generation.component_generator import component_shape_cache
+from knowledge_base.chroma_manager import embedding_cache
+from utils import PipelineCache, SingleFlight, WorkerPool, WorkerPoolFullError, get_llm_client
 
 # Router instance
 router = APIRouter()
 
-# In-memory job storage (in production, use Redis or database)
-jobs_storage: Dict[str, Dict[str, Any]] = {}
+# Job storage with TTL eviction (JOB_STORE=sqlite to share jobs between workers)
+job_store = create_job_store()
+
+# Pushes job updates to /job-events subscribers as soon as they happen
+job_events = JobEventBroker()
+
+# Seconds between server-side re-checks of a streamed job (covers updates made by other workers)
+JOB_EVENTS_HEARTBEAT = float(os.getenv("JOB_EVENTS_HEARTBEAT", "2"))
+
+TERMINAL_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED)
+
+# Stream LLM tokens for component generation and forward partial code to the job
+COMPONENT_STREAMING = os.getenv("COMPONENT_STREAMING", "true").lower() == "true"
+
+# Staged cache of pipeline outputs (SQL plans and finished components)
+pipeline_cache = PipelineCache(
+    max_size=int(os.getenv("PIPELINE_CACHE_SIZE", "256")),
+    ttl_seconds=float(os.getenv("PIPELINE_CACHE_TTL", "3600"))
+)
+
+# Identical in-flight requests attach to a single background computation
+inflight_jobs = SingleFlight()
+
+# Dedicated executor so blocking Groq/SQLite/pandas work never runs on the event loop
+chart_workers = WorkerPool(
+    max_workers=int(os.getenv("CHART_WORKERS", "4")),
+    max_queue_depth=int(os.getenv("CHART_QUEUE_DEPTH", "32")),
+    process_workers=int(os.getenv("CHART_PROCESS_WORKERS", "0"))
+)
 
 @router.post("/generate-chart", response_model=AsyncJobResponse)
-async def generate_chart(request: ChartGenerationRequest, background_tasks: BackgroundTasks):
+async def generate_chart(request: ChartGenerationRequest, services: ServiceContainer = Depends(get_services)):
     """
     Generate a chart component asynchronously from user prompt
     
     Args:
         request: Chart generation request with prompt
-        background_tasks: FastAPI background tasks
+        services: Shared pipeline components
         
     Returns:
         Job ID for tracking the async generation process
@@ -39,7 +71,7 @@ async def generate_chart(request: ChartGenerationRequest, background_tasks: Back
         job_id = str(uuid.uuid4())
         
         # Initialize job in storage
-        jobs_storage[job_id] = {
+        job_store.create({
             "id": job_id,
             "status": JobStatus.PENDING,
             "prompt": request.prompt,
@@ -49,10 +81,51 @@ async def generate_chart(request: ChartGenerationRequest, background_tasks: Back
             "result": None,
             "error_message": None,
             "completed_at": None
-        }
+        })
         
-        # Start background task
-        background_tasks.add_task(process_chart_generation, job_id, request.prompt)
+        # Serve exact repeats straight from the pipeline cache
+        db_manager = services.db_manager
+        schema_version = db_manager.get_schema_version()
+        data_version = db_manager.get_data_version()
+        generation_mode = request.generation_mode.value if request.generation_mode else ""
+        cached_result = pipeline_cache.get_result(request.prompt, schema_version, data_version, generation_mode)
+        
+        if cached_result is not None:
+            _update_jobs([job_id], _completed_fields(cached_result))
+            return AsyncJobResponse(
+                job_id=job_id,
+                status=JobStatus.COMPLETED,
+                message="Chart served from cache."
+            )
+        
+        # Attach to an identical in-flight computation if there is one
+        flight_key = pipeline_cache.result_key(request.prompt, schema_version, data_version, generation_mode)
+        
+        if not inflight_jobs.join(flight_key, job_id):
+            leader_job = job_store.get(inflight_jobs.leader(flight_key) or "") or {}
+            
+            # Copy the leader's progress only if the leader hasn't already published to this job
+            job_store.update(job_id, {
+                "status": leader_job.get("status", JobStatus.PENDING),
+                "progress": leader_job.get("progress", 0)
+            }, expected_status=JobStatus.PENDING)
+            status = (job_store.get(job_id) or {}).get("status", JobStatus.PENDING)
+            
+            return AsyncJobResponse(
+                job_id=job_id,
+                status=status,
+                message="Identical chart generation already in progress. Use the job ID to check status."
+            )
+        
+        # Hand the job to the worker pool
+        try:
+            chart_workers.submit(
+                process_chart_generation, job_id, request.prompt, flight_key, generation_mode, services
+            )
+        except WorkerPoolFullError as e:
+            inflight_jobs.finish(flight_key)
+            job_store.delete(job_id)
+            raise HTTPException(status_code=503, detail=f"Server busy, try again later: {str(e)}")
         
         return AsyncJobResponse(
             job_id=job_id,
@@ -60,6 +133,8 @@ async def generate_chart(request: ChartGenerationRequest, background_tasks: Back
             message="Chart generation started. Use the job ID to check status."
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -77,26 +152,77 @@ async def get_job_status(job_id: str):
     Returns:
         Current job status and result if completed
     """
-    if job_id not in jobs_storage:
+    job = job_store.get(job_id)
+    
+    if job is None:
         raise HTTPException(
             status_code=404,
             detail="Job not found"
         )
     
-    job = jobs_storage[job_id]
+    return _job_status_response(job)
+
+@router.get("/job-events/{job_id}")
+async def stream_job_events(job_id: str):
+    """
+    Stream job progress as Server-Sent Events instead of polling /job-status
     
-    return JobStatusResponse(
-        job_id=job["id"],
-        status=job["status"],
-        progress=job.get("progress", 0),
-        result=job.get("result"),
-        error_message=job.get("error_message"),
-        created_at=job["created_at"],
-        completed_at=job.get("completed_at")
+    Each event's data is a JobStatusResponse JSON document. The stream starts
+    with the current state, pushes every stage transition as it happens and
+    closes after the completed/failed event.
+    
+    Args:
+        job_id: Unique job identifier
+        
+    Returns:
+        text/event-stream response
+    """
+    if job_store.get(job_id) is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Job not found"
+        )
+    
+    async def event_stream():
+        queue = job_events.subscribe(job_id)
+        
+        try:
+            # Read the snapshot after subscribing so no update falls in between
+            job = job_store.get(job_id)
+            if job is None:
+                return
+            
+            last_payload = _job_status_response(job).json()
+            yield f"data: {last_payload}\n\n"
+            
+            while job["status"] not in TERMINAL_STATUSES:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=JOB_EVENTS_HEARTBEAT)
+                    job.update(event)
+                except asyncio.TimeoutError:
+                    # Re-check the store in case another worker process owns the job
+                    job = job_store.get(job_id)
+                    if job is None:
+                        return
+                
+                payload = _job_status_response(job).json()
+                if payload == last_payload:
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                last_payload = payload
+                yield f"data: {payload}\n\n"
+        finally:
+            job_events.unsubscribe(job_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 @router.get("/database-status", response_model=DatabaseStatusResponse)
-async def get_database_status():
+async def get_database_status(services: ServiceContainer = Depends(get_services)):
     """
     Get current database status and available tables
     
@@ -104,7 +230,7 @@ async def get_database_status():
         Database information including all available tables
     """
     try:
-        db_manager = DatabaseManager()
+        db_manager = services.db_manager
         tables_info = db_manager.get_all_tables()
         
         # Convert to response format
@@ -143,14 +269,14 @@ async def delete_job(job_id: str):
     Returns:
         Success message
     """
-    if job_id not in jobs_storage:
+    job = job_store.get(job_id)
+    
+    if job is None:
         raise HTTPException(
             status_code=404,
             detail="Job not found"
         )
     
-    job = jobs_storage[job_id]
-    
     # Only allow deletion of completed or failed jobs
     if job["status"] in [JobStatus.PENDING, JobStatus.PROCESSING]:
         raise HTTPException(
@@ -158,7 +284,7 @@ async def delete_job(job_id: str):
             detail="Cannot delete job that is still processing"
         )
     
-    del jobs_storage[job_id]
+    job_store.delete(job_id)
     
     return {"message": "Job deleted successfully"}
 
@@ -170,8 +296,10 @@ async def list_jobs():
     Returns:
         List of all jobs with their current status
     """
+    jobs = job_store.list_jobs()
+    
     return {
-        "total_jobs": len(jobs_storage),
+        "total_jobs": len(jobs),
         "jobs": [
             {
                 "job_id": job["id"],
@@ -179,70 +307,191 @@ async def list_jobs():
                 "prompt": job["prompt"][:50] + "..." if len(job["prompt"]) > 50 else job["prompt"],
                 "created_at": job["created_at"]
             }
-            for job in jobs_storage.values()
+            for job in jobs
         ]
     }
 
-async def process_chart_generation(job_id: str, user_prompt: str):
+def _completed_fields(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Job fields for a completed job with a finished component result"""
+    return {
+        "status": JobStatus.COMPLETED,
+        "progress": 100,
+        "result": result["component_code"],
+        "chart_data": result.get("chart_data"),
+        "partial_result": None,
+        "component_name": result["component_name"],
+        "chart_type": result["chart_type"],
+        "completed_at": datetime.now().isoformat()
+    }
+
+def _job_status_response(job: Dict[str, Any]) -> JobStatusResponse:
+    """Convert a stored job into its API representation"""
+    return JobStatusResponse(
+        job_id=job["id"],
+        status=job["status"],
+        progress=job.get("progress", 0),
+        result=job.get("result"),
+        chart_data=job.get("chart_data"),
+        partial_result=job.get("partial_result"),
+        error_message=job.get("error_message"),
+        created_at=job["created_at"],
+        completed_at=job.get("completed_at")
+    )
+
+def _update_jobs(job_ids: List[str], fields: Dict[str, Any]):
+    """Apply the same update to every job sharing a computation and notify streams"""
+    for job_id in job_ids:
+        if job_store.update(job_id, fields):
+            job_events.publish(job_id, fields)
+
+def _flight_job_ids(job_id: str, flight_key: Optional[str]) -> List[str]:
+    """Get all job IDs currently attached to a computation"""
+    members = inflight_jobs.members(flight_key) if flight_key else []
+    return members or [job_id]
+
+def _finish_flight(job_id: str, flight_key: Optional[str], fields: Dict[str, Any]):
+    """Close the computation and publish its final state to every attached job"""
+    members = inflight_jobs.finish(flight_key) if flight_key else []
+    _update_jobs(members or [job_id], fields)
+
+# One DataProcessor per worker process (the main process uses the service container's)
+_process_data_processor: Optional[DataProcessor] = None
+
+def _process_query_results(sql_result, execution_results):
+    """Module-level data processing entry point so it can run in a worker process"""
+    global _process_data_processor
+    
+    if _process_data_processor is None:
+        _process_data_processor = DataProcessor()
+    return _process_data_processor.process_query_results(sql_result, execution_results)
+
+def process_chart_generation(
+    job_id: str, 
+    user_prompt: str, 
+    flight_key: Optional[str] = None, 
+    generation_mode: str = "",
+    services: Optional[ServiceContainer] = None
+):
     """
-    Background task to process chart generation
+    Worker pool job to process chart generation
+    
+    Runs synchronously on a chart worker thread; pandas processing is
+    offloaded to the process pool when CHART_PROCESS_WORKERS is set.
+    
+    Stages are served from the pipeline cache where possible: an exact
+    repeat returns the cached component, and a repeat after a data reload
+    reuses the cached SQL and re-runs only execution onward. Progress and
+    the final result are fanned out to every job attached to flight_key.
     
     Args:
-        job_id: Unique job identifier
+        job_id: Unique job identifier of the leading job
         user_prompt: User's prompt for chart generation
+        flight_key: Single-flight key shared by identical in-flight requests
+        generation_mode: Component generation mode ("" uses the server default)
+        services: Shared pipeline components (defaults to the application container)
     """
+    services = services or get_services()
+    
+    def set_progress(progress: int):
+        _update_jobs(_flight_job_ids(job_id, flight_key), {
+            "status": JobStatus.PROCESSING,
+            "progress": progress
+        })
+    
     try:
         # Update job status to processing
-        jobs_storage[job_id]["status"] = JobStatus.PROCESSING
-        jobs_storage[job_id]["progress"] = 10
-        
-        # Step 1: Enhance prompt
-        enhancer = PromptEnhancer()
-        enhancement_result = enhancer.enhance_prompt(user_prompt)
-        jobs_storage[job_id]["progress"] = 25
-        
-        if not enhancement_result.has_context and enhancement_result.sql_context.strip() == "No database tables available.":
-            raise Exception("No database tables available. Please process data files first.")
-        
-        # Step 2: Generate and execute SQL
-        executor = QueryExecutor()
-        sql_result, execution_results = executor.execute_sql_generation(
-            enhancement_result.enhanced_prompt,
-            enhancement_result.sql_context
-        )
-        jobs_storage[job_id]["progress"] = 50
+        set_progress(10)
+        
+        db_manager = services.db_manager
+        schema_version = db_manager.get_schema_version()
+        data_version = db_manager.get_data_version()
+        
+        cached_result = pipeline_cache.get_result(user_prompt, schema_version, data_version, generation_mode)
+        if cached_result is not None:
+            _finish_flight(job_id, flight_key, _completed_fields(cached_result))
+            return
+        
+        executor = services.query_executor
+        cached_plan = pipeline_cache.get_plan(user_prompt, schema_version)
+        
+        if cached_plan is not None:
+            # Step 1+2 (cached): reuse enhancement and SQL, execute against current data
+            enhancement_result, sql_result = cached_plan
+            set_progress(25)
+            execution_results = executor.execute_generated_sql(sql_result, enhancement_result.sql_context)
+        else:
+            # Step 1: Enhance prompt
+            enhancement_result = services.prompt_enhancer.enhance_prompt(user_prompt)
+            set_progress(25)
+            
+            if not enhancement_result.has_context and enhancement_result.sql_context.strip() == "No database tables available.":
+                raise Exception("No database tables available. Please process data files first.")
+            
+            # Step 2: Generate and execute SQL
+            sql_result, execution_results = executor.execute_sql_generation(
+                enhancement_result.enhanced_prompt,
+                enhancement_result.sql_context
+            )
+            
+            if sql_result.success and any(result.success for result in execution_results):
+                pipeline_cache.set_plan(user_prompt, schema_version, enhancement_result, sql_result)
+        
+        set_progress(50)
         
         if not sql_result.success:
             raise Exception(f"SQL generation failed: {sql_result.error_message}")
         
-        # Step 3: Process data
-        processor = DataProcessor()
-        processed_data = processor.process_query_results(sql_result, execution_results)
-        jobs_storage[job_id]["progress"] = 75
+        # Step 3: Process data (in a worker process when CHART_PROCESS_WORKERS is set)
+        if chart_workers.process_pool is not None:
+            processed_data = chart_workers.run_cpu_bound(_process_query_results, sql_result, execution_results)
+        else:
+            processed_data = services.data_processor.process_query_results(sql_result, execution_results)
+        set_progress(75)
         
         if not processed_data.success:
             raise Exception(f"Data processing failed: {processed_data.error_message}")
         
-        # Step 4: Generate React component
-        component_generator = ComponentGenerator()
-        component_result = component_generator.generate_component(processed_data, user_prompt)
+        # Step 4: Generate React component (code is data-independent, so reuse it across reloads)
+        component = pipeline_cache.get_component(user_prompt, schema_version, generation_mode)
         
-        if not component_result.success:
-            # Try fallback component
-            component_result = component_generator.generate_fallback_component(
-                processed_data, 
-                component_result.error_message or "Component generation failed"
+        if component is None:
+            component_generator = services.component_generator
+            on_partial = None
+            if COMPONENT_STREAMING:
+                def on_partial(partial_code: str):
+                    _update_jobs(_flight_job_ids(job_id, flight_key), {"partial_result": partial_code})
+            
+            component_result = component_generator.generate_component(
+                processed_data, user_prompt, on_partial, generation_mode or None
             )
+            cacheable = component_result.success
+            
+            if not component_result.success:
+                # Try fallback component (never cached so the next request retries the LLM)
+                component_result = component_generator.generate_fallback_component(
+                    processed_data, 
+                    component_result.error_message or "Component generation failed"
+                )
+            
+            component = {
+                "component_code": component_result.component_code,
+                "component_name": component_result.component_name,
+                "chart_type": component_result.chart_type
+            }
+            
+            if cacheable:
+                pipeline_cache.set_component(user_prompt, schema_version, component, generation_mode)
+        else:
+            cacheable = True
         
-        # Update job with result
-        jobs_storage[job_id].update({
-            "status": JobStatus.COMPLETED,
-            "progress": 100,
-            "result": component_result.component_code,
-            "component_name": component_result.component_name,
-            "chart_type": component_result.chart_type,
-            "completed_at": datetime.now().isoformat()
-        })
+        # The dataset travels next to the component instead of inside its code
+        result = {**component, "chart_data": processed_data.chart_data}
+        
+        if cacheable:
+            pipeline_cache.set_result(user_prompt, schema_version, data_version, result, generation_mode)
+        
+        # Update every attached job with the result
+        _finish_flight(job_id, flight_key, _completed_fields(result))
         
     except Exception as e:
         # Update job with error
@@ -252,12 +501,57 @@ async def process_chart_generation(job_id: str, user_prompt: str):
         print(f"Chart generation error for job {job_id}: {error_message}")
         print(f"Full traceback: {traceback.format_exc()}")
         
-        jobs_storage[job_id].update({
+        _finish_flight(job_id, flight_key, {
             "status": JobStatus.FAILED,
+            "partial_result": None,
             "error_message": error_message,
             "completed_at": datetime.now().isoformat()
         })
 
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """
+    Get pipeline cache statistics (for debugging/monitoring)
+    
+    Returns:
+        Hit/miss counts for the pipeline cache stages, component shape cache and prompt embedding cache
+    """
+    return {
+        **pipeline_cache.stats(),
+        "component_shapes": component_shape_cache.stats(),
+        "embeddings": embedding_cache.stats()
+    }
+
+@router.get("/worker-stats")
+async def get_worker_stats():
+    """
+    Get chart worker pool utilization (for debugging/monitoring)
+    
+    Returns:
+        Running, queued and rejected job counts
+    """
+    return chart_workers.stats()
+
+@router.get("/llm-stats")
+async def get_llm_stats():
+    """
+    Get shared LLM client metrics (for debugging/monitoring)
+    
+    Returns:
+        Per-model call counts, retries, latency percentiles and token usage
+    """
+    return get_llm_client().stats()
+
+@router.get("/index-advisor")
+async def get_index_advisor_report(services: ServiceContainer = Depends(get_services)):
+    """
+    Get the index advisor's report (for debugging/monitoring)
+    
+    Returns:
+        Automatic indexes with before/after query times, and the hottest filter/group/sort columns
+    """
+    return services.index_advisor.report()
+
 @router.get("/health")
 async def health_check():
     """Simple health check endpoint"""
@@ -265,4 +559,18 @@ async def health_check():
         "status": "healthy",
         "message": "AI Dashboard API is running",
         "timestamp": datetime.now().isoformat()
-    }
\ No newline at end of file
+    }
+
+@router.get("/ready")
+async def readiness_check(services: ServiceContainer = Depends(get_services)):
+    """
+    Readiness check: 503 until the startup warm-up has finished, or if a required step failed
+    
+    Unlike /health (process is alive), this tells load balancers when the
+    instance can serve chart generation without cold-start latency.
+    """
+    readiness = services.readiness
+    return JSONResponse(
+        status_code=200 if readiness['ready'] else 503,
+        content={**readiness, "timestamp": datetime.now().isoformat()}
+    )
\ No newline at end of file
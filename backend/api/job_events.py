@@ -0,0 +1,64 @@
+import asyncio
+import threading
+from typing import Any, Dict, List, Tuple
+
+class JobEventBroker:
+    """
+    Fan out job updates to streaming (SSE) subscribers
+
+    Subscribers live on the event loop while updates are published from
+    chart worker threads, so delivery goes through call_soon_threadsafe.
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """Register a subscriber for a job (must be called from the event loop)"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            self._subscribers.setdefault(job_id, []).append((loop, queue))
+
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        """Remove a subscriber"""
+        with self._lock:
+            subscribers = [sub for sub in self._subscribers.get(job_id, []) if sub[1] is not queue]
+
+            if subscribers:
+                self._subscribers[job_id] = subscribers
+            else:
+                self._subscribers.pop(job_id, None)
+
+    def publish(self, job_id: str, event: Dict[str, Any]):
+        """Deliver an event to every subscriber of a job (safe from any thread)"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(job_id, []))
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, event)
+            except RuntimeError:
+                # Event loop already closed (subscriber went away during shutdown)
+                continue
+
+    def _offer(self, queue: asyncio.Queue, event: Dict[str, Any]):
+        # Events are partial field updates, so a slow consumer's backlog is
+        # coalesced into one merged update (later values win) instead of
+        # dropping events whose fields may never be sent again
+        if queue.full():
+            merged: Dict[str, Any] = {}
+            while not queue.empty():
+                merged.update(queue.get_nowait())
+            merged.update(event)
+            event = merged
+        queue.put_nowait(event)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subs) for subs in self._subscribers.values())
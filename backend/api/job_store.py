@@ -0,0 +1,283 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Jobs that are done; only these are evicted to stay under max_jobs
+TERMINAL_STATUSES = ("completed", "failed")
+
+class JobStore(ABC):
+    """Storage interface for async chart generation jobs"""
+
+    @abstractmethod
+    def create(self, job: Dict[str, Any]):
+        """Store a new job (job['id'] is the key)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of a job, or None if missing or expired"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def update(self, job_id: str, fields: Dict[str, Any], expected_status: Optional[str] = None) -> bool:
+        """
+        Merge fields into an existing job
+
+        With expected_status the update is a compare-and-set: it is only
+        applied if the job's current status equals expected_status.
+
+        Returns:
+            False if the job does not exist (or its status didn't match)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, job_id: str) -> bool:
+        """Remove a job; returns False if the job does not exist"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """List all live jobs, oldest first"""
+        raise NotImplementedError
+
+    def __contains__(self, job_id: str) -> bool:
+        return self.get(job_id) is not None
+
+class InMemoryJobStore(JobStore):
+    """
+    Process-local job store with LRU + TTL eviction
+
+    Jobs expire ttl_seconds after their last update. When more than max_jobs
+    are held, the least recently touched finished jobs are evicted; pending
+    and processing jobs are never evicted for space, so pollers don't get 404s.
+    """
+
+    def __init__(self, max_jobs: int = 1000, ttl_seconds: float = 3600):
+        self.max_jobs = max_jobs
+        self.ttl_seconds = ttl_seconds
+        self._jobs: "OrderedDict[str, tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, job: Dict[str, Any]):
+        with self._lock:
+            self._jobs[job["id"]] = (dict(job), time.time())
+            self._jobs.move_to_end(job["id"])
+            self._evict()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._jobs.get(job_id)
+
+            if entry is None:
+                return None
+
+            job, updated_at = entry
+            if time.time() - updated_at > self.ttl_seconds:
+                del self._jobs[job_id]
+                return None
+
+            self._jobs.move_to_end(job_id)
+            return dict(job)
+
+    def update(self, job_id: str, fields: Dict[str, Any], expected_status: Optional[str] = None) -> bool:
+        with self._lock:
+            entry = self._jobs.get(job_id)
+
+            if entry is None:
+                return False
+
+            job, _ = entry
+            if expected_status is not None and job.get("status") != expected_status:
+                return False
+
+            job.update(fields)
+            self._jobs[job_id] = (job, time.time())
+            self._jobs.move_to_end(job_id)
+            return True
+
+    def delete(self, job_id: str) -> bool:
+        with self._lock:
+            return self._jobs.pop(job_id, None) is not None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._evict()
+            jobs = [dict(job) for job, _ in self._jobs.values()]
+
+        return sorted(jobs, key=lambda job: job.get("created_at", ""))
+
+    def _evict(self):
+        """Drop expired jobs, then least recently used finished jobs beyond max_jobs"""
+        cutoff = time.time() - self.ttl_seconds
+        for job_id in [jid for jid, (_, updated_at) in self._jobs.items() if updated_at < cutoff]:
+            del self._jobs[job_id]
+
+        overflow = len(self._jobs) - self.max_jobs
+        if overflow <= 0:
+            return
+
+        finished = [jid for jid, (job, _) in self._jobs.items() if job.get("status") in TERMINAL_STATUSES]
+
+        for job_id in finished[:overflow]:
+            del self._jobs[job_id]
+
+class SQLiteJobStore(JobStore):
+    """
+    SQLite-backed job store shared by all uvicorn worker processes
+
+    Jobs are stored as compact JSON and expire ttl_seconds after their
+    last update; expired rows are purged opportunistically on writes. Only
+    finished jobs are deleted to stay under max_jobs.
+    """
+
+    def __init__(self, db_path: str = "data/jobs.db", ttl_seconds: float = 3600, max_jobs: int = 1000):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_jobs = max_jobs
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self.init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout = 30000")
+        return conn
+
+    def init_database(self):
+        """Create the jobs table (WAL mode so readers never block the writer)"""
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    created_at TEXT,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_updated_at ON jobs (updated_at)")
+        finally:
+            conn.close()
+
+    def create(self, job: Dict[str, Any]):
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, data, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                (job["id"], self._dumps(job), job.get("created_at"), time.time())
+            )
+            self._purge(conn)
+        finally:
+            conn.close()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT data FROM jobs WHERE job_id = ? AND updated_at >= ?",
+                (job_id, time.time() - self.ttl_seconds)
+            ).fetchone()
+        finally:
+            conn.close()
+
+        return json.loads(row[0]) if row else None
+
+    def update(self, job_id: str, fields: Dict[str, Any], expected_status: Optional[str] = None) -> bool:
+        conn = self._connect()
+        try:
+            # Read-modify-write under a write lock so concurrent workers don't lose updates
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+
+            if row is None:
+                conn.execute("ROLLBACK")
+                return False
+
+            job = json.loads(row[0])
+            if expected_status is not None and job.get("status") != expected_status:
+                conn.execute("ROLLBACK")
+                return False
+
+            job.update(fields)
+            conn.execute(
+                "UPDATE jobs SET data = ?, updated_at = ? WHERE job_id = ?",
+                (self._dumps(job), time.time(), job_id)
+            )
+            conn.execute("COMMIT")
+            return True
+        finally:
+            conn.close()
+
+    def delete(self, job_id: str) -> bool:
+        conn = self._connect()
+        try:
+            cursor = conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT data FROM jobs WHERE updated_at >= ? ORDER BY created_at",
+                (time.time() - self.ttl_seconds,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        return [json.loads(row[0]) for row in rows]
+
+    def _purge(self, conn: sqlite3.Connection):
+        """Delete expired jobs and the oldest finished jobs beyond max_jobs"""
+        conn.execute("DELETE FROM jobs WHERE updated_at < ?", (time.time() - self.ttl_seconds,))
+
+        overflow = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] - self.max_jobs
+        if overflow <= 0:
+            return
+
+        placeholders = ", ".join("?" for _ in TERMINAL_STATUSES)
+        conn.execute(f"""
+            DELETE FROM jobs WHERE job_id IN (
+                SELECT job_id FROM jobs
+                WHERE json_extract(data, '$.status') IN ({placeholders})
+                ORDER BY updated_at LIMIT ?
+            )
+        """, (*TERMINAL_STATUSES, overflow))
+
+    def _dumps(self, job: Dict[str, Any]) -> str:
+        return json.dumps(job, separators=(',', ':'), default=str)
+
+def create_job_store() -> JobStore:
+    """
+    Create the job store selected by environment variables
+
+    JOB_STORE: "memory" (default, single process) or "sqlite" (shared between workers)
+    JOB_STORE_PATH: SQLite file for the sqlite backend
+    JOB_TTL_SECONDS / JOB_STORE_MAX_JOBS: eviction limits
+    """
+    backend = os.getenv("JOB_STORE", "memory").lower()
+    ttl_seconds = float(os.getenv("JOB_TTL_SECONDS", "3600"))
+    max_jobs = int(os.getenv("JOB_STORE_MAX_JOBS", "1000"))
+
+    if backend == "sqlite":
+        return SQLiteJobStore(
+            db_path=os.getenv("JOB_STORE_PATH", "data/jobs.db"),
+            ttl_seconds=ttl_seconds,
+            max_jobs=max_jobs
+        )
+
+    if backend != "memory":
+        raise ValueError(f"Unsupported JOB_STORE backend: {backend}")
+
+    return InMemoryJobStore(max_jobs=max_jobs, ttl_seconds=ttl_seconds)
@@ -2,10 +2,17 @@ from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from enum import Enum
 
+class GenerationMode(str, Enum):
+    """Component generation strategy"""
+    AUTO = "auto"          # Template for standard charts, LLM otherwise
+    TEMPLATE = "template"  # Templates only; fails instead of calling the LLM
+    LLM = "llm"            # Always generate with the LLM
+
 class ChartGenerationRequest(BaseModel):
     """Request model for chart generation"""
     prompt: str
     container_id: Optional[int] = 1
+    generation_mode: Optional[GenerationMode] = None
 
 class ChartGenerationResponse(BaseModel):
     """Response model for chart generation"""
@@ -34,6 +41,8 @@ class JobStatusResponse(BaseModel):
     status: JobStatus
     progress: Optional[int] = None
     result: Optional[str] = None
+    chart_data: Optional[List[Dict[str, Any]]] = None
+    partial_result: Optional[str] = None
     error_message: Optional[str] = None
     created_at: str
     completed_at: Optional[str] = None
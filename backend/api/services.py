@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from prompt_enhancement import PromptEnhancer
+from query_generation import QueryExecutor, DataProcessor
+from chart_generation import ComponentGenerator
+from database import DatabaseManager, SchemaAnalyzer, IndexAdvisor
+from knowledge_base import ChromaManager
+
+class ServiceContainer:
+    """
+    Application-scoped pipeline components shared by every job
+
+    Built once at startup so jobs don't reopen ChromaDB, reload the embedding
+    model or re-run database setup. Every component is safe to call from
+    concurrent chart worker threads.
+    """
+
+    def __init__(self, db_path: str = "data/prototype.db", chroma_path: str = "./chroma_db"):
+        self.db_manager = DatabaseManager(db_path)
+        self.schema_analyzer = SchemaAnalyzer(self.db_manager)
+        self.chroma_manager = ChromaManager(persist_directory=chroma_path)
+        self.prompt_enhancer = PromptEnhancer(
+            chroma_manager=self.chroma_manager,
+            schema_analyzer=self.schema_analyzer
+        )
+        self.index_advisor = IndexAdvisor(self.db_manager)
+        self.query_executor = QueryExecutor(self.db_manager, index_advisor=self.index_advisor)
+        self.data_processor = DataProcessor()
+        self.component_generator = ComponentGenerator()
+        self.readiness: Dict[str, Any] = {'status': 'starting', 'ready': False, 'steps': {}}
+
+    def warm_up(self) -> Dict[str, Any]:
+        """
+        Pay one-time startup costs before serving traffic
+
+        Loads the embedding model and vector index with a dummy query, then
+        primes the schema catalog so the first job doesn't run the per-table
+        analysis. The schema catalog is required: if it fails the service is
+        reported as failed and not ready, since no chart can be generated
+        without the database. A failed embedding model only degrades the
+        service (the pipeline already runs without knowledge base context).
+
+        Returns:
+            Readiness report with per-step status and duration
+        """
+        started_at = datetime.now().isoformat()
+        self.readiness = {'status': 'warming', 'ready': False, 'steps': {}, 'started_at': started_at}
+        steps = {}
+
+        for name, step, required in (
+            ('embedding_model', self._warm_embedding_model, False),
+            ('schema_catalog', self._prime_schema_catalog, True),
+        ):
+            step_started = time.perf_counter()
+            try:
+                steps[name] = {'status': 'ok', **step()}
+            except Exception as e:
+                steps[name] = {'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+            steps[name]['required'] = required
+            steps[name]['duration_ms'] = round((time.perf_counter() - step_started) * 1000, 1)
+            print(f"🔥 Warm-up {name}: {steps[name]['status']} ({steps[name]['duration_ms']:.0f}ms)")
+
+        failed = [name for name, step in steps.items() if step['status'] != 'ok']
+        required_failed = [name for name in failed if steps[name]['required']]
+        if required_failed:
+            status = 'failed'
+        else:
+            status = 'degraded' if failed else 'ready'
+
+        self.readiness = {
+            'status': status,
+            'ready': not required_failed,
+            'steps': steps,
+            'started_at': started_at,
+            'finished_at': datetime.now().isoformat()
+        }
+        return self.readiness
+
+    def mark_ready(self):
+        """Report ready without warming up (cold start)"""
+        self.readiness = {'status': 'cold', 'ready': True, 'steps': {}, 'finished_at': datetime.now().isoformat()}
+
+    def _warm_embedding_model(self) -> Dict[str, Any]:
+        return {'documents': self.chroma_manager.warm_up()}
+
+    def _prime_schema_catalog(self) -> Dict[str, Any]:
+        analysis = self.schema_analyzer.analyze_complete_schema()
+        self.db_manager.get_column_catalog()
+        return {'tables': len(analysis['tables'])}
+
+_services: Optional[ServiceContainer] = None
+_services_lock = threading.Lock()
+
+def init_services() -> ServiceContainer:
+    """
+    Build the application's service container (called at FastAPI startup)
+
+    DATABASE_PATH / CHROMA_PATH override the default storage locations.
+    """
+    global _services
+
+    with _services_lock:
+        if _services is None:
+            _services = ServiceContainer(
+                db_path=os.getenv("DATABASE_PATH", "data/prototype.db"),
+                chroma_path=os.getenv("CHROMA_PATH", "./chroma_db")
+            )
+
+    return _services
+
+def get_services() -> ServiceContainer:
+    """FastAPI dependency returning the shared service container"""
+    return _services if _services is not None else init_services()
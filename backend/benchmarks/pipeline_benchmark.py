@@ -0,0 +1,269 @@
+"""
+Chart Generation Pipeline Benchmarks
+
+Measures each pipeline stage against synthetic datasets with the offline stub
+LLM backend, so results reflect our own code rather than network latency.
+
+Usage (from the backend directory):
+- python -m benchmarks.pipeline_benchmark                      (compare against baselines)
+- python -m benchmarks.pipeline_benchmark --sizes 1k,100k      (subset of datasets)
+- python -m benchmarks.pipeline_benchmark --update-baseline    (record new baselines)
+
+Exits with status 1 when any stage regresses beyond the tolerance. The
+committed baselines.json covers the 1k and 100k datasets; timings are
+machine-specific, so re-record it when the reference hardware changes.
+"""
+
+import os
+
+# Benchmarks always run offline against the stub LLM, without rate limiting
+os.environ['LLM_BACKEND'] = 'stub'
+os.environ['LLM_STUB_LATENCY'] = 'fixed:0'
+os.environ['LLM_REQUESTS_PER_MINUTE'] = '0'
+os.environ['LLM_TOKENS_PER_MINUTE'] = '0'
+os.environ.pop('LLM_RECORD_PATH', None)
+
+import argparse
+import json
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from database import DatabaseManager, SchemaAnalyzer
+from knowledge_base import ChromaManager
+from prompt_enhancement import PromptEnhancer
+from query_generation import SQLGenerator, QueryExecutor, DataProcessor
+from query_generation.sql_generator import SQLGenerationResult
+from chart_generation import ComponentGenerator
+from utils import LRUCache
+
+DATASET_SIZES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+BASELINE_PATH = Path(__file__).parent / 'baselines.json'
+BENCHMARK_PROMPT = "show me total revenue by region"
+
+def build_dataset(row_count: int, seed: int = 42) -> pd.DataFrame:
+    """Generate a synthetic sales table with categorical, date and numeric columns"""
+    rng = np.random.default_rng(seed)
+    regions = np.array(['North', 'South', 'East', 'West', 'Central', 'Northeast', 'Northwest', 'Southeast', 'Southwest', 'Pacific'])
+    products = np.array([f"Product {i:03d}" for i in range(200)])
+    dates = pd.date_range('2020-01-01', periods=1461, freq='D').strftime('%Y-%m-%d').to_numpy()
+
+    return pd.DataFrame({
+        'region': regions[rng.integers(0, len(regions), row_count)],
+        'product': products[rng.integers(0, len(products), row_count)],
+        'order_date': dates[rng.integers(0, len(dates), row_count)],
+        'quantity': rng.integers(1, 50, row_count),
+        'revenue': np.round(rng.gamma(2.0, 150.0, row_count), 2)
+    })
+
+def measure(fn: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    """
+    Time a stage and record its peak Python memory
+
+    Timed runs happen without tracemalloc (it slows allocation-heavy code);
+    peak memory comes from one extra traced run.
+    """
+    durations = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - started_at)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    durations.sort()
+    p95_index = min(len(durations) - 1, int(round(0.95 * (len(durations) - 1))))
+
+    return {
+        'p50_ms': round(statistics.median(durations) * 1000, 3),
+        'p95_ms': round(durations[p95_index] * 1000, 3),
+        'mean_ms': round(statistics.mean(durations) * 1000, 3),
+        'peak_mb': round(peak / (1024 * 1024), 3),
+        'ops_per_sec': round(1 / statistics.mean(durations), 3) if statistics.mean(durations) > 0 else None
+    }
+
+def benchmark_dataset(size_label: str, row_count: int, iterations: int, work_dir: Path) -> Dict[str, Dict[str, float]]:
+    """Run every stage against one dataset size"""
+    print(f"\n📦 Dataset {size_label}: building {row_count:,} rows...")
+    csv_path = work_dir / f"sales_{size_label}.csv"
+    build_dataset(row_count).to_csv(csv_path, index=False)
+
+    db_manager = DatabaseManager(db_path=str(work_dir / f"bench_{size_label}.db"))
+    db_manager.load_file_to_database(str(csv_path), table_name='sales')
+
+    schema_analyzer = SchemaAnalyzer(db_manager)
+    chroma_manager = ChromaManager(persist_directory=str(work_dir / f"chroma_{size_label}"))
+    enhancer = PromptEnhancer(chroma_manager=chroma_manager, schema_analyzer=schema_analyzer)
+    # The benchmark prompt takes the fast path; time the LLM enhancement path separately
+    llm_enhancer = PromptEnhancer(chroma_manager=chroma_manager, schema_analyzer=schema_analyzer, fast_path=False)
+    sql_generator = SQLGenerator()
+    executor = QueryExecutor(db_manager)
+    processor = DataProcessor()
+    # An empty shape cache so every iteration exercises full generation
+    component_generator = ComponentGenerator(default_mode='llm', shape_cache=LRUCache(max_size=0))
+
+    # One pass to produce realistic inputs for each stage
+    skipped = {}
+    try:
+        enhancement = enhancer.enhance_prompt(BENCHMARK_PROMPT)
+        enhanced_prompt, sql_context = enhancement.enhanced_prompt, enhancement.sql_context
+        llm_enhancer.enhance_prompt(BENCHMARK_PROMPT)
+    except Exception as e:
+        # e.g. the embedding model can't be downloaded; later stages only need the schema context
+        skipped['prompt_enhancement'] = skipped['prompt_enhancement_llm'] = f"{type(e).__name__}: {e}"
+        enhanced_prompt = BENCHMARK_PROMPT
+        sql_context = schema_analyzer.get_table_context_for_prompt(BENCHMARK_PROMPT)
+
+    sql_result = sql_generator.generate_sql_from_prompt(enhanced_prompt, sql_context)
+    if not sql_result.success:
+        raise RuntimeError(f"SQL generation failed: {sql_result.error_message}")
+    execution_results = executor.execute_generated_sql(sql_result, sql_context)
+    processed_data = processor.process_query_results(sql_result, execution_results)
+    if not processed_data.success:
+        raise RuntimeError(f"Data processing failed: {processed_data.error_message}")
+
+    # Detail query returning every row, to stress execution and processing at scale
+    detail_sql = SQLGenerationResult(
+        queries=["SELECT order_date, region, revenue FROM sales"],
+        processing_steps=[],
+        chart_config={'chart_type': 'line', 'x_axis': 'order_date', 'y_axis': 'revenue', 'title': 'Revenue over time'},
+        success=True
+    )
+    detail_results = executor.execute_generated_sql(detail_sql, sql_context)
+
+    stages = {
+        'prompt_enhancement': lambda: enhancer.enhance_prompt(BENCHMARK_PROMPT),
+        'prompt_enhancement_llm': lambda: llm_enhancer.enhance_prompt(BENCHMARK_PROMPT),
+        'sql_generation': lambda: sql_generator.generate_sql_from_prompt(enhanced_prompt, sql_context),
+        'query_execution': lambda: executor.execute_generated_sql(sql_result, sql_context),
+        'query_execution_detail': lambda: executor.execute_generated_sql(detail_sql, sql_context),
+        'data_processing': lambda: processor.process_query_results(sql_result, execution_results),
+        'data_processing_detail': lambda: processor.process_query_results(detail_sql, detail_results),
+        'component_generation': lambda: component_generator.generate_component(processed_data, BENCHMARK_PROMPT),
+    }
+    rows_processed = {
+        'query_execution': row_count,
+        'query_execution_detail': row_count,
+        'data_processing': execution_results[0].row_count,
+        'data_processing_detail': detail_results[0].row_count,
+    }
+
+    results = {}
+    for stage, fn in stages.items():
+        if stage in skipped:
+            print(f"   {stage:<24} skipped ({skipped[stage][:80]})")
+            continue
+
+        stats = measure(fn, iterations)
+        if stage in rows_processed and stats['mean_ms'] > 0:
+            stats['rows_per_sec'] = round(rows_processed[stage] / (stats['mean_ms'] / 1000), 1)
+        results[stage] = stats
+        print(f"   {stage:<24} p50 {stats['p50_ms']:>10.2f}ms  p95 {stats['p95_ms']:>10.2f}ms  peak {stats['peak_mb']:>8.2f}MB")
+
+    return results
+
+def compare_to_baseline(
+    results: Dict[str, Dict[str, Dict[str, float]]],
+    baseline: Dict[str, Dict[str, Dict[str, float]]],
+    tolerance: float,
+    min_delta_ms: float
+) -> List[str]:
+    """
+    Find stages slower or hungrier than their baseline
+
+    A latency regression must exceed both the relative tolerance and an
+    absolute floor so sub-millisecond stages don't fail on timer noise.
+    """
+    regressions = []
+
+    for size_label, stages in results.items():
+        for stage, stats in stages.items():
+            reference = baseline.get(size_label, {}).get(stage)
+            if not reference:
+                continue
+
+            for metric in ('p50_ms', 'p95_ms'):
+                limit = reference[metric] * (1 + tolerance)
+                if stats[metric] > limit and stats[metric] - reference[metric] > min_delta_ms:
+                    regressions.append(
+                        f"{size_label}/{stage} {metric}: {stats[metric]:.2f} > {reference[metric]:.2f} (+{tolerance:.0%})"
+                    )
+
+            if stats['peak_mb'] > reference['peak_mb'] * (1 + tolerance) and stats['peak_mb'] - reference['peak_mb'] > 1:
+                regressions.append(
+                    f"{size_label}/{stage} peak_mb: {stats['peak_mb']:.2f} > {reference['peak_mb']:.2f} (+{tolerance:.0%})"
+                )
+
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the chart generation pipeline offline")
+    parser.add_argument('--sizes', default='1k,100k,1m', help="Comma-separated dataset sizes (1k, 100k, 1m)")
+    parser.add_argument('--iterations', type=int, default=5, help="Timed runs per stage")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed relative slowdown before failing")
+    parser.add_argument('--min-delta-ms', type=float, default=5.0, help="Ignore latency changes smaller than this")
+    parser.add_argument('--baseline', default=str(BASELINE_PATH), help="Baseline JSON file")
+    parser.add_argument('--update-baseline', action='store_true', help="Store these results as the new baseline")
+    parser.add_argument('--output', help="Also write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    sizes = [size.strip().lower() for size in args.sizes.split(',') if size.strip()]
+    unknown = [size for size in sizes if size not in DATASET_SIZES]
+    if unknown:
+        parser.error(f"Unknown dataset sizes: {', '.join(unknown)}")
+
+    work_dir = Path(tempfile.mkdtemp(prefix='chart_bench_'))
+    results = {}
+
+    try:
+        for size_label in sizes:
+            results[size_label] = benchmark_dataset(size_label, DATASET_SIZES[size_label], args.iterations, work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+
+    if args.update_baseline:
+        baseline.update(results)
+        baseline_path.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"\n💾 Baseline updated: {baseline_path}")
+        return 0
+
+    if not baseline:
+        print(f"\nℹ️ No baseline at {baseline_path}; run with --update-baseline to record one")
+        return 0
+
+    missing = [size_label for size_label in results if size_label not in baseline]
+    if missing:
+        print(f"\nℹ️ No baseline for {', '.join(missing)}; those sizes are reported but not checked")
+
+    regressions = compare_to_baseline(results, baseline, args.tolerance, args.min_delta_ms)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) against baseline:")
+        for regression in regressions:
+            print(f"   {regression}")
+        return 1
+
+    print("\n✅ No regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
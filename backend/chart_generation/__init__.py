@@ -1,3 +1,4 @@
 from .component_generator import ComponentGenerator, ComponentGenerationResult
+from .component_templates import ComponentTemplateRenderer
 
-__all__ = ['ComponentGenerator', 'ComponentGenerationResult']
\ No newline at end of file
+__all__ = ['ComponentGenerator', 'ComponentGenerationResult', 'ComponentTemplateRenderer']
\ No newline at end of file
@@ -1,15 +1,28 @@
-import groq
 import json
 import re
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, List, Optional, Callable
 import os
 from dotenv import load_dotenv
 from dataclasses import dataclass
 
 from query_generation import ProcessedData
+from utils import LRUCache, stable_hash, get_llm_client
+from .component_templates import ComponentTemplateRenderer
 
 load_dotenv()
 
+GENERATION_MODES = ('auto', 'template', 'llm')
+
+# Titles that can be swapped into cached component code without escaping
+SAFE_TITLE_PATTERN = re.compile(r"^[\w\s\-,.:;()%&/+#]*$")
+
+# Shared by every ComponentGenerator: validated LLM components keyed by chart shape
+component_shape_cache = LRUCache(
+    max_size=int(os.getenv('COMPONENT_SHAPE_CACHE_SIZE', '128')),
+    ttl_seconds=float(os.getenv('COMPONENT_SHAPE_CACHE_TTL', '86400'))
+)
+
 @dataclass
 class ComponentGenerationResult:
     """Structure for component generation results"""
@@ -19,19 +32,99 @@ class ComponentGenerationResult:
     success: bool
     error_message: Optional[str] = None
 
+class PartialComponentCodeParser:
+    """
+    Incrementally decode the component_code string from a streamed JSON envelope
+    
+    Fed raw LLM output chunk by chunk; exposes the component code decoded so far
+    without waiting for the closing brace of the JSON object.
+    """
+    
+    FIELD_PATTERN = re.compile(r'"component_code"\s*:\s*"')
+    ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+    
+    def __init__(self):
+        self.buffer = ""
+        self.position = -1  # Index of the next undecoded char inside the string value
+        self.decoded: List[str] = []
+        self.complete = False
+    
+    def feed(self, text: str) -> str:
+        """Add streamed text and return the component code decoded so far"""
+        self.buffer += text
+        
+        if self.position < 0:
+            match = self.FIELD_PATTERN.search(self.buffer)
+            if not match:
+                return ""
+            self.position = match.end()
+        
+        while not self.complete and self.position < len(self.buffer):
+            char = self.buffer[self.position]
+            
+            if char == '"':
+                self.complete = True
+            elif char == '\\':
+                if self.position + 1 >= len(self.buffer):
+                    break  # Escape sequence split across chunks
+                
+                code = self.buffer[self.position + 1]
+                if code == 'u':
+                    if self.position + 6 > len(self.buffer):
+                        break
+                    self.decoded.append(chr(int(self.buffer[self.position + 2:self.position + 6], 16)))
+                    self.position += 6
+                    continue
+                
+                self.decoded.append(self.ESCAPES.get(code, code))
+                self.position += 2
+                continue
+            else:
+                self.decoded.append(char)
+            
+            self.position += 1
+        
+        return self.code
+    
+    @property
+    def code(self) -> str:
+        return "".join(self.decoded)
+
 class ComponentGenerator:
     """Generate complete React components from processed data using pure LLM generation"""
     
-    def __init__(self):
-        self.client = groq.Groq(api_key=os.getenv('GROQ_API_KEY'))
+    def __init__(
+        self,
+        partial_interval: float = 0.25,
+        default_mode: Optional[str] = None,
+        shape_cache: Optional[LRUCache] = None
+    ):
+        self.client = get_llm_client()
+        self.partial_interval = partial_interval  # Min seconds between streamed partial updates
+        self.template_renderer = ComponentTemplateRenderer()
+        self.shape_cache = shape_cache if shape_cache is not None else component_shape_cache
+        self.default_mode = (default_mode or os.getenv('COMPONENT_GENERATION_MODE', 'auto')).lower()
     
-    def generate_component(self, processed_data: ProcessedData, user_prompt: str) -> ComponentGenerationResult:
+    def generate_component(
+        self, 
+        processed_data: ProcessedData, 
+        user_prompt: str,
+        on_partial: Optional[Callable[[str], None]] = None,
+        generation_mode: Optional[str] = None
+    ) -> ComponentGenerationResult:
         """
-        Generate complete React component from processed data using LLM
+        Generate complete React component from processed data
+        
+        Standard bar/line/pie/scatter/table charts with a well-formed chart_config
+        are rendered from precompiled templates; everything else goes to the LLM.
         
         Args:
             processed_data: Processed data from pipeline
             user_prompt: Original user prompt for context
+            on_partial: Optional callback enabling streaming mode; receives the
+                component code decoded so far as tokens arrive
+            generation_mode: "auto" (template when possible), "template" (templates
+                only, fails when none applies) or "llm"; defaults to COMPONENT_GENERATION_MODE
             
         Returns:
             ComponentGenerationResult with generated component code
@@ -46,9 +139,49 @@ class ComponentGenerator:
                 error_message="Cannot generate component from failed data processing"
             )
         
+        mode = (generation_mode or self.default_mode).lower()
+        if mode not in GENERATION_MODES:
+            print(f"Unknown generation mode '{mode}', using 'auto'")
+            mode = 'auto'
+        
         try:
+            component_result = None
+            
+            # Deterministic template path for standard charts
+            if mode in ('auto', 'template'):
+                component_result = self.template_renderer.render(processed_data)
+                
+                if component_result is None and mode == 'template':
+                    print("❌ Chart config not suitable for a template")
+                    return ComponentGenerationResult(
+                        component_code="",
+                        component_name="",
+                        chart_type="",
+                        success=False,
+                        error_message="No component template matches this chart (generation_mode='template')"
+                    )
+            
+            # Reuse an LLM component generated earlier for a chart of the same shape
+            shape_key = None
+            if component_result is None:
+                shape_key = self.shape_signature(processed_data)
+                component_result = self._get_cached_component(shape_key, processed_data)
+                
+                if component_result is not None:
+                    print(f"♻️ Reusing cached component for chart shape {shape_key}")
+                    shape_key = None  # Already cached
+            
             # Generate complete component using LLM
-            component_result = self._generate_complete_component(processed_data, user_prompt)
+            if component_result is None:
+                component_result = self._generate_complete_component(processed_data, user_prompt, on_partial)
+                
+                if component_result and shape_key:
+                    self.shape_cache.set(shape_key, {
+                        'component_code': component_result['component_code'],
+                        'component_name': component_result['component_name'],
+                        'chart_type': component_result['chart_type'],
+                        'title': processed_data.chart_config.get('title')
+                    })
             
             if not component_result:
                 print("❌ LLM failed to generate component code")
@@ -84,8 +217,75 @@ class ComponentGenerator:
                 error_message=f"Component generation error: {str(e)}"
             )
     
-    def _generate_complete_component(self, processed_data: ProcessedData, user_prompt: str) -> Optional[Dict[str, Any]]:
-        """Generate complete React component code using LLM"""
+    def shape_signature(self, processed_data: ProcessedData) -> str:
+        """
+        Build the cache key for a chart's structure
+        
+        Component structure depends only on chart type, axis columns and column
+        types, so charts that differ in rows or title share a signature.
+        
+        Args:
+            processed_data: Processed data from pipeline
+            
+        Returns:
+            Short hash of the chart config and the column schema of chart_data
+        """
+        chart_config = processed_data.chart_config
+        column_types = {}
+        
+        for row in processed_data.chart_data[:50]:
+            for column, value in row.items():
+                if value is not None and column not in column_types:
+                    column_types[column] = self._value_type(value)
+        
+        for column in processed_data.chart_data[0].keys() if processed_data.chart_data else []:
+            column_types.setdefault(column, 'null')
+        
+        return stable_hash(
+            str(chart_config.get('chart_type', '')).lower(),
+            chart_config.get('x_axis'),
+            chart_config.get('y_axis'),
+            sorted(column_types.items())
+        )
+    
+    def _value_type(self, value: Any) -> str:
+        if isinstance(value, bool):
+            return 'boolean'
+        if isinstance(value, (int, float)):
+            return 'number'
+        return 'string'
+    
+    def _get_cached_component(self, shape_key: str, processed_data: ProcessedData) -> Optional[Dict[str, Any]]:
+        """Look up a cached component and swap in the current chart title"""
+        cached = self.shape_cache.get(shape_key)
+        if cached is None:
+            return None
+        
+        component_code = cached['component_code']
+        old_title = cached.get('title')
+        new_title = processed_data.chart_config.get('title')
+        
+        if old_title and new_title and old_title != new_title:
+            # Titles are the only per-chart text baked into the code; if the new
+            # one can't be substituted verbatim, generate a fresh component instead
+            title_pattern = re.compile(r'(?<=[\s"\'>{])' + re.escape(str(old_title)) + r'(?=[\s"\'<}])')
+            if not title_pattern.search(component_code) or not SAFE_TITLE_PATTERN.match(str(new_title)):
+                return None
+            component_code = title_pattern.sub(lambda _: str(new_title), component_code)
+        
+        return {
+            'component_code': component_code,
+            'component_name': cached['component_name'],
+            'chart_type': cached['chart_type']
+        }
+    
+    def _generate_complete_component(
+        self, 
+        processed_data: ProcessedData, 
+        user_prompt: str,
+        on_partial: Optional[Callable[[str], None]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Generate complete React component code using LLM (streamed when on_partial is given)"""
         
         chart_data = processed_data.chart_data
         chart_config = processed_data.chart_config
@@ -96,7 +296,7 @@ You are an expert React developer. Generate a complete, self-contained React com
 
 USER REQUEST: "{user_prompt}"
 
-DATA TO VISUALIZE:
+DATA SAMPLE (shape reference only - the full dataset is passed in at render time):
 {json.dumps(chart_data[:5], indent=2, default=str)}  
 (Sample of {len(chart_data)} total rows)
 
@@ -113,10 +313,10 @@ DATA SUMMARY:
 - Categorical columns: {data_summary.get('categorical_columns', 0)}
 
 STRICT REQUIREMENTS:
-1. Generate a COMPLETE React functional component that works standalone
+1. Generate a COMPLETE React functional component that renders whatever rows it is given
 2. DO NOT include any import statements - they will be provided automatically
 3. Use only React hooks (useState, useEffect, etc.) and Recharts components
-4. Embed the complete data array directly in the component
+4. The component receives its rows as a `data` prop: `const Name = ({{ data = [] }}) => {{`. NEVER embed or copy data rows into the code
 5. Use ONLY inline styles with style={{}} - DO NOT use className or Tailwind
 6. Choose the BEST chart type for this data and user request
 7. Include error handling and loading states
@@ -136,8 +336,10 @@ CRITICAL STYLING RULES:
 
 EXAMPLE STRUCTURE:
 ```javascript
-const SalesChart = () => {{
-  const data = [...your data here...];
+const SalesChart = ({{ data = [] }}) => {{
+  if (!data.length) {{
+    return <div style={{{{width: '100%', height: '400px'}}}}>No data available</div>;
+  }}
   
   return (
     <div style={{{{width: '100%', height: '400px', padding: '16px'}}}}>
@@ -168,20 +370,24 @@ Return your response as a JSON object:
 
 CRITICAL: 
 - The component_code should be the ENTIRE React component as a string, ready to execute
+- Read rows from the `data` prop - do NOT embed the data
 - NO import statements
 - Use INLINE STYLES only (no className)
 - Ensure root element has explicit height
 """
         
         try:
-            response = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[{"role": "user", "content": generation_prompt}],
-                temperature=0.1,  # Lower temperature for more consistent code generation
-                max_tokens=4000
-            )
-            
-            response_text = response.choices[0].message.content.strip()
+            if on_partial is not None:
+                response_text = self._stream_completion(generation_prompt, on_partial)
+            else:
+                response = self.client.chat.completions.create(
+                    model="llama-3.3-70b-versatile",
+                    messages=[{"role": "user", "content": generation_prompt}],
+                    temperature=0.1,  # Lower temperature for more consistent code generation
+                    max_tokens=4000
+                )
+                
+                response_text = response.choices[0].message.content.strip()
             
             # Extract JSON from response
             result = self._extract_json_from_response(response_text)
@@ -205,6 +411,47 @@ CRITICAL:
             print(f"Error in LLM component generation: {e}")
             return None
     
+    def _stream_completion(self, generation_prompt: str, on_partial: Callable[[str], None]) -> str:
+        """Consume a streamed completion, forwarding partial component code as it arrives"""
+        
+        stream = self.client.chat.completions.create(
+            model="llama-3.3-70b-versatile",
+            messages=[{"role": "user", "content": generation_prompt}],
+            temperature=0.1,
+            max_tokens=4000,
+            stream=True
+        )
+        
+        parser = PartialComponentCodeParser()
+        chunks = []
+        last_sent_length = 0
+        last_sent_at = 0.0
+        
+        # Closing releases the shared LLM concurrency slot even if parsing fails mid-stream
+        with stream:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                
+                chunks.append(delta)
+                partial_code = parser.feed(delta)
+                
+                # Throttle updates so the job channel isn't flooded per token
+                now = time.time()
+                if len(partial_code) > last_sent_length and (parser.complete or now - last_sent_at >= self.partial_interval):
+                    try:
+                        on_partial(partial_code)
+                    except Exception as e:
+                        print(f"Partial component callback error: {e}")
+                    last_sent_length = len(partial_code)
+                    last_sent_at = now
+        
+        return "".join(chunks).strip()
+    
     def _clean_component_code(self, component_code: str) -> str:
         """Clean and normalize the generated component code"""
         
@@ -238,7 +485,7 @@ CRITICAL:
         
         # Check for required patterns
         required_patterns = [
-            r'const\s+\w+\s*=\s*\(\s*\)\s*=>\s*{',  # Function component pattern
+            r'const\s+\w+\s*=\s*\(\s*(\{[^)]*\})?\s*\)\s*=>\s*{',  # Function component pattern (optional props)
             r'return\s*\(',                           # Return statement
             r'<\w+',                                  # JSX elements
             r'};?\s*$',                              # Proper ending
@@ -361,12 +608,9 @@ CRITICAL:
     def generate_fallback_component(self, processed_data: ProcessedData, error_message: str) -> ComponentGenerationResult:
         """Generate a simple fallback component when main generation fails"""
         
-        chart_data = processed_data.chart_data if processed_data.success else []
-        
+        # Data arrives through the `data` prop like any other component
         # Use inline styles instead of Tailwind classes
-        fallback_code = f'''const ErrorChart = () => {{
-  const data = {json.dumps(chart_data[:10], default=str)};
-  
+        fallback_code = f'''const ErrorChart = ({{ data = [] }}) => {{
   return (
     <div style={{{{
       width: '100%',
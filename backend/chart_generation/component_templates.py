@@ -0,0 +1,224 @@
+"""Precompiled React component templates for standard chart types"""
+
+import json
+import re
+from string import Template
+from typing import Dict, Any, List, Optional
+
+from query_generation import ProcessedData
+
+COLOR_PALETTE = ['#8884d8', '#82ca9d', '#ffc658', '#ff7f50', '#a4de6c', '#d0ed57', '#8dd1e1', '#83a6ed']
+
+# Components read rows from the `data` prop so the code is independent of the dataset
+_COMPONENT_WRAPPER = """const $component_name = ({ data = [] }) => {
+  if (!data || data.length === 0) {
+    return (
+      <div style={{width: '100%', height: '400px', display: 'flex', alignItems: 'center', justifyContent: 'center', color: '#6b7280'}}>
+        No data available
+      </div>
+    );
+  }
+
+  return (
+    <div style={{width: '100%', height: '400px', padding: '16px'}}>
+      <h2 style={{fontSize: '1.25rem', fontWeight: 'bold', marginBottom: '16px', textAlign: 'center'}}>
+        {$title}
+      </h2>
+$chart_body
+    </div>
+  );
+};"""
+
+_CHART_BODIES = {
+    'bar': """      <ResponsiveContainer width="100%" height="90%">
+        <BarChart data={data} margin={{top: 10, right: 30, left: 20, bottom: 40}}>
+          <CartesianGrid strokeDasharray="3 3" />
+          <XAxis dataKey={$x_key} label={{value: $x_label, position: 'insideBottom', offset: -10}} />
+          <YAxis label={{value: $y_label, angle: -90, position: 'insideLeft'}} />
+          <Tooltip formatter={(value) => typeof value === 'number' ? value.toLocaleString() : value} />
+          <Legend verticalAlign="top" />
+          <Bar dataKey={$y_key} name={$y_label} fill="$color" />
+        </BarChart>
+      </ResponsiveContainer>""",
+
+    'line': """      <ResponsiveContainer width="100%" height="90%">
+        <LineChart data={data} margin={{top: 10, right: 30, left: 20, bottom: 40}}>
+          <CartesianGrid strokeDasharray="3 3" />
+          <XAxis dataKey={$x_key} label={{value: $x_label, position: 'insideBottom', offset: -10}} />
+          <YAxis label={{value: $y_label, angle: -90, position: 'insideLeft'}} />
+          <Tooltip formatter={(value) => typeof value === 'number' ? value.toLocaleString() : value} />
+          <Legend verticalAlign="top" />
+          <Line type="monotone" dataKey={$y_key} name={$y_label} stroke="$color" strokeWidth={2} dot={{r: 3}} />
+        </LineChart>
+      </ResponsiveContainer>""",
+
+    'pie': """      <ResponsiveContainer width="100%" height="90%">
+        <PieChart>
+          <Pie data={data} dataKey={$y_key} nameKey={$x_key} outerRadius="75%" label>
+            {data.map((entry, index) => (
+              <Cell key={`cell-$${index}`} fill={$palette[index % $palette_size]} />
+            ))}
+          </Pie>
+          <Tooltip formatter={(value) => typeof value === 'number' ? value.toLocaleString() : value} />
+          <Legend />
+        </PieChart>
+      </ResponsiveContainer>""",
+
+    'scatter': """      <ResponsiveContainer width="100%" height="90%">
+        <ScatterChart margin={{top: 10, right: 30, left: 20, bottom: 40}}>
+          <CartesianGrid strokeDasharray="3 3" />
+          <XAxis type="number" dataKey={$x_key} name={$x_label} label={{value: $x_label, position: 'insideBottom', offset: -10}} />
+          <YAxis type="number" dataKey={$y_key} name={$y_label} label={{value: $y_label, angle: -90, position: 'insideLeft'}} />
+          <Tooltip cursor={{strokeDasharray: '3 3'}} />
+          <Scatter name={$title} data={data} fill="$color" />
+        </ScatterChart>
+      </ResponsiveContainer>""",
+
+    'table': """      <div style={{height: '90%', overflow: 'auto'}}>
+        <table style={{width: '100%', borderCollapse: 'collapse', fontSize: '0.875rem'}}>
+          <thead>
+            <tr>
+              {$columns.map((column) => (
+                <th key={column} style={{textAlign: 'left', padding: '8px', borderBottom: '2px solid #e5e7eb', backgroundColor: '#f9fafb', position: 'sticky', top: 0}}>
+                  {column}
+                </th>
+              ))}
+            </tr>
+          </thead>
+          <tbody>
+            {data.map((row, rowIndex) => (
+              <tr key={rowIndex} style={{backgroundColor: rowIndex % 2 === 0 ? 'white' : '#f9fafb'}}>
+                {$columns.map((column) => (
+                  <td key={column} style={{padding: '8px', borderBottom: '1px solid #e5e7eb'}}>
+                    {typeof row[column] === 'number' ? row[column].toLocaleString() : String(row[column] ?? '')}
+                  </td>
+                ))}
+              </tr>
+            ))}
+          </tbody>
+        </table>
+      </div>""",
+}
+
+# Compile once at import: each chart body is spliced into the shared wrapper,
+# leaving a single Template per chart type to fill at render time
+COMPILED_TEMPLATES: Dict[str, Template] = {
+    chart_type: Template(_COMPONENT_WRAPPER.replace('$chart_body', body))
+    for chart_type, body in _CHART_BODIES.items()
+}
+
+NUMERIC_Y_CHART_TYPES = {'bar', 'line', 'pie', 'scatter'}
+
+class ComponentTemplateRenderer:
+    """Render standard chart components deterministically, without an LLM call"""
+
+    def supported_chart_types(self) -> List[str]:
+        return list(COMPILED_TEMPLATES.keys())
+
+    def can_render(self, processed_data: ProcessedData) -> bool:
+        """
+        Check whether the chart config is well-formed for a standard template
+
+        Args:
+            processed_data: Processed data from pipeline
+
+        Returns:
+            True if the chart type is standard and its axes exist in the data
+        """
+        if not processed_data.success or not processed_data.chart_data:
+            return False
+
+        chart_config = processed_data.chart_config
+        chart_type = str(chart_config.get('chart_type', '')).lower()
+
+        if chart_type not in COMPILED_TEMPLATES:
+            return False
+
+        if chart_type == 'table':
+            return True
+
+        x_axis = chart_config.get('x_axis')
+        y_axis = chart_config.get('y_axis')
+        first_row = processed_data.chart_data[0]
+
+        if not x_axis or not y_axis or x_axis not in first_row or y_axis not in first_row:
+            return False
+
+        if chart_type in NUMERIC_Y_CHART_TYPES and not self._is_numeric_column(processed_data.chart_data, y_axis):
+            return False
+
+        if chart_type == 'scatter' and not self._is_numeric_column(processed_data.chart_data, x_axis):
+            return False
+
+        return True
+
+    def render(self, processed_data: ProcessedData) -> Optional[Dict[str, Any]]:
+        """
+        Render a component for the processed data
+
+        Args:
+            processed_data: Processed data from pipeline
+
+        Returns:
+            Dict with component_code, component_name and chart_type, or None
+            if the chart config is not suitable for a template
+        """
+        if not self.can_render(processed_data):
+            return None
+
+        chart_config = processed_data.chart_config
+        chart_type = str(chart_config['chart_type']).lower()
+        chart_data = processed_data.chart_data
+
+        x_axis = chart_config.get('x_axis', '')
+        y_axis = chart_config.get('y_axis', '')
+        title = chart_config.get('title') or self._default_title(chart_type, x_axis, y_axis)
+        component_name = self._component_name(title, chart_type)
+
+        columns = [column for column in chart_data[0].keys() if column not in ('x', 'y')]
+
+        component_code = COMPILED_TEMPLATES[chart_type].substitute(
+            component_name=component_name,
+            title=json.dumps(str(title)),
+            x_key=json.dumps(x_axis),
+            y_key=json.dumps(y_axis),
+            x_label=json.dumps(self._humanize(x_axis)),
+            y_label=json.dumps(self._humanize(y_axis)),
+            color=COLOR_PALETTE[0],
+            palette=json.dumps(COLOR_PALETTE),
+            palette_size=len(COLOR_PALETTE),
+            columns=json.dumps(columns)
+        )
+
+        return {
+            'component_code': component_code,
+            'component_name': component_name,
+            'chart_type': chart_type
+        }
+
+    def _is_numeric_column(self, chart_data: List[Dict[str, Any]], column: str) -> bool:
+        values = [row.get(column) for row in chart_data[:50] if row.get(column) is not None]
+        return bool(values) and all(
+            isinstance(value, (int, float)) and not isinstance(value, bool) for value in values
+        )
+
+    def _humanize(self, column: str) -> str:
+        return str(column).replace('_', ' ').strip().title()
+
+    def _default_title(self, chart_type: str, x_axis: str, y_axis: str) -> str:
+        if chart_type == 'table':
+            return 'Data Table'
+        return f"{self._humanize(y_axis)} by {self._humanize(x_axis)}"
+
+    def _component_name(self, title: str, chart_type: str) -> str:
+        """Build a PascalCase component name from the chart title"""
+        words = re.findall(r'[A-Za-z0-9]+', str(title))
+        name = ''.join(word[:1].upper() + word[1:] for word in words[:6])
+
+        if not name or not name[0].isalpha():
+            name = chart_type.title() + name
+
+        if not name.endswith(('Chart', 'Table')):
+            name += 'Table' if chart_type == 'table' else 'Chart'
+
+        return name
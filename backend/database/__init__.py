@@ -1,4 +1,5 @@
 from .db_manager import DatabaseManager
 from .schema_analyzer import SchemaAnalyzer
+from .index_advisor import IndexAdvisor
 
-__all__ = ['DatabaseManager', 'SchemaAnalyzer']
\ No newline at end of file
+__all__ = ['DatabaseManager', 'SchemaAnalyzer', 'IndexAdvisor']
\ No newline at end of file
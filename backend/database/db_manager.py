@@ -1,17 +1,26 @@
 import sqlite3
 import pandas as pd
+import io
 import os
+from itertools import islice
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import re
 
+from utils.hashing import stable_hash, file_sha256
+from utils.dtype_optimizer import INGEST_OPTIMIZE_DTYPES, optimize_dtypes, read_csv_optimized
+from utils.columnar import is_columnar_file, iter_record_batches, read_columnar, read_columnar_schema, sqlite_type, batch_to_sqlite_columns
+
 class DatabaseManager:
     """Manage SQLite database operations for loading CSV/Excel data"""
     
-    def __init__(self, db_path: str = "data/prototype.db"):
+    def __init__(self, db_path: str = "data/prototype.db", optimize_memory: Optional[bool] = None):
         self.db_path = db_path
         self.db_dir = os.path.dirname(db_path)
         
+        # Downcast numerics / use categoricals while loading (INGEST_OPTIMIZE_DTYPES)
+        self.optimize_memory = INGEST_OPTIMIZE_DTYPES if optimize_memory is None else optimize_memory
+        
         # Create data directory if it doesn't exist
         os.makedirs(self.db_dir, exist_ok=True)
         
@@ -37,18 +46,44 @@ class DatabaseManager:
                 )
             """)
             
+            # Content fingerprint columns for incremental reloads (added to older databases)
+            cursor.execute("PRAGMA table_info(file_metadata)")
+            existing_columns = {row[1] for row in cursor.fetchall()}
+            for column, column_type in (('content_hash', 'TEXT'), ('file_size', 'INTEGER')):
+                if column not in existing_columns:
+                    cursor.execute(f"ALTER TABLE file_metadata ADD COLUMN {column} {column_type}")
+            
             conn.commit()
     
-    def load_file_to_database(self, file_path: str, table_name: Optional[str] = None) -> Dict[str, Any]:
+    def load_file_to_database(
+        self, 
+        file_path: str, 
+        table_name: Optional[str] = None, 
+        force: bool = False,
+        columns: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
-        Load CSV/Excel file into SQLite database
+        Load CSV/Excel/Parquet/Feather file into SQLite database
+        
+        Reloads are incremental: a file whose content hash (and, for
+        Parquet/Feather, column projection) is unchanged is skipped, and a CSV
+        that only had rows appended since the last load has just the new rows
+        inserted. Anything else rebuilds the table.
+        Parquet and Feather files are streamed in record batches (see
+        _load_columnar_file).
         
         Args:
             file_path: Path to the file
             table_name: Custom table name (optional)
+            force: Rebuild the table even if the file is unchanged
+            columns: Columns to load from a Parquet/Feather file (None for all)
+            
+        Raises:
+            ValueError: If columns names a column the Parquet/Feather file doesn't have
             
         Returns:
-            Dict with loading results
+            Dict with loading results ('status' is loaded, unchanged or appended;
+            'memory' reports dtype optimization savings when enabled)
         """
         path = Path(file_path)
         
@@ -59,12 +94,47 @@ class DatabaseManager:
         if table_name is None:
             table_name = self._generate_table_name(path.stem)
         
+        # Columns the table should end up with (None for CSV/Excel, which always load every column)
+        expected_columns = None
+        if is_columnar_file(file_path):
+            columns = self._columnar_projection(file_path, columns)
+            expected_columns = [self._clean_column_name(col) for col in columns]
+        
+        content_hash = file_sha256(file_path)
+        file_size = path.stat().st_size
+        previous = None if force else self._get_load_state(path.name, table_name)
+        
+        if previous and previous['content_hash'] == content_hash and (
+            expected_columns is None or self._table_columns(table_name) == expected_columns
+        ):
+            return self._describe_loaded_table(table_name, path.name, content_hash, 'unchanged', 0)
+        
+        if previous:
+            appended_df = self._read_appended_rows(path, table_name, previous)
+            if appended_df is not None:
+                with sqlite3.connect(self.db_path) as conn:
+                    appended_df.to_sql(table_name, conn, index=False, if_exists='append')
+                    self._record_load(
+                        conn, path, table_name, previous['row_count'] + len(appended_df),
+                        len(appended_df.columns), content_hash, file_size
+                    )
+                    conn.commit()
+                
+                return self._describe_loaded_table(table_name, path.name, content_hash, 'appended', len(appended_df))
+        
+        if is_columnar_file(file_path):
+            return self._load_columnar_file(path, table_name, content_hash, file_size, columns)
+        
         # Read file into DataFrame
         df = self._read_file(file_path)
         
         # Clean column names for SQL compatibility
         df.columns = [self._clean_column_name(col) for col in df.columns]
         
+        memory_report = None
+        if self.optimize_memory:
+            df, memory_report = optimize_dtypes(df)
+        
         # Load into SQLite
         with sqlite3.connect(self.db_path) as conn:
             # Drop table if exists (for reloading)
@@ -74,19 +144,7 @@ class DatabaseManager:
             df.to_sql(table_name, conn, index=False, if_exists='replace')
             
             # Update metadata
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT OR REPLACE INTO file_metadata 
-                (file_name, file_path, table_name, row_count, column_count, description)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                path.name,
-                str(path.absolute()),
-                table_name,
-                len(df),
-                len(df.columns),
-                f"Data loaded from {path.name}"
-            ))
+            self._record_load(conn, path, table_name, len(df), len(df.columns), content_hash, file_size)
             
             conn.commit()
         
@@ -96,7 +154,177 @@ class DatabaseManager:
             'row_count': len(df),
             'column_count': len(df.columns),
             'columns': list(df.columns),
-            'sample_data': df.head(3).to_dict('records')
+            'sample_data': df.head(3).to_dict('records'),
+            'content_hash': content_hash,
+            'status': 'loaded',
+            'rows_added': len(df),
+            'memory': memory_report
+        }
+    
+    def _load_columnar_file(
+        self, 
+        path: Path, 
+        table_name: str, 
+        content_hash: str, 
+        file_size: int, 
+        columns: Optional[List[str]] = None,
+        batch_size: int = 65536
+    ) -> Dict[str, Any]:
+        """
+        Stream a memory-mapped Parquet/Feather file into SQLite in record batches
+        
+        No DataFrame is built: each Arrow batch is bound column-wise into one
+        executemany call, so memory stays at one batch whatever the file size.
+        """
+        schema = read_columnar_schema(str(path))
+        source_columns = columns or schema.names
+        clean_columns = [self._clean_column_name(col) for col in source_columns]
+        column_defs = ", ".join(
+            f'"{name}" {sqlite_type(schema.field(col).type)}' for col, name in zip(source_columns, clean_columns)
+        )
+        placeholders = ", ".join("?" for _ in clean_columns)
+        
+        row_count = 0
+        sample_data = []
+        
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+            conn.execute(f"CREATE TABLE {table_name} ({column_defs})")
+            
+            for batch in iter_record_batches(str(path), columns=source_columns, batch_size=batch_size):
+                batch_columns = batch_to_sqlite_columns(batch)
+                conn.executemany(f"INSERT INTO {table_name} VALUES ({placeholders})", zip(*batch_columns))
+                
+                if len(sample_data) < 3:
+                    sample_data.extend(
+                        dict(zip(clean_columns, row)) for row in islice(zip(*batch_columns), 3 - len(sample_data))
+                    )
+                row_count += batch.num_rows
+            
+            self._record_load(conn, path, table_name, row_count, len(clean_columns), content_hash, file_size)
+            conn.commit()
+        
+        return {
+            'table_name': table_name,
+            'file_name': path.name,
+            'row_count': row_count,
+            'column_count': len(clean_columns),
+            'columns': clean_columns,
+            'sample_data': sample_data,
+            'content_hash': content_hash,
+            'status': 'loaded',
+            'rows_added': row_count,
+            'memory': None
+        }
+    
+    def _columnar_projection(self, file_path: str, columns: Optional[List[str]]) -> List[str]:
+        """Validate a Parquet/Feather column projection against the file's schema"""
+        names = read_columnar_schema(file_path).names
+        
+        if not columns:
+            return names
+        
+        unknown = [col for col in columns if col not in names]
+        if unknown:
+            raise ValueError(f"Columns not in {Path(file_path).name}: {', '.join(unknown)} (available: {', '.join(names)})")
+        
+        return list(columns)
+    
+    def _table_columns(self, table_name: str) -> List[str]:
+        with sqlite3.connect(self.db_path) as conn:
+            return [row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")]
+    
+    def _record_load(
+        self, 
+        conn: sqlite3.Connection, 
+        path: Path, 
+        table_name: str, 
+        row_count: int, 
+        column_count: int, 
+        content_hash: str, 
+        file_size: int
+    ):
+        """Upsert the file_metadata row for a (re)load"""
+        conn.execute("""
+            INSERT OR REPLACE INTO file_metadata 
+            (file_name, file_path, table_name, row_count, column_count, description, content_hash, file_size)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            path.name,
+            str(path.absolute()),
+            table_name,
+            row_count,
+            column_count,
+            f"Data loaded from {path.name}",
+            content_hash,
+            file_size
+        ))
+    
+    def _get_load_state(self, file_name: str, table_name: str) -> Optional[Dict[str, Any]]:
+        """Get the fingerprint of the previous load, if it went into the same (still existing) table"""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute("""
+                SELECT m.content_hash, m.file_size, m.row_count FROM file_metadata m
+                JOIN sqlite_master t ON t.type = 'table' AND t.name = m.table_name
+                WHERE m.file_name = ? AND m.table_name = ?
+            """, (file_name, table_name)).fetchone()
+        
+        if not row or row[0] is None:
+            return None
+        return {'content_hash': row[0], 'file_size': row[1], 'row_count': row[2]}
+    
+    def _read_appended_rows(self, path: Path, table_name: str, previous: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """
+        Read only the rows appended to a CSV since the previous load
+        
+        Returns:
+            DataFrame of new rows, or None if the file changed in any other way
+        """
+        previous_size = previous['file_size']
+        if path.suffix.lower() != '.csv' or not previous_size or path.stat().st_size <= previous_size:
+            return None
+        
+        # The old content must be an unchanged prefix ending on a row boundary
+        with open(path, 'rb') as f:
+            header = f.readline()
+            f.seek(previous_size - 1)
+            boundary = f.read(1)
+            tail = f.read()
+        
+        if boundary != b'\n' or file_sha256(str(path), limit=previous_size) != previous['content_hash']:
+            return None
+        
+        table_columns = [column['name'] for column in self.get_column_catalog().get(table_name, [])]
+        
+        for encoding in ['utf-8', 'latin-1', 'cp1252']:
+            for sep in [',', ';', '\t']:
+                try:
+                    df = pd.read_csv(io.BytesIO(header + tail), encoding=encoding, sep=sep)
+                except Exception:
+                    continue
+                
+                df.columns = [self._clean_column_name(col) for col in df.columns]
+                if list(df.columns) == table_columns:
+                    return df
+        
+        return None
+    
+    def _describe_loaded_table(self, table_name: str, file_name: str, content_hash: str, status: str, rows_added: int) -> Dict[str, Any]:
+        """Build the load result for a table that was skipped or appended to"""
+        with sqlite3.connect(self.db_path) as conn:
+            row_count = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+            sample_df = pd.read_sql_query(f"SELECT * FROM {table_name} LIMIT 3", conn)
+        
+        return {
+            'table_name': table_name,
+            'file_name': file_name,
+            'row_count': row_count,
+            'column_count': len(sample_df.columns),
+            'columns': list(sample_df.columns),
+            'sample_data': sample_df.to_dict('records'),
+            'content_hash': content_hash,
+            'status': status,
+            'rows_added': rows_added
         }
     
     def get_table_schema(self, table_name: str) -> Dict[str, Any]:
@@ -205,6 +433,62 @@ class DatabaseManager:
             
             return tables_info
     
+    def get_column_catalog(self) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Get column names and declared types for every table (no data scans)
+
+        Returns:
+            Dict mapping table name to a list of {'name', 'type'} column entries
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT name FROM sqlite_master
+                WHERE type='table' AND name != 'file_metadata'
+                ORDER BY name
+            """)
+            table_names = [row[0] for row in cursor.fetchall()]
+
+            catalog = {}
+            for table_name in table_names:
+                cursor.execute(f"PRAGMA table_info({table_name})")
+                catalog[table_name] = [{'name': row[1], 'type': row[2]} for row in cursor.fetchall()]
+
+            return catalog
+
+    def get_schema_version(self) -> str:
+        """
+        Get a fingerprint of the current database schema
+
+        Returns:
+            Hash that changes whenever a table is created, dropped or altered
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT name, sql FROM sqlite_master
+                WHERE type='table' AND name != 'file_metadata'
+                ORDER BY name
+            """)
+            return stable_hash(cursor.fetchall())
+
+    def get_data_version(self) -> str:
+        """
+        Get a fingerprint of the currently loaded data
+
+        Returns:
+            Hash that changes whenever a file is (re)loaded into the database
+        """
+        # loaded_at only has one-second resolution; the row id (reassigned by every
+        # INSERT OR REPLACE load) and content hash catch same-second reloads
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT table_name, id, loaded_at, row_count, content_hash FROM file_metadata
+                ORDER BY table_name
+            """)
+            return stable_hash(cursor.fetchall())
+
     def _read_file(self, file_path: str) -> pd.DataFrame:
         """Read file based on extension"""
         path = Path(file_path)
@@ -214,6 +498,8 @@ class DatabaseManager:
             for encoding in ['utf-8', 'latin-1', 'cp1252']:
                 for sep in [',', ';', '\t']:
                     try:
+                        if self.optimize_memory:
+                            return read_csv_optimized(file_path, encoding=encoding, sep=sep)
                         return pd.read_csv(file_path, encoding=encoding, sep=sep)
                     except:
                         continue
@@ -222,6 +508,9 @@ class DatabaseManager:
         elif path.suffix.lower() in ['.xlsx', '.xls']:
             return pd.read_excel(file_path)
         
+        elif is_columnar_file(file_path):
+            return read_columnar(file_path)
+        
         else:
             raise ValueError(f"Unsupported file extension: {path.suffix}")
     
@@ -0,0 +1,399 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from .db_manager import DatabaseManager
+
+# Background index advisor settings (set INDEX_ADVISOR=false to disable)
+INDEX_ADVISOR = os.getenv("INDEX_ADVISOR", "true").lower() == "true"
+INDEX_ADVISOR_INTERVAL = float(os.getenv("INDEX_ADVISOR_INTERVAL", "60"))
+INDEX_ADVISOR_MIN_HITS = int(os.getenv("INDEX_ADVISOR_MIN_HITS", "3"))
+INDEX_ADVISOR_MIN_ROWS = int(os.getenv("INDEX_ADVISOR_MIN_ROWS", "10000"))
+INDEX_ADVISOR_IDLE_SECONDS = float(os.getenv("INDEX_ADVISOR_IDLE_SECONDS", "604800"))
+INDEX_ADVISOR_MAX_PER_TABLE = int(os.getenv("INDEX_ADVISOR_MAX_PER_TABLE", "4"))
+
+INDEX_PREFIX = 'auto_idx_'
+MIN_SPEEDUP = 1.1
+CLAUSES = {'WHERE': 'where', 'ON': 'where', 'GROUP BY': 'group_by', 'ORDER BY': 'order_by'}
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_KEYWORD = re.compile(
+    r'\b(SELECT|FROM|JOIN|ON|WHERE|GROUP\s+BY|HAVING|ORDER\s+BY|LIMIT|UNION|EXCEPT|INTERSECT)\b',
+    re.IGNORECASE
+)
+_TABLE_REFERENCE = re.compile(r'\b(?:FROM|JOIN)\s+["`\[]?(\w+)', re.IGNORECASE)
+_IDENTIFIER = re.compile(r'["`\[]?([A-Za-z_]\w*)["`\]]?')
+
+class _ColumnUsage:
+    """Usage counters and timings for one (table, column)"""
+
+    def __init__(self):
+        self.hits = 0
+        self.clauses: Dict[str, int] = {}
+        self.last_used = 0.0
+        self.last_query: Optional[str] = None
+        self.timings = {'before': deque(maxlen=200), 'after': deque(maxlen=200)}
+
+    def record(self, clause: str, query: str, execution_time: float, indexed: bool):
+        self.hits += 1
+        self.clauses[clause] = self.clauses.get(clause, 0) + 1
+        self.last_used = time.time()
+        self.last_query = query
+        self.timings['after' if indexed else 'before'].append(execution_time)
+
+class IndexAdvisor:
+    """
+    Create and drop SQLite indexes on the columns generated queries actually use
+
+    Uploaded tables have no indexes, so every filter or grouping is a full
+    scan. QueryExecutor reports each successful query; the advisor counts the
+    columns referenced in WHERE/JOIN ON, GROUP BY and ORDER BY, and a
+    background thread periodically indexes hot columns of large tables and
+    drops its own indexes once they go unused. Each new index is benchmarked
+    against the query that triggered it and dropped again (the column is
+    left alone until it goes idle) when it doesn't speed that query up;
+    observed query times are also kept per column before and after indexing.
+
+    Column extraction is a lightweight scan (identifiers in those clauses that
+    are real columns of the referenced tables), not a full SQL parser.
+    """
+
+    def __init__(
+        self,
+        db_manager: Optional[DatabaseManager] = None,
+        min_hits: int = INDEX_ADVISOR_MIN_HITS,
+        min_rows: int = INDEX_ADVISOR_MIN_ROWS,
+        idle_seconds: float = INDEX_ADVISOR_IDLE_SECONDS,
+        max_per_table: int = INDEX_ADVISOR_MAX_PER_TABLE,
+        interval: float = INDEX_ADVISOR_INTERVAL
+    ):
+        self.db_manager = db_manager or DatabaseManager()
+        self.min_hits = min_hits
+        self.min_rows = min_rows
+        self.idle_seconds = idle_seconds
+        self.max_per_table = max_per_table
+        self.interval = interval
+
+        self._lock = threading.Lock()
+        self._usage: Dict[Tuple[str, str], _ColumnUsage] = {}
+        self._indexes: Dict[str, Dict[str, Any]] = {}
+        self._dropped: deque = deque(maxlen=50)
+        self._rejected: Dict[Tuple[str, str], float] = {}
+        # casefolded table -> (table, {casefolded column: column}); SQLite identifiers are case-insensitive
+        self._catalog: Optional[Dict[str, Tuple[str, Dict[str, str]]]] = None
+        self._catalog_misses: Set[str] = set()
+        self._catalog_lock = threading.Lock()
+        self._queries_recorded = 0
+        self._last_run: Optional[str] = None
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record_query(self, query: str, execution_time: float):
+        """Count the columns a successfully executed query filters, groups or sorts on"""
+        references = self.extract_columns(query)
+
+        with self._lock:
+            self._queries_recorded += 1
+            indexed = {(entry['table'], entry['column']) for entry in self._indexes.values()}
+            for table, column, clause in references:
+                usage = self._usage.setdefault((table, column), _ColumnUsage())
+                usage.record(clause, query, execution_time, (table, column) in indexed)
+
+    def extract_columns(self, query: str) -> Set[Tuple[str, str, str]]:
+        """
+        Find (table, column, clause) references in a query
+
+        Returns:
+            Set of references whose column exists in one of the query's tables
+        """
+        text = _STRING_LITERAL.sub("''", query)
+        tables = {match.group(1).casefold() for match in _TABLE_REFERENCE.finditer(text)}
+        catalog = self._columns_for(tables)
+        if not catalog:
+            return set()
+
+        # Aggregated output is sorted after grouping, so an index can't serve ORDER BY
+        grouped = re.search(r'\bGROUP\s+BY\b', text, re.IGNORECASE) is not None
+
+        parts = _KEYWORD.split(text)
+        references = set()
+        for keyword, body in zip(parts[1::2], parts[2::2]):
+            clause = CLAUSES.get(' '.join(keyword.upper().split()))
+            if clause is None or (clause == 'order_by' and grouped):
+                continue
+
+            for match in _IDENTIFIER.finditer(body):
+                identifier = match.group(1).casefold()
+                for table, columns in catalog:
+                    if identifier in columns:
+                        references.add((table, columns[identifier], clause))
+
+        return references
+
+    def _columns_for(self, tables: Set[str]) -> List[Tuple[str, Dict[str, str]]]:
+        """
+        Catalog entries for the given casefolded table names
+
+        The catalog is reloaded at most once per unknown name (a table created
+        since the last load); names that still don't resolve, such as CTEs
+        and aliases, are remembered until the next advisor run.
+        """
+        with self._catalog_lock:
+            catalog, misses = self._catalog, self._catalog_misses
+            unknown = {table for table in tables if catalog is None or (table not in catalog and table not in misses)}
+
+        if unknown:
+            catalog = {
+                table.casefold(): (table, {column['name'].casefold(): column['name'] for column in columns})
+                for table, columns in self.db_manager.get_column_catalog().items()
+            }
+            with self._catalog_lock:
+                self._catalog = catalog
+                self._catalog_misses.update(table for table in unknown if table not in catalog)
+
+        return [catalog[table] for table in tables if table in catalog]
+
+    def _reset_catalog(self):
+        with self._catalog_lock:
+            self._catalog = None
+            self._catalog_misses = set()
+
+    def start(self):
+        """Start the background advisor thread (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="index-advisor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"⚠️  Index advisor run failed: {e}")
+
+    def run_once(self) -> Dict[str, Any]:
+        """
+        Reconcile indexes with current usage: drop idle ones, then create hot ones
+
+        Returns:
+            Names of the indexes created and dropped in this run
+        """
+        self._reset_catalog()
+        self._forget_missing_indexes()
+
+        dropped = [name for name in self._idle_indexes() if self._drop_index(name, 'idle')]
+        created = []
+        for table, column in self._hot_columns():
+            name = self._create_index(table, column)
+            if name:
+                created.append(name)
+
+        with self._lock:
+            self._last_run = datetime.now().isoformat()
+
+        return {'created': created, 'dropped': dropped}
+
+    def _forget_missing_indexes(self):
+        """Drop bookkeeping for indexes that vanished with their table (file reloads recreate tables)"""
+        with sqlite3.connect(self.db_manager.db_path) as conn:
+            existing = {row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='index' AND name LIKE ?", (f"{INDEX_PREFIX}%",)
+            )}
+
+        with self._lock:
+            for name in [name for name in self._indexes if name not in existing]:
+                del self._indexes[name]
+
+    def _idle_indexes(self) -> List[str]:
+        cutoff = time.time() - self.idle_seconds
+        with self._lock:
+            return [
+                name for name, entry in self._indexes.items()
+                if self._usage.get((entry['table'], entry['column']), _ColumnUsage()).last_used < cutoff
+            ]
+
+    def _hot_columns(self) -> List[Tuple[str, str]]:
+        """Unindexed columns used at least min_hits times recently, hottest first"""
+        cutoff = time.time() - self.idle_seconds
+        with self._lock:
+            indexed = {(entry['table'], entry['column']) for entry in self._indexes.values()}
+            indexed.update(key for key, rejected_at in self._rejected.items() if rejected_at >= cutoff)
+            per_table = {}
+            for entry in self._indexes.values():
+                per_table[entry['table']] = per_table.get(entry['table'], 0) + 1
+
+            candidates = sorted(
+                (
+                    (usage.hits, key) for key, usage in self._usage.items()
+                    if usage.hits >= self.min_hits and usage.last_used >= cutoff and key not in indexed
+                ),
+                reverse=True
+            )
+
+        hot = []
+        for _, (table, column) in candidates:
+            if per_table.get(table, 0) >= self.max_per_table:
+                continue
+            per_table[table] = per_table.get(table, 0) + 1
+            hot.append((table, column))
+        return hot
+
+    def _create_index(self, table: str, column: str) -> Optional[str]:
+        """Index a column, benchmarking its most recent query before and after"""
+        name = f"{INDEX_PREFIX}{table}_{column}"
+        created = False
+
+        try:
+            with sqlite3.connect(self.db_manager.db_path) as conn:
+                if not self._table_exists(conn, table) or self._has_leading_index(conn, table, column):
+                    return None
+                if (conn.execute(f'SELECT MAX(rowid) FROM "{table}"').fetchone()[0] or 0) < self.min_rows:
+                    return None
+
+                with self._lock:
+                    sample_query = self._usage[(table, column)].last_query
+
+                before_ms = self._time_query(conn, sample_query)
+                build_started = time.perf_counter()
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" ("{column}")')
+                conn.commit()
+                created = True
+                build_ms = (time.perf_counter() - build_started) * 1000
+                conn.execute(f'ANALYZE "{name}"')
+                conn.commit()
+                after_ms = self._time_query(conn, sample_query)
+
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not create index {name}: {e}")
+            # An index that failed its benchmark isn't tracked, so nothing would ever drop it
+            if created:
+                self._drop_index(name, 'error')
+            return None
+
+        with self._lock:
+            self._indexes[name] = {
+                'name': name,
+                'table': table,
+                'column': column,
+                'created_at': datetime.now().isoformat(),
+                'build_ms': round(build_ms, 1),
+                'benchmark': {
+                    'query': sample_query,
+                    'before_ms': before_ms,
+                    'after_ms': after_ms,
+                    'speedup': round(before_ms / after_ms, 2) if before_ms and after_ms else None
+                }
+            }
+
+        print(f"🗂️  Created index {name} (sample query {before_ms}ms → {after_ms}ms)")
+
+        if before_ms and after_ms and before_ms < after_ms * MIN_SPEEDUP:
+            with self._lock:
+                self._rejected[(table, column)] = time.time()
+            self._drop_index(name, 'no_speedup')
+            return None
+
+        return name
+
+    def _drop_index(self, name: str, reason: str) -> bool:
+        try:
+            with sqlite3.connect(self.db_manager.db_path) as conn:
+                conn.execute(f'DROP INDEX IF EXISTS "{name}"')
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not drop index {name}: {e}")
+            return False
+
+        with self._lock:
+            entry = self._indexes.pop(name, None)
+            if entry:
+                self._dropped.append({**entry, 'dropped_at': datetime.now().isoformat(), 'reason': reason})
+
+        print(f"🗂️  Dropped index {name} ({reason})")
+        return True
+
+    def _table_exists(self, conn: sqlite3.Connection, table: str) -> bool:
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name = ?", (table,)
+        ).fetchone() is not None
+
+    def _has_leading_index(self, conn: sqlite3.Connection, table: str, column: str) -> bool:
+        """Whether any existing index on the table already starts with the column"""
+        for index in conn.execute(f'PRAGMA index_list("{table}")').fetchall():
+            first = conn.execute(f'PRAGMA index_info("{index[1]}")').fetchone()
+            if first is not None and first[2] == column:
+                return True
+        return False
+
+    def _time_query(self, conn: sqlite3.Connection, query: Optional[str], runs: int = 3) -> Optional[float]:
+        """Best-of-N wall time of a query in milliseconds"""
+        if not query:
+            return None
+
+        best = None
+        for _ in range(runs):
+            started = time.perf_counter()
+            conn.execute(query).fetchall()
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return round(best, 2)
+
+    def report(self, top: int = 20) -> Dict[str, Any]:
+        """
+        Current advisor state for monitoring
+
+        Returns:
+            Active and recently dropped indexes with their benchmarks and
+            observed query times, plus the hottest columns
+        """
+        with self._lock:
+            indexes = []
+            for entry in self._indexes.values():
+                usage = self._usage.get((entry['table'], entry['column']))
+                indexes.append({**entry, 'observed': self._observed(usage)})
+
+            hot_columns = [
+                {
+                    'table': table,
+                    'column': column,
+                    'hits': usage.hits,
+                    'clauses': dict(usage.clauses),
+                    'last_used': datetime.fromtimestamp(usage.last_used).isoformat()
+                }
+                for (table, column), usage in sorted(self._usage.items(), key=lambda item: -item[1].hits)[:top]
+            ]
+
+            return {
+                'enabled': self._thread is not None and self._thread.is_alive(),
+                'queries_recorded': self._queries_recorded,
+                'last_run': self._last_run,
+                'indexes': indexes,
+                'dropped': list(self._dropped),
+                'hot_columns': hot_columns
+            }
+
+    def _observed(self, usage: Optional[_ColumnUsage]) -> Dict[str, Any]:
+        """Average execution time of queries using the column, before vs after indexing"""
+        observed = {}
+        for phase in ('before', 'after'):
+            timings = usage.timings[phase] if usage else []
+            observed[phase] = {
+                'queries': len(timings),
+                'avg_ms': round(sum(timings) / len(timings) * 1000, 2) if timings else None
+            }
+        return observed
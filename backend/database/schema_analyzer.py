@@ -1,17 +1,26 @@
-import groq
 from typing import Dict, Any, List
 import os
+import threading
 from dotenv import load_dotenv
 from .db_manager import DatabaseManager
+from utils import get_llm_client
 
 load_dotenv()
 
 class SchemaAnalyzer:
-    """Analyze database schema and generate LLM-friendly context"""
+    """
+    Analyze database schema and generate LLM-friendly context
+    
+    The analysis (which makes LLM calls per table) is cached until the schema
+    or loaded data changes, so it is paid once per upload rather than per job.
+    """
     
     def __init__(self, db_manager: DatabaseManager = None):
-        self.client = groq.Groq(api_key=os.getenv('GROQ_API_KEY'))
+        self.client = get_llm_client()
         self.db_manager = db_manager or DatabaseManager()
+        self._analysis = None
+        self._analysis_version = None
+        self._analysis_lock = threading.Lock()
     
     def analyze_complete_schema(self) -> Dict[str, Any]:
         """
@@ -20,6 +29,17 @@ class SchemaAnalyzer:
         Returns:
             Complete schema analysis for LLM consumption
         """
+        version = (self.db_manager.get_schema_version(), self.db_manager.get_data_version())
+        
+        # Concurrent callers wait for one analysis instead of repeating its LLM calls
+        with self._analysis_lock:
+            if self._analysis is None or self._analysis_version != version:
+                self._analysis = self._analyze_schema()
+                self._analysis_version = version
+            return self._analysis
+    
+    def _analyze_schema(self) -> Dict[str, Any]:
+        """Run the full schema analysis without caching"""
         # Get all tables
         tables = self.db_manager.get_all_tables()
         
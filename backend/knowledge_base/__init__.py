@@ -1,5 +1,6 @@
 from .file_parser import FileParser
 from .context_extractor import ContextExtractor
 from .chroma_manager import ChromaManager
+from .context_store import ContextStore
 
-__all__ = ['FileParser', 'ContextExtractor', 'ChromaManager']
\ No newline at end of file
+__all__ = ['FileParser', 'ContextExtractor', 'ChromaManager', 'ContextStore']
\ No newline at end of file
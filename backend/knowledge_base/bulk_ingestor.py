@@ -0,0 +1,235 @@
+"""
+Bulk ingestion of many files into the database and knowledge base
+
+Usage (from the backend directory):
+- python -m knowledge_base.bulk_ingestor data/uploads/
+- python -m knowledge_base.bulk_ingestor a.csv b.xlsx --llm-concurrency 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from database import DatabaseManager
+from utils.columnar import COLUMNAR_EXTENSIONS
+from utils.hashing import file_sha256
+from .file_parser import FileParser
+from .context_extractor import ContextExtractor
+from .chroma_manager import ChromaManager
+
+SUPPORTED_EXTENSIONS = {'.csv', '.xlsx', '.xls'} | COLUMNAR_EXTENSIONS
+
+def _parse_file(file_path: str) -> Dict[str, Any]:
+    """Module-level parse entry point so it can run in a worker process"""
+    return FileParser().parse_file(file_path)
+
+@dataclass
+class IngestionReport:
+    """Outcome of a bulk ingestion run"""
+    files_total: int
+    doc_ids: Dict[str, str] = field(default_factory=dict)
+    unchanged: List[str] = field(default_factory=list)
+    failures: Dict[str, str] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def files_per_minute(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return len(self.doc_ids) / self.elapsed_seconds * 60
+
+class BulkIngestor:
+    """
+    Ingest many files with shared components and parallel stages
+
+    Files are parsed in a process pool (pandas profiling is CPU-bound), loaded
+    into SQLite from the calling thread (SQLite serializes writers anyway),
+    sent to the LLM for context with bounded concurrency, and written to
+    ChromaDB in batches of up to batch_size documents. Files whose content
+    hash matches their stored context skip parsing and the LLM entirely.
+    """
+
+    def __init__(
+        self,
+        db_manager: Optional[DatabaseManager] = None,
+        chroma_manager: Optional[ChromaManager] = None,
+        extractor: Optional[ContextExtractor] = None,
+        parse_workers: Optional[int] = None,
+        llm_concurrency: int = 4,
+        batch_size: int = 256,
+        load_database: bool = True
+    ):
+        self.db_manager = db_manager or DatabaseManager()
+        self.chroma_manager = chroma_manager or ChromaManager()
+        self.extractor = extractor or ContextExtractor()
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.llm_concurrency = llm_concurrency
+        self.batch_size = batch_size
+        self.load_database = load_database
+
+    def collect_files(self, sources: Union[str, List[str]]) -> List[str]:
+        """Expand directories (recursively) and files into a sorted list of supported files"""
+        if isinstance(sources, str):
+            sources = [sources]
+
+        files = set()
+        for source in sources:
+            path = Path(source)
+            if path.is_dir():
+                files.update(
+                    str(candidate) for candidate in path.rglob('*')
+                    if candidate.is_file() and candidate.suffix.lower() in SUPPORTED_EXTENSIONS
+                )
+            elif path.suffix.lower() in SUPPORTED_EXTENSIONS:
+                files.add(str(path))
+            else:
+                print(f"⚠️  Skipping unsupported path: {source}")
+
+        return sorted(files)
+
+    def ingest(self, sources: Union[str, List[str]]) -> IngestionReport:
+        """
+        Ingest every supported file under the given directories/paths
+
+        Args:
+            sources: Directory, file path, or a list of either
+
+        Returns:
+            IngestionReport with doc IDs, per-file failures and throughput
+        """
+        files = self.collect_files(sources)
+        report = IngestionReport(files_total=len(files))
+        files = self._reject_duplicate_names(files, report)
+        started_at = time.perf_counter()
+
+        print(f"=== BULK INGESTION: {len(files)} files ===")
+        pending: List[Tuple[str, Dict[str, Any]]] = []
+        pending_documents = 0
+
+        with ProcessPoolExecutor(max_workers=self.parse_workers) as parse_pool, \
+                ThreadPoolExecutor(max_workers=self.llm_concurrency, thread_name_prefix="ingest-llm") as llm_pool:
+            parse_futures = {}
+            context_futures = {}
+
+            # Unchanged files keep their stored context, so skip parsing and the LLM
+            for file_path in files:
+                try:
+                    existing_doc_id = self.chroma_manager.find_current_context(
+                        Path(file_path).name, file_sha256(file_path)
+                    )
+                    if existing_doc_id and self.load_database:
+                        self.db_manager.load_file_to_database(file_path)
+                except Exception as e:
+                    self._record_failure(report, file_path, e)
+                    continue
+
+                if existing_doc_id:
+                    report.doc_ids[file_path] = existing_doc_id
+                    report.unchanged.append(file_path)
+                else:
+                    parse_futures[parse_pool.submit(_parse_file, file_path)] = file_path
+
+            # Load parsed files into the database while earlier files are with the LLM
+            for future in as_completed(parse_futures):
+                file_path = parse_futures[future]
+                try:
+                    metadata = future.result()
+                    if self.load_database:
+                        self.db_manager.load_file_to_database(file_path)
+                except Exception as e:
+                    self._record_failure(report, file_path, e)
+                    continue
+
+                context_futures[llm_pool.submit(self.extractor.generate_context, metadata)] = file_path
+
+            for future in as_completed(context_futures):
+                file_path = context_futures[future]
+                try:
+                    context = future.result()
+                except Exception as e:
+                    self._record_failure(report, file_path, e)
+                    continue
+
+                pending.append((file_path, context))
+                pending_documents += 3 + len(context.get('column_insights', []))
+                if pending_documents >= self.batch_size:
+                    self._flush(pending, report)
+                    pending, pending_documents = [], 0
+
+        self._flush(pending, report)
+        report.elapsed_seconds = time.perf_counter() - started_at
+
+        print(f"✅ Ingested {len(report.doc_ids)}/{report.files_total} files in {report.elapsed_seconds:.1f}s "
+              f"({report.files_per_minute:.1f} files/min, {len(report.unchanged)} unchanged)")
+        if report.failures:
+            print(f"❌ {len(report.failures)} file(s) failed")
+
+        return report
+
+    def _reject_duplicate_names(self, files: List[str], report: IngestionReport) -> List[str]:
+        """
+        Keep only the first file for each file name
+
+        Tables and stored contexts are keyed by file name, so two files with the
+        same name in different directories would overwrite each other.
+        """
+        accepted: Dict[str, str] = {}
+        for file_path in files:
+            file_name = Path(file_path).name
+            if file_name in accepted:
+                self._record_failure(report, file_path, ValueError(
+                    f"duplicate file name, already ingesting {accepted[file_name]}"
+                ))
+                continue
+            accepted[file_name] = file_path
+
+        return list(accepted.values())
+
+    def _flush(self, pending: List[Tuple[str, Dict[str, Any]]], report: IngestionReport):
+        """Write a batch of contexts to the knowledge base"""
+        if not pending:
+            return
+
+        try:
+            doc_ids = self.chroma_manager.store_file_contexts(
+                [context for _, context in pending], batch_size=self.batch_size
+            )
+        except Exception as e:
+            for file_path, _ in pending:
+                self._record_failure(report, file_path, e)
+            return
+
+        for (file_path, _), doc_id in zip(pending, doc_ids):
+            report.doc_ids[file_path] = doc_id
+            print(f"   📚 {Path(file_path).name} → {doc_id}")
+
+    def _record_failure(self, report: IngestionReport, file_path: str, error: Exception):
+        report.failures[file_path] = f"{type(error).__name__}: {error}"
+        print(f"   ❌ {Path(file_path).name}: {error}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Ingest many CSV/Excel/Parquet/Feather files into the database and knowledge base")
+    parser.add_argument('sources', nargs='+', help="Files and/or directories to ingest")
+    parser.add_argument('--parse-workers', type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument('--llm-concurrency', type=int, default=4, help="Concurrent LLM context generations")
+    parser.add_argument('--batch-size', type=int, default=256, help="Documents per ChromaDB write")
+    parser.add_argument('--skip-database', action='store_true', help="Only build the knowledge base")
+    args = parser.parse_args(argv)
+
+    ingestor = BulkIngestor(
+        parse_workers=args.parse_workers,
+        llm_concurrency=args.llm_concurrency,
+        batch_size=args.batch_size,
+        load_database=not args.skip_database
+    )
+    report = ingestor.ingest(args.sources)
+
+    return 1 if report.failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
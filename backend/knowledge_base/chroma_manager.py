@@ -1,10 +1,18 @@
 import chromadb
 from chromadb.config import Settings
+from chromadb.utils import embedding_functions
 import json
 import uuid
 from typing import Dict, Any, List, Optional
 import os
 
+from utils import LRUCache, normalize_prompt
+from .context_store import ContextStore
+
+# Prompt embeddings keyed by (embedding model id, normalized prompt), shared across instances
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+embedding_cache = LRUCache(max_size=EMBEDDING_CACHE_SIZE)
+
 class ChromaManager:
     """Manage ChromaDB operations for knowledge base storage and retrieval"""
     
@@ -12,6 +20,10 @@ class ChromaManager:
         self.persist_directory = persist_directory
         os.makedirs(persist_directory, exist_ok=True)
         
+        # Same model Chroma uses by default, held here so queries can be embedded (and cached) by us
+        self.embedding_function = embedding_functions.DefaultEmbeddingFunction()
+        self.embedding_model_id = self._embedding_model_id(self.embedding_function)
+        
         self.client = chromadb.PersistentClient(
             path=persist_directory,
             settings=Settings(
@@ -23,21 +35,130 @@ class ChromaManager:
         # Create or get collection
         self.collection = self.client.get_or_create_collection(
             name="knowledge_base",
-            metadata={"description": "File-based knowledge base for dashboard generation"}
+            metadata={"description": "File-based knowledge base for dashboard generation"},
+            embedding_function=self.embedding_function
         )
+        
+        # Complete contexts live in SQLite next to the vector index, which also serves as the file registry
+        self.context_store = ContextStore(os.path.join(persist_directory, "contexts.db"))
+        self._migrate_legacy_contexts()
     
     def store_file_context(self, context_data: Dict[str, Any]) -> str:
         """
         Store file context in ChromaDB
         
+        A context for unchanged file content (same content hash) is not stored
+        again. Otherwise the new documents are added first and the file's
+        previous documents removed afterwards, so queries never see the file
+        without context.
+        
         Args:
             context_data: Generated context from ContextExtractor
             
         Returns:
             str: Document ID for the stored context
         """
+        existing_doc_id = self._find_unchanged_context(context_data)
+        if existing_doc_id:
+            return existing_doc_id
+        
         doc_id = str(uuid.uuid4())
+        documents, metadatas, ids = self._build_documents(doc_id, context_data)
+        
+        # Add to ChromaDB
+        self.collection.add(
+            documents=documents,
+            metadatas=metadatas,
+            ids=ids
+        )
+        
+        # Store complete context as metadata for retrieval
+        self._store_complete_context(doc_id, context_data)
+        self._remove_stale_documents(context_data['file_info']['file_name'], doc_id)
+        
+        return doc_id
+    
+    def find_current_context(self, file_name: str, content_hash: str) -> Optional[str]:
+        """
+        Find the context generated from this exact file content
+        
+        Lets ingestion skip LLM context generation for unchanged files.
         
+        Returns:
+            Document ID, or None if the file is new or has changed
+        """
+        return self.context_store.find(file_name, content_hash)
+    
+    def store_file_contexts(self, contexts: List[Dict[str, Any]], batch_size: int = 256) -> List[str]:
+        """
+        Store many file contexts with batched ChromaDB writes
+        
+        Documents from consecutive contexts are grouped so each collection.add
+        embeds and writes up to batch_size documents at once.
+        
+        Args:
+            contexts: Generated contexts from ContextExtractor
+            batch_size: Maximum documents per collection.add call
+            
+        Only the last context for each file name is stored; earlier ones would
+        otherwise be removed as stale documents of the same file.
+        
+        Returns:
+            Document IDs, in the same order as contexts
+        """
+        latest = {context_data['file_info']['file_name']: context_data for context_data in contexts}
+        stored_doc_ids = {}
+        new_contexts = []
+        documents, metadatas, ids = [], [], []
+        
+        def flush():
+            if ids:
+                self.collection.add(documents=documents, metadatas=metadatas, ids=ids)
+                documents.clear()
+                metadatas.clear()
+                ids.clear()
+        
+        for file_name, context_data in latest.items():
+            existing_doc_id = self._find_unchanged_context(context_data)
+            if existing_doc_id:
+                stored_doc_ids[file_name] = existing_doc_id
+                continue
+            
+            doc_id = str(uuid.uuid4())
+            context_documents, context_metadatas, context_ids = self._build_documents(doc_id, context_data)
+            
+            if len(ids) + len(context_ids) > batch_size:
+                flush()
+            
+            documents.extend(context_documents)
+            metadatas.extend(context_metadatas)
+            ids.extend(context_ids)
+            stored_doc_ids[file_name] = doc_id
+            new_contexts.append((doc_id, context_data))
+        
+        flush()
+        self.context_store.save_many(new_contexts)
+        for doc_id, context_data in new_contexts:
+            self._remove_stale_documents(context_data['file_info']['file_name'], doc_id)
+        
+        return [stored_doc_ids[context_data['file_info']['file_name']] for context_data in contexts]
+    
+    def _find_unchanged_context(self, context_data: Dict[str, Any]) -> Optional[str]:
+        file_info = context_data['file_info']
+        if not file_info.get('content_hash'):
+            return None
+        return self.context_store.find(file_info['file_name'], file_info['content_hash'])
+    
+    def _remove_stale_documents(self, file_name: str, current_doc_id: str):
+        """Delete a file's documents from earlier ingestions once its new ones are stored"""
+        self.collection.delete(where={"$and": [
+            {"file_name": {"$eq": file_name}},
+            {"doc_id": {"$ne": current_doc_id}}
+        ]})
+        self.context_store.delete_stale(file_name, current_doc_id)
+    
+    def _build_documents(self, doc_id: str, context_data: Dict[str, Any]) -> tuple[List[str], List[Dict[str, Any]], List[str]]:
+        """Split a file context into the documents embedded in ChromaDB"""
         # Prepare documents for embedding
         documents = []
         metadatas = []
@@ -84,17 +205,7 @@ class ChromaManager:
         })
         ids.append(f"{doc_id}_queries")
         
-        # Add to ChromaDB
-        self.collection.add(
-            documents=documents,
-            metadatas=metadatas,
-            ids=ids
-        )
-        
-        # Store complete context as metadata for retrieval
-        self._store_complete_context(doc_id, context_data)
-        
-        return doc_id
+        return documents, metadatas, ids
     
     def query_relevant_context(self, query: str, n_results: int = 5) -> List[Dict[str, Any]]:
         """
@@ -108,7 +219,7 @@ class ChromaManager:
             List of relevant context documents
         """
         results = self.collection.query(
-            query_texts=[query],
+            query_embeddings=[self.embed_query(query)],
             n_results=n_results,
             include=["documents", "metadatas", "distances"]
         )
@@ -123,6 +234,46 @@ class ChromaManager:
         
         return relevant_contexts
     
+    def embed_query(self, query: str) -> Any:
+        """
+        Embed a query, reusing the cached vector for repeated prompts
+        
+        Args:
+            query: User's natural language query
+            
+        Returns:
+            Embedding vector for the normalized query
+        """
+        text = normalize_prompt(query)
+        key = (self.embedding_model_id, text)
+        
+        embedding = embedding_cache.get(key)
+        if embedding is None:
+            embedding = self.embedding_function([text])[0]
+            embedding_cache.set(key, embedding)
+        
+        return embedding
+    
+    @staticmethod
+    def _embedding_model_id(embedding_function: Any) -> str:
+        """Identify the embedding model (older chromadb releases have no EmbeddingFunction.name())"""
+        model_name = getattr(embedding_function, 'MODEL_NAME', None)
+        if model_name:
+            return model_name
+        
+        name = getattr(embedding_function, 'name', None)
+        return name() if callable(name) else type(embedding_function).__name__
+    
+    def warm_up(self) -> int:
+        """
+        Load the embedding model and open the vector index ahead of the first query
+        
+        Returns:
+            Number of documents in the collection
+        """
+        self.collection.query(query_texts=["warm up"], n_results=1)
+        return self.collection.count()
+    
     def get_file_context(self, file_name: str) -> Optional[Dict[str, Any]]:
         """
         Get complete context for a specific file
@@ -133,39 +284,33 @@ class ChromaManager:
         Returns:
             Complete context data or None if not found
         """
-        results = self.collection.query(
-            query_texts=[f"file:{file_name}"],
+        results = self.collection.get(
             where={"file_name": file_name},
-            n_results=1
+            limit=1,
+            include=["metadatas"]
         )
         
-        if results['documents'][0]:
-            doc_id = results['metadatas'][0][0]['doc_id']
+        if results['metadatas']:
+            doc_id = results['metadatas'][0]['doc_id']
             return self._get_complete_context(doc_id)
         
         return None
     
-    def list_available_files(self) -> List[Dict[str, str]]:
+    def list_available_files(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, str]]:
         """
         List all files in the knowledge base
         
+        Reads the file registry, so the cost scales with the number of files
+        rather than the number of embedded documents.
+        
+        Args:
+            limit: Maximum number of files to return (None for all)
+            offset: Number of files to skip, for pagination
+            
         Returns:
             List of file information
         """
-        # Get all unique files from metadata
-        all_results = self.collection.get()
-        
-        files = {}
-        for metadata in all_results['metadatas']:
-            file_name = metadata.get('file_name')
-            if file_name and file_name not in files:
-                files[file_name] = {
-                    'file_name': file_name,
-                    'file_path': metadata.get('file_path', ''),
-                    'doc_id': metadata.get('doc_id')
-                }
-        
-        return list(files.values())
+        return self.context_store.list_files(limit=limit, offset=offset)
     
     def delete_file_context(self, file_name: str) -> bool:
         """
@@ -186,30 +331,42 @@ class ChromaManager:
             if results['ids']:
                 # Delete from ChromaDB
                 self.collection.delete(ids=results['ids'])
-                
-                # Delete complete context file
-                doc_id = results['metadatas'][0]['doc_id']
+            
+            # Delete every stored context for the file (older ingests may have left
+            # several doc IDs) and any legacy JSON files
+            doc_ids = {metadata['doc_id'] for metadata in results['metadatas'] if metadata.get('doc_id')}
+            doc_ids.update(self.context_store.delete_file(file_name))
+            for doc_id in doc_ids:
                 context_file = os.path.join(self.persist_directory, f"{doc_id}_context.json")
                 if os.path.exists(context_file):
                     os.remove(context_file)
-                
-                return True
             
-            return False
+            return bool(results['ids'] or doc_ids)
         except Exception as e:
             print(f"Error deleting file context: {e}")
             return False
     
     def _store_complete_context(self, doc_id: str, context_data: Dict[str, Any]):
-        """Store complete context data as JSON file for full retrieval"""
-        context_file = os.path.join(self.persist_directory, f"{doc_id}_context.json")
-        with open(context_file, 'w') as f:
-            json.dump(context_data, f, indent=2, default=str)
+        """Store complete context data in the context store for full retrieval"""
+        self.context_store.save(doc_id, context_data)
+    
+    def _migrate_legacy_contexts(self):
+        """Move contexts stored as <doc_id>_context.json files into the context store"""
+        for entry in os.listdir(self.persist_directory):
+            if entry.endswith("_context.json"):
+                self._get_complete_context(entry[:-len("_context.json")])
     
     def _get_complete_context(self, doc_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve complete context data from JSON file"""
+        """Retrieve complete context data, migrating legacy JSON files on first read"""
+        context_data = self.context_store.get(doc_id)
+        if context_data is not None:
+            return context_data
+        
         context_file = os.path.join(self.persist_directory, f"{doc_id}_context.json")
         if os.path.exists(context_file):
             with open(context_file, 'r') as f:
-                return json.load(f)
-        return None
\ No newline at end of file
+                context_data = json.load(f)
+            self.context_store.save(doc_id, context_data)
+            os.remove(context_file)
+            return context_data
+        return None
@@ -1,16 +1,17 @@
-import groq
 import json
 from typing import Dict, Any, List
 import os
 from dotenv import load_dotenv
 
+from utils import get_llm_client
+
 load_dotenv()
 
 class ContextExtractor:
     """Use LLM to generate rich context and insights from parsed file data"""
     
     def __init__(self):
-        self.client = groq.Groq(api_key=os.getenv('GROQ_API_KEY'))
+        self.client = get_llm_client()
     
     def generate_context(self, file_metadata: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -34,7 +35,8 @@ class ContextExtractor:
                 'file_name': file_metadata['file_name'],
                 'file_path': file_metadata['file_path'],
                 'row_count': file_metadata['row_count'],
-                'column_count': file_metadata['column_count']
+                'column_count': file_metadata['column_count'],
+                'content_hash': file_metadata.get('content_hash')
             },
             'table_description': table_description,
             'column_insights': column_insights,
@@ -0,0 +1,145 @@
+import json
+import os
+import sqlite3
+from typing import Dict, Any, List, Optional, Tuple
+
+class ContextStore:
+    """
+    SQLite-backed store for complete file contexts
+
+    Each context is kept as one compact JSON row keyed by doc_id (with an index
+    on file_name), so retrieving a file's full context is a single indexed read
+    instead of opening and parsing a pretty-printed JSON file.
+    """
+
+    def __init__(self, db_path: str = "./chroma_db/contexts.db"):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.init_store()
+
+    def init_store(self):
+        """Create the contexts table and its file_name index"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS file_contexts (
+                    doc_id TEXT PRIMARY KEY,
+                    file_name TEXT NOT NULL,
+                    file_path TEXT,
+                    context TEXT NOT NULL,
+                    stored_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            cursor.execute("PRAGMA table_info(file_contexts)")
+            if 'content_hash' not in {row[1] for row in cursor.fetchall()}:
+                cursor.execute("ALTER TABLE file_contexts ADD COLUMN content_hash TEXT")
+
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_file_contexts_file_name ON file_contexts (file_name)")
+
+            conn.commit()
+
+    def save(self, doc_id: str, context_data: Dict[str, Any]):
+        """
+        Store (or replace) the complete context for a document
+
+        Args:
+            doc_id: Document ID shared with the ChromaDB entries
+            context_data: Generated context from ContextExtractor
+        """
+        self.save_many([(doc_id, context_data)])
+
+    def save_many(self, entries: List[Tuple[str, Dict[str, Any]]]):
+        """Store several (doc_id, context_data) pairs in one transaction"""
+        rows = []
+        for doc_id, context_data in entries:
+            file_info = context_data.get('file_info', {})
+            payload = json.dumps(context_data, separators=(',', ':'), default=str)
+            rows.append((
+                doc_id, file_info.get('file_name', ''), file_info.get('file_path', ''),
+                file_info.get('content_hash'), payload
+            ))
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO file_contexts (doc_id, file_name, file_path, content_hash, context) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.commit()
+
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Get the complete context for a document, or None if not stored"""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute("SELECT context FROM file_contexts WHERE doc_id = ?", (doc_id,)).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def find(self, file_name: str, content_hash: str) -> Optional[str]:
+        """Get the doc ID of a context generated from exactly this file content"""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT doc_id FROM file_contexts WHERE file_name = ? AND content_hash = ? ORDER BY rowid DESC LIMIT 1",
+                (file_name, content_hash)
+            ).fetchone()
+
+        return row[0] if row else None
+
+    def list_files(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, str]]:
+        """
+        List stored files (most recent document per file name)
+
+        Args:
+            limit: Maximum number of files to return (None for all)
+            offset: Number of files to skip, for pagination
+
+        Returns:
+            File name, path and doc ID for each file, ordered by file name
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute("""
+                SELECT file_name, file_path, doc_id FROM file_contexts
+                WHERE rowid IN (SELECT MAX(rowid) FROM file_contexts GROUP BY file_name)
+                ORDER BY file_name
+                LIMIT ? OFFSET ?
+            """, (-1 if limit is None else limit, offset)).fetchall()
+
+        return [{'file_name': name, 'file_path': path or '', 'doc_id': doc_id} for name, path, doc_id in rows]
+
+    def delete_stale(self, file_name: str, current_doc_id: str) -> List[str]:
+        """
+        Remove every other context stored for a file
+
+        Returns:
+            Doc IDs that were removed
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            stale = [row[0] for row in conn.execute(
+                "SELECT doc_id FROM file_contexts WHERE file_name = ? AND doc_id != ?", (file_name, current_doc_id)
+            )]
+            conn.execute("DELETE FROM file_contexts WHERE file_name = ? AND doc_id != ?", (file_name, current_doc_id))
+            conn.commit()
+
+        return stale
+
+    def delete_file(self, file_name: str) -> List[str]:
+        """
+        Remove every context stored for a file
+
+        Returns:
+            Doc IDs that were removed
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            removed = [row[0] for row in conn.execute(
+                "SELECT doc_id FROM file_contexts WHERE file_name = ?", (file_name,)
+            )]
+            conn.execute("DELETE FROM file_contexts WHERE file_name = ?", (file_name,))
+            conn.commit()
+
+        return removed
+
+    def delete(self, doc_id: str) -> bool:
+        """Remove a document's context"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute("DELETE FROM file_contexts WHERE doc_id = ?", (doc_id,))
+            conn.commit()
+            return cursor.rowcount > 0
@@ -1,13 +1,46 @@
 import pandas as pd
 import os
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterator, Optional
+
+from utils.hashing import file_sha256
+from utils.dtype_optimizer import INGEST_OPTIMIZE_DTYPES, optimize_dtypes, read_csv_optimized
+from utils.columnar import COLUMNAR_EXTENSIONS, is_columnar_file, iter_record_batches, read_columnar
+from .streaming_profiler import StreamingProfiler
+
+PROFILE_MODES = ('exact', 'approximate', 'auto')
 
 class FileParser:
-    """Parse CSV and Excel files to extract structured data information"""
+    """
+    Parse CSV, Excel, Parquet and Feather files to extract structured data information
+    
+    profile_mode chooses how columns are profiled: "exact" loads the whole
+    file, "approximate" streams it in chunks with sketches (exact counts and
+    min/max, approximate distinct counts, quartiles and text stats), and
+    "auto" uses approximate profiling for files above approximate_threshold
+    bytes.
     
-    def __init__(self):
-        self.supported_extensions = {'.csv', '.xlsx', '.xls'}
+    With optimize_memory (INGEST_OPTIMIZE_DTYPES), exact profiling reads
+    low-cardinality text as category and downcasts integers, and reports
+    the savings under 'memory_optimization'.
+    """
+    
+    def __init__(
+        self,
+        profile_mode: Optional[str] = None,
+        approximate_threshold: Optional[int] = None,
+        chunk_rows: Optional[int] = None,
+        sample_rows: Optional[int] = None,
+        optimize_memory: Optional[bool] = None
+    ):
+        self.supported_extensions = {'.csv', '.xlsx', '.xls'} | COLUMNAR_EXTENSIONS
+        self.profile_mode = (profile_mode or os.getenv("FILE_PROFILE_MODE", "auto")).lower()
+        if self.profile_mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {self.profile_mode} (expected one of {', '.join(PROFILE_MODES)})")
+        self.approximate_threshold = approximate_threshold or int(os.getenv("FILE_PROFILE_APPROX_BYTES", str(256 * 1024 * 1024)))
+        self.chunk_rows = chunk_rows or int(os.getenv("FILE_PROFILE_CHUNK_ROWS", "200000"))
+        self.sample_rows = sample_rows or int(os.getenv("FILE_PROFILE_SAMPLE_ROWS", "10000"))
+        self.optimize_memory = INGEST_OPTIMIZE_DTYPES if optimize_memory is None else optimize_memory
     
     def parse_file(self, file_path: str) -> Dict[str, Any]:
         """
@@ -27,26 +60,90 @@ class FileParser:
         if path.suffix.lower() not in self.supported_extensions:
             raise ValueError(f"Unsupported file type: {path.suffix}")
         
+        file_size = path.stat().st_size
+        if self.profile_mode == 'approximate' or (self.profile_mode == 'auto' and file_size > self.approximate_threshold):
+            return self._parse_file_approximate(path)
+        
         # Read the file
         df = self._read_file(file_path)
         
+        memory_report = None
+        if self.optimize_memory:
+            df, memory_report = optimize_dtypes(df)
+        
         # Extract metadata
         metadata = {
             'file_path': str(path.absolute()),
             'file_name': path.name,
-            'file_size': path.stat().st_size,
+            'file_size': file_size,
+            'content_hash': file_sha256(file_path),
             'extension': path.suffix.lower(),
+            'profile_mode': 'exact',
             'row_count': len(df),
             'column_count': len(df.columns),
             'columns': self._analyze_columns(df),
             'sample_data': self._get_sample_data(df),
             'data_types': self._get_data_types(df),
             'missing_values': self._get_missing_values(df),
-            'summary_stats': self._get_summary_stats(df)
+            'summary_stats': self._get_summary_stats(df),
+            'memory_optimization': memory_report
         }
         
         return metadata
     
+    def _parse_file_approximate(self, path: Path) -> Dict[str, Any]:
+        """Profile a file in chunks with sketches instead of loading it whole"""
+        profiler = StreamingProfiler(sample_size=self.sample_rows)
+        for chunk in self._iter_chunks(path):
+            profiler.update(chunk)
+        
+        return {
+            'file_path': str(path.absolute()),
+            'file_name': path.name,
+            'file_size': path.stat().st_size,
+            'content_hash': file_sha256(str(path)),
+            'extension': path.suffix.lower(),
+            'profile_mode': 'approximate',
+            'row_count': profiler.row_count,
+            'column_count': len(profiler.columns),
+            'columns': profiler.analyze_columns(),
+            'sample_data': profiler.sample_data(),
+            'data_types': profiler.data_types(),
+            'missing_values': profiler.missing_values(),
+            'summary_stats': profiler.summary_stats()
+        }
+    
+    def _iter_chunks(self, path: Path) -> Iterator[pd.DataFrame]:
+        """Yield the file as DataFrame chunks of chunk_rows rows"""
+        if is_columnar_file(str(path)):
+            for batch in iter_record_batches(str(path), batch_size=self.chunk_rows):
+                yield batch.to_pandas()
+            return
+        
+        if path.suffix.lower() != '.csv':
+            # Excel can't be streamed; profiling in chunks still avoids the full-frame stats
+            df = self._read_file(str(path))
+            for start in range(0, len(df), self.chunk_rows):
+                yield df.iloc[start:start + self.chunk_rows]
+            return
+        
+        # Same encoding/separator fallback as _read_file, decided on the first chunk
+        for encoding in ['utf-8', 'latin-1', 'cp1252']:
+            for sep in [',', ';', '\t']:
+                try:
+                    reader = pd.read_csv(path, encoding=encoding, sep=sep, chunksize=self.chunk_rows)
+                    first_chunk = next(reader)
+                except StopIteration:
+                    return
+                except Exception:
+                    continue
+                
+                yield first_chunk
+                yield from reader
+                return
+        
+        raise ValueError("Could not read CSV file with any encoding/separator combination")
+    
     def _read_file(self, file_path: str) -> pd.DataFrame:
         """Read file based on extension"""
         path = Path(file_path)
@@ -56,6 +153,8 @@ class FileParser:
             for encoding in ['utf-8', 'latin-1', 'cp1252']:
                 for sep in [',', ';', '\t']:
                     try:
+                        if self.optimize_memory:
+                            return read_csv_optimized(file_path, encoding=encoding, sep=sep)
                         return pd.read_csv(file_path, encoding=encoding, sep=sep)
                     except:
                         continue
@@ -64,6 +163,9 @@ class FileParser:
         elif path.suffix.lower() in ['.xlsx', '.xls']:
             return pd.read_excel(file_path)
         
+        elif is_columnar_file(file_path):
+            return read_columnar(file_path)
+        
         else:
             raise ValueError(f"Unsupported file extension: {path.suffix}")
     
@@ -81,8 +183,8 @@ class FileParser:
                 'sample_values': df[col].dropna().head(5).tolist(),
             }
             
-            # Add type-specific analysis
-            if df[col].dtype in ['int64', 'float64']:
+            # Add type-specific analysis (any numeric width, so downcast columns still qualify)
+            if pd.api.types.is_numeric_dtype(df[col].dtype) and not pd.api.types.is_bool_dtype(df[col].dtype):
                 col_info.update({
                     'min_value': df[col].min(),
                     'max_value': df[col].max(),
@@ -90,7 +192,7 @@ class FileParser:
                     'std_value': df[col].std()
                 })
             
-            elif df[col].dtype == 'object':
+            elif self._is_text_dtype(df[col].dtype):
                 col_info.update({
                     'avg_length': df[col].astype(str).str.len().mean(),
                     'max_length': df[col].astype(str).str.len().max(),
@@ -101,6 +203,14 @@ class FileParser:
         
         return columns_info
     
+    def _is_text_dtype(self, dtype) -> bool:
+        """Python-object strings, pandas string dtype or categoricals"""
+        return (
+            pd.api.types.is_object_dtype(dtype) 
+            or pd.api.types.is_string_dtype(dtype) 
+            or isinstance(dtype, pd.CategoricalDtype)
+        )
+    
     def _get_sample_data(self, df: pd.DataFrame, n_samples: int = 3) -> List[Dict]:
         """Get sample rows from the dataframe"""
         return df.head(n_samples).to_dict('records')
@@ -116,7 +226,7 @@ class FileParser:
     def _get_summary_stats(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Get overall summary statistics"""
         numeric_cols = df.select_dtypes(include=['number']).columns
-        categorical_cols = df.select_dtypes(include=['object']).columns
+        categorical_cols = df.select_dtypes(include=['object', 'string', 'category']).columns
         
         summary = {
             'total_rows': len(df),
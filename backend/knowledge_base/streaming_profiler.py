@@ -0,0 +1,160 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Any, Optional
+
+from utils.sketches import RunningMoments, HyperLogLog, TDigest, ReservoirSample, describe_quantiles
+
+class _ColumnProfile:
+    """Streaming state for one column"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.non_null_count = 0
+        self.null_count = 0
+        self.dtypes = set()
+        self.kinds = set()
+        self.sample_values: List[Any] = []
+        self.moments = RunningMoments()
+        self.digest = TDigest()
+        self.distinct = HyperLogLog()
+
+    def update(self, series: pd.Series):
+        self.dtypes.add(str(series.dtype))
+        values = series.dropna()
+        self.non_null_count += len(values)
+        self.null_count += len(series) - len(values)
+
+        if len(self.sample_values) < 5:
+            self.sample_values.extend(values.head(5 - len(self.sample_values)).tolist())
+
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            self.kinds.add('numeric')
+            numeric = values.to_numpy(dtype=np.float64)
+            self.moments.update(numeric)
+            self.digest.update(numeric)
+            # Hash as float so 1 and 1.0 count once when chunks infer different dtypes
+            self.distinct.update(numeric)
+        else:
+            is_text = pd.api.types.is_string_dtype(series.dtype) or isinstance(series.dtype, pd.CategoricalDtype)
+            self.kinds.add('text' if is_text else 'other')
+            self.distinct.update(values.to_numpy())
+
+    @property
+    def dtype(self) -> str:
+        """dtype the whole column would have been read as"""
+        if len(self.dtypes) == 1:
+            return next(iter(self.dtypes))
+        if self.kinds == {'numeric'}:
+            return 'float64'
+        return 'object'
+
+    @property
+    def kind(self) -> str:
+        """numeric, text or other (a column mixing kinds across chunks is text)"""
+        if len(self.kinds) == 1:
+            return next(iter(self.kinds))
+        return 'text' if self.kinds else 'other'
+
+class StreamingProfiler:
+    """
+    Profile a table chunk by chunk without holding it in memory
+
+    Counts, nulls, min/max, mean and std are exact. Distinct counts
+    (HyperLogLog), quartiles (t-digest) and text statistics / common values
+    (from a uniform reservoir sample of rows) are approximate. The result has
+    the same shape as FileParser's exact profile.
+    """
+
+    def __init__(self, sample_size: int = 10000, seed: Optional[int] = 0):
+        self.row_count = 0
+        self.head: Optional[pd.DataFrame] = None
+        self.columns: Dict[str, _ColumnProfile] = {}
+        self.reservoir = ReservoirSample(size=sample_size, seed=seed)
+
+    def update(self, chunk: pd.DataFrame):
+        """Add the next chunk of rows"""
+        if self.head is None:
+            self.head = chunk.head(3)
+
+        for col in chunk.columns:
+            if col not in self.columns:
+                self.columns[col] = _ColumnProfile(col)
+            self.columns[col].update(chunk[col])
+
+        self.reservoir.update(chunk)
+        self.row_count += len(chunk)
+
+    def analyze_columns(self) -> List[Dict[str, Any]]:
+        """Per-column analysis in FileParser's format, with approximate fields flagged"""
+        sample = self.reservoir.sample
+        columns_info = []
+
+        for col, profile in self.columns.items():
+            dtype = profile.dtype
+            col_info = {
+                'name': col,
+                'dtype': dtype,
+                'non_null_count': profile.non_null_count,
+                'null_count': profile.null_count,
+                'unique_count': min(profile.distinct.count(), profile.non_null_count),
+                'sample_values': profile.sample_values,
+                'approximate_fields': ['unique_count']
+            }
+
+            if profile.kind == 'numeric':
+                col_info.update({
+                    'min_value': profile.moments.min,
+                    'max_value': profile.moments.max,
+                    'mean_value': profile.moments.mean if profile.moments.count else float('nan'),
+                    'std_value': profile.moments.std
+                })
+
+            elif profile.kind == 'text':
+                sampled = sample[col].dropna() if sample is not None else pd.Series(dtype=object)
+                lengths = sample[col].astype(str).str.len() if sample is not None else pd.Series(dtype=float)
+                scale = profile.non_null_count / len(sampled) if len(sampled) else 0
+                col_info.update({
+                    'avg_length': lengths.mean(),
+                    'max_length': lengths.max(),
+                    'common_values': {value: int(round(count * scale)) for value, count in sampled.value_counts().head(3).items()}
+                })
+                col_info['approximate_fields'] += ['avg_length', 'max_length', 'common_values']
+
+            columns_info.append(col_info)
+
+        return columns_info
+
+    def sample_data(self, n_samples: int = 3) -> List[Dict]:
+        return self.head.head(n_samples).to_dict('records') if self.head is not None else []
+
+    def data_types(self) -> Dict[str, str]:
+        return {col: profile.dtype for col, profile in self.columns.items()}
+
+    def missing_values(self) -> Dict[str, int]:
+        return {col: profile.null_count for col, profile in self.columns.items()}
+
+    def summary_stats(self) -> Dict[str, Any]:
+        """Overall summary; memory usage is extrapolated from the row sample"""
+        numeric_cols = [col for col, profile in self.columns.items() if profile.kind == 'numeric']
+        categorical_cols = [col for col, profile in self.columns.items() if profile.kind == 'text']
+        total_cells = self.row_count * len(self.columns)
+        total_nulls = sum(profile.null_count for profile in self.columns.values())
+
+        sample = self.reservoir.sample
+        sample_memory = sample.memory_usage(deep=True, index=False).sum() if sample is not None and len(sample) else 0
+
+        summary = {
+            'total_rows': self.row_count,
+            'total_columns': len(self.columns),
+            'numeric_columns': len(numeric_cols),
+            'categorical_columns': len(categorical_cols),
+            'memory_usage': int(sample_memory * self.row_count / len(sample)) if sample_memory else 0,
+            'completeness': (1 - total_nulls / total_cells) * 100 if total_cells else 100.0
+        }
+
+        if numeric_cols:
+            summary['numeric_summary'] = {
+                col: describe_quantiles(self.columns[col].moments, self.columns[col].digest) for col in numeric_cols
+            }
+
+        return summary
@@ -8,7 +8,10 @@ For API server functionality, use:
 This file contains testing and pipeline functions for development.
 """
 
+from typing import List, Union
+
 from knowledge_base import FileParser, ContextExtractor, ChromaManager
+from knowledge_base.bulk_ingestor import BulkIngestor, IngestionReport
 from prompt_enhancement import PromptEnhancer
 from database import DatabaseManager, SchemaAnalyzer
 from query_generation import SQLGenerator, QueryExecutor, DataProcessor
@@ -36,9 +39,20 @@ def process_file_complete_pipeline(file_path: str) -> str:
         # Step 1: Load file into SQLite database
         print("1. Loading file into database...")
         db_result = db_manager.load_file_to_database(file_path)
-        print(f"   Created table: {db_result['table_name']}")
+        if db_result['status'] == 'unchanged':
+            print(f"   Table {db_result['table_name']} is up to date")
+        elif db_result['status'] == 'appended':
+            print(f"   Appended {db_result['rows_added']} new rows to {db_result['table_name']}")
+        else:
+            print(f"   Created table: {db_result['table_name']}")
         print(f"   Loaded {db_result['row_count']} rows, {db_result['column_count']} columns")
         
+        # Unchanged content already has knowledge base context
+        doc_id = chroma_manager.find_current_context(db_result['file_name'], db_result['content_hash'])
+        if doc_id:
+            print(f"✅ File unchanged, reusing knowledge base context: {doc_id}")
+            return doc_id
+        
         # Step 2: Parse file metadata
         print("2. Parsing file metadata...")
         metadata = parser.parse_file(file_path)
@@ -61,6 +75,19 @@ def process_file_complete_pipeline(file_path: str) -> str:
         print(f"❌ Error processing file: {e}")
         raise
 
+def process_files_bulk(sources: Union[str, List[str]], llm_concurrency: int = 4) -> IngestionReport:
+    """
+    Bulk pipeline: load many files (or whole directories) into database + knowledge base
+    
+    Args:
+        sources: Directory, file path, or a list of either
+        llm_concurrency: Concurrent LLM context generations
+        
+    Returns:
+        IngestionReport with doc IDs, failures and files/min throughput
+    """
+    return BulkIngestor(llm_concurrency=llm_concurrency).ingest(sources)
+
 def test_complete_pipeline_with_chart_generation(user_prompt: str):
     """
     Test the COMPLETE pipeline: Prompt -> SQL -> Data -> Chart Component Generation
@@ -226,6 +253,7 @@ if __name__ == "__main__":
         
         # Step 1: Process file (uncomment when you have a file)
         # doc_id = process_file_complete_pipeline(file_path)
+        # report = process_files_bulk("path/to/your/data_dir")
         
         # Step 2: Show current database status
         show_database_status()
@@ -1,5 +1,7 @@
-import groq
 import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Dict, Any, List, Optional
 import os
 from dotenv import load_dotenv
@@ -7,10 +9,39 @@ from dataclasses import dataclass
 
 from knowledge_base import ChromaManager
 from database import SchemaAnalyzer
-from .templates import CONTEXT_ENHANCED_TEMPLATE, GENERIC_ENHANCED_TEMPLATE, METADATA_EXTRACTION_TEMPLATE
+from utils import get_llm_client
+from .templates import (
+    CONTEXT_ENHANCED_TEMPLATE, GENERIC_ENHANCED_TEMPLATE, METADATA_EXTRACTION_TEMPLATE, COMBINED_ENHANCEMENT_TEMPLATE
+)
 
 load_dotenv()
 
+ENHANCEMENT_MODES = ('single', 'multi')
+
+# Shared by all enhancers so concurrent jobs don't each spin up threads for the lookups
+_context_lookup_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv('PROMPT_CONTEXT_WORKERS', '8')),
+    thread_name_prefix="context-lookup"
+)
+
+# "[show me] [a bar chart of] [total] <measure> by <dimension> [as a line chart]"
+FAST_PATH_PATTERN = re.compile(
+    r'^(?:(?:show|display|plot|chart|graph|visualize|visualise|create|draw|give|get|list)\s+(?:me\s+)?)?'
+    r'(?:(?:a|an|the)\s+)?'
+    r'(?:(?P<chart_before>bar|line|pie|scatter|area)\s+(?:chart|graph|plot)\s+(?:of\s+)?)?'
+    r'(?:(?P<aggregation>total|sum|average|avg|mean|count|number|maximum|max|minimum|min)\s+(?:of\s+)?)?'
+    r'(?:the\s+)?(?P<measure>[a-z0-9_ ]+?)\s+(?:by|per|for each|across|over)\s+(?:each\s+)?(?P<dimension>[a-z0-9_ ]+?)'
+    r'(?:\s+(?:as\s+)?(?:a\s+)?(?P<chart_after>bar|line|pie|scatter|area)(?:\s+(?:chart|graph|plot))?)?$'
+)
+
+AGGREGATIONS = {
+    'total': 'SUM', 'sum': 'SUM', 'average': 'AVG', 'avg': 'AVG', 'mean': 'AVG',
+    'count': 'COUNT', 'number': 'COUNT', 'maximum': 'MAX', 'max': 'MAX', 'minimum': 'MIN', 'min': 'MIN'
+}
+AGGREGATION_LABELS = {'SUM': 'total', 'AVG': 'average', 'COUNT': 'count', 'MAX': 'max', 'MIN': 'min'}
+NUMERIC_TYPE_HINTS = ('INT', 'REAL', 'FLOA', 'DOUB', 'NUM', 'DEC')
+TIME_COLUMN_HINTS = ('date', 'year', 'month', 'week', 'day', 'quarter', 'time')
+
 @dataclass
 class EnhancementResult:
     """Structure for prompt enhancement results"""
@@ -23,10 +54,25 @@ class EnhancementResult:
 class PromptEnhancer:
     """Enhance user prompts with context and visualization guidance"""
     
-    def __init__(self):
-        self.client = groq.Groq(api_key=os.getenv('GROQ_API_KEY'))
-        self.chroma_manager = ChromaManager()
-        self.schema_analyzer = SchemaAnalyzer()
+    def __init__(
+        self,
+        chroma_manager: ChromaManager = None,
+        schema_analyzer: SchemaAnalyzer = None,
+        mode: Optional[str] = None,
+        fast_path: Optional[bool] = None
+    ):
+        self.client = get_llm_client()
+        self.chroma_manager = chroma_manager or ChromaManager()
+        self.schema_analyzer = schema_analyzer or SchemaAnalyzer()
+        
+        # "single": one JSON call returns enhanced prompt + metadata; "multi": enhance, then extract metadata
+        self.mode = (mode or os.getenv('PROMPT_ENHANCEMENT_MODE', 'single')).lower()
+        if self.mode not in ENHANCEMENT_MODES:
+            print(f"Unknown enhancement mode '{self.mode}', using 'single'")
+            self.mode = 'single'
+        
+        self.fast_path = fast_path if fast_path is not None else os.getenv('PROMPT_FAST_PATH', 'true').lower() == 'true'
+        self.context_timeout = float(os.getenv('PROMPT_CONTEXT_TIMEOUT', '60'))
     
     def enhance_prompt(self, user_prompt: str) -> EnhancementResult:
         """
@@ -39,11 +85,14 @@ class PromptEnhancer:
             EnhancementResult with enhanced prompt and metadata
         """
         
-        # Query knowledge base for relevant context
-        relevant_contexts = self.chroma_manager.query_relevant_context(
-            user_prompt, 
-            n_results=3
-        )
+        # Prompts that already name known columns ("revenue by region") skip the LLM entirely
+        if self.fast_path:
+            fast_result = self._enhance_fast_path(user_prompt)
+            if fast_result is not None:
+                return fast_result
+        
+        # Query knowledge base and database schema context concurrently
+        relevant_contexts, schema_context = self._lookup_contexts(user_prompt)
         
         # Debug prints
         print(f"DEBUG: Found {len(relevant_contexts)} contexts")
@@ -52,24 +101,31 @@ class PromptEnhancer:
             for i, ctx in enumerate(relevant_contexts):
                 print(f"DEBUG: Context {i+1}: {ctx['metadata'].get('file_name', 'Unknown')} - Distance: {ctx.get('distance', 1.0)}")
         
-        # Get database schema context
-        schema_context = self.schema_analyzer.get_table_context_for_prompt(user_prompt)
-        
         # Determine if we have good context
         has_context = len(relevant_contexts) > 0 and relevant_contexts[0].get('distance', 1.0) < 0.7
         
+        metadata = None
+        
         if has_context or schema_context.strip() != "No database tables available.":
-            enhanced_prompt, data_sources = self._enhance_with_context(
-                user_prompt, 
-                relevant_contexts,
-                schema_context
-            )
+            if self.mode == 'single':
+                enhanced_prompt, data_sources, metadata = self._enhance_single_call(
+                    user_prompt,
+                    relevant_contexts,
+                    schema_context
+                )
+            else:
+                enhanced_prompt, data_sources = self._enhance_with_context(
+                    user_prompt, 
+                    relevant_contexts,
+                    schema_context
+                )
             has_context = True  # Consider schema context as valid context
         else:
             enhanced_prompt, data_sources = self._enhance_generic(user_prompt)
         
-        # Extract metadata
-        metadata = self._extract_metadata(enhanced_prompt)
+        # Extract metadata (already returned by the single-call mode)
+        if metadata is None:
+            metadata = self._extract_metadata(enhanced_prompt)
         
         return EnhancementResult(
             enhanced_prompt=enhanced_prompt,
@@ -79,17 +135,222 @@ class PromptEnhancer:
             sql_context=schema_context
         )
     
-    def _enhance_with_context(self, user_prompt: str, contexts: List[Dict[str, Any]], schema_context: str) -> tuple[str, List[str]]:
-        """Enhance prompt using knowledge base context and database schema"""
+    def _lookup_contexts(self, user_prompt: str) -> tuple[List[Dict[str, Any]], str]:
+        """
+        Run the knowledge base query and schema context lookup in parallel
+        
+        Both share one timeout, so latency is the slower lookup rather than
+        the sum. Knowledge base context is optional and degrades to no
+        results; the schema context is required for SQL generation.
+        
+        Raises:
+            TimeoutError: If the schema context isn't ready within the timeout
+        """
+        started_at = time.time()
+        contexts_future = _context_lookup_pool.submit(
+            self.chroma_manager.query_relevant_context, user_prompt, n_results=3
+        )
+        schema_future = _context_lookup_pool.submit(
+            self.schema_analyzer.get_table_context_for_prompt, user_prompt
+        )
+        
+        wait([contexts_future, schema_future], timeout=self.context_timeout)
+        
+        if not schema_future.done():
+            contexts_future.cancel()
+            raise TimeoutError(f"Schema context lookup timed out after {self.context_timeout:g}s")
+        
+        schema_context = schema_future.result()
+        
+        relevant_contexts = []
+        if contexts_future.done():
+            try:
+                relevant_contexts = contexts_future.result()
+            except Exception as e:
+                print(f"Knowledge base lookup failed, continuing without it: {e}")
+        else:
+            contexts_future.cancel()
+            print(f"Knowledge base lookup timed out after {self.context_timeout:g}s, continuing without it")
+        
+        print(f"DEBUG: Context lookups finished in {time.time() - started_at:.3f}s")
+        return relevant_contexts, schema_context
+    
+    def _enhance_single_call(
+        self, 
+        user_prompt: str, 
+        contexts: List[Dict[str, Any]], 
+        schema_context: str
+    ) -> tuple[str, List[str], Dict[str, Any]]:
+        """Enhance prompt and extract metadata with one structured LLM call"""
         
-        # Format context information
         data_context = self._format_contexts(contexts) if contexts else "No specific file context available."
+        data_sources = self._data_sources(contexts, schema_context)
+        
+        formatted_prompt = COMBINED_ENHANCEMENT_TEMPLATE.format(
+            user_prompt=user_prompt,
+            data_context=data_context,
+            schema_context=schema_context
+        )
+        
+        response = self.client.chat.completions.create(
+            model="llama3-8b-8192",
+            messages=[{"role": "user", "content": formatted_prompt}],
+            temperature=0.2,  # Low temperature so identical prompts enhance identically
+            max_tokens=1500
+        )
+        
+        response_text = response.choices[0].message.content.strip()
+        
+        try:
+            start_idx = response_text.find('{')
+            end_idx = response_text.rfind('}') + 1
+            
+            if start_idx == -1 or end_idx <= start_idx:
+                raise ValueError("No JSON object found in response")
+            
+            parsed = json.loads(response_text[start_idx:end_idx])
+            enhanced_prompt = str(parsed.get('enhanced_prompt') or '').strip()
+            metadata = parsed.get('metadata') if isinstance(parsed.get('metadata'), dict) else {}
+            
+            if not enhanced_prompt:
+                raise ValueError("Response has no enhanced_prompt")
+            
+        except (json.JSONDecodeError, ValueError) as e:
+            # Still usable: the raw text is a reasonable enhanced prompt
+            print(f"Error parsing combined enhancement response: {e}")
+            enhanced_prompt = response_text
+            metadata = {}
+        
+        required_fields = ['confidence_score', 'suggested_chart_types', 'data_requirements', 'complexity_level']
+        for field in required_fields:
+            if field not in metadata:
+                metadata[field] = self._get_default_metadata_value(field)
+        
+        return enhanced_prompt, data_sources, metadata
+    
+    def _enhance_fast_path(self, user_prompt: str) -> Optional[EnhancementResult]:
+        """
+        Build the enhancement deterministically when the prompt maps onto known columns
+        
+        Args:
+            user_prompt: Raw user prompt
+            
+        Returns:
+            EnhancementResult, or None if the prompt needs LLM enhancement
+        """
+        match = self._match_known_columns(user_prompt)
+        if match is None:
+            return None
+        
+        table_name = match['table']
+        dimension = match['dimension']['name']
+        aggregation = match['aggregation']
+        measure = match['measure']['name'] if match['measure'] else None
+        
+        value_expression = f"{aggregation}({measure})" if measure else "COUNT(*)"
+        value_alias = f"{AGGREGATION_LABELS[aggregation]}_{measure}" if measure else "count"
+        is_time_dimension = any(hint in dimension.lower() for hint in TIME_COLUMN_HINTS)
+        chart_type = match['chart_type'] or ('line' if is_time_dimension else 'bar')
+        ordering = f"{dimension} ascending" if is_time_dimension else f"{value_alias} descending"
+        
+        title = f"{value_alias.replace('_', ' ').title()} by {dimension.replace('_', ' ').title()}"
+        enhanced_prompt = (
+            f"Query table {table_name}: select {dimension} and {value_expression} AS {value_alias}, "
+            f"grouped by {dimension}, ordered by {ordering}. "
+            f"Visualize as a {chart_type} chart with x-axis {dimension} and y-axis {value_alias}, "
+            f"titled \"{title}\"."
+        )
+        
+        columns = match['columns']
+        schema_context = "DATABASE SCHEMA CONTEXT:\nAVAILABLE TABLES AND COLUMNS:\n"
+        schema_context += f"\nTable: {table_name}\nColumns:\n"
+        schema_context += "".join(f"  - {col['name']} ({col['type']})\n" for col in columns)
+        
+        print(f"⚡ Fast-path enhancement: {value_expression} by {dimension} from {table_name}")
+        
+        return EnhancementResult(
+            enhanced_prompt=enhanced_prompt,
+            metadata={
+                "confidence_score": 0.9,
+                "suggested_chart_types": [chart_type],
+                "data_requirements": [col for col in (measure, dimension) if col],
+                "complexity_level": "simple",
+                "estimated_load_time": "fast",
+                "enhancement_mode": "fast_path"
+            },
+            data_sources=["Database Tables"],
+            has_context=True,
+            sql_context=schema_context
+        )
+    
+    def _match_known_columns(self, user_prompt: str) -> Optional[Dict[str, Any]]:
+        """Match '<measure> by <dimension>' prompts against exactly one table's columns"""
+        normalized = re.sub(r'[^\w\s]', ' ', user_prompt.lower())
+        normalized = re.sub(r'\s+', ' ', normalized).strip()
+        
+        prompt_match = FAST_PATH_PATTERN.match(normalized)
+        if not prompt_match:
+            return None
+        
+        aggregation = AGGREGATIONS.get(prompt_match.group('aggregation') or 'total')
+        candidates = []
+        
+        for table_name, columns in self.schema_analyzer.db_manager.get_column_catalog().items():
+            dimension = self._resolve_column(prompt_match.group('dimension'), columns)
+            measure = self._resolve_column(prompt_match.group('measure'), columns)
+            
+            if dimension is None:
+                continue
+            
+            if measure is None:
+                # "number of games by platform": counting rows needs no measure column
+                if aggregation != 'COUNT':
+                    continue
+            elif measure['name'] == dimension['name']:
+                continue
+            elif aggregation != 'COUNT' and not any(hint in measure['type'].upper() for hint in NUMERIC_TYPE_HINTS):
+                continue
+            
+            candidates.append({
+                'table': table_name,
+                'columns': columns,
+                'measure': measure,
+                'dimension': dimension,
+                'aggregation': aggregation,
+                'chart_type': prompt_match.group('chart_before') or prompt_match.group('chart_after')
+            })
+        
+        # Ambiguous across tables (or no match): let the LLM decide
+        return candidates[0] if len(candidates) == 1 else None
+    
+    def _resolve_column(self, phrase: str, columns: List[Dict[str, str]]) -> Optional[Dict[str, str]]:
+        """Find the column a phrase names ("global sales" -> global_sales), ignoring plurals"""
+        key = phrase.strip().replace(' ', '_')
+        
+        for col in columns:
+            name = col['name'].lower()
+            if name == key or name.rstrip('s') == key.rstrip('s'):
+                return col
+        
+        return None
+    
+    def _data_sources(self, contexts: List[Dict[str, Any]], schema_context: str) -> List[str]:
+        """List the knowledge base files and database tables backing an enhancement"""
         data_sources = list(set([ctx['metadata'].get('file_name', 'Unknown') for ctx in contexts])) if contexts else []
         
         # Add database tables as data sources
         if "No database tables available." not in schema_context:
             data_sources.append("Database Tables")
         
+        return data_sources
+    
+    def _enhance_with_context(self, user_prompt: str, contexts: List[Dict[str, Any]], schema_context: str) -> tuple[str, List[str]]:
+        """Enhance prompt using knowledge base context and database schema"""
+        
+        # Format context information
+        data_context = self._format_contexts(contexts) if contexts else "No specific file context available."
+        data_sources = self._data_sources(contexts, schema_context)
+        
         # Apply context enhancement template
         formatted_prompt = CONTEXT_ENHANCED_TEMPLATE.format(
             user_prompt=user_prompt,
@@ -93,4 +93,35 @@ Extract and return ONLY a JSON object with:
 }}
 
 Return only valid JSON, no additional text.
-"""
\ No newline at end of file
+"""
+COMBINED_ENHANCEMENT_TEMPLATE = """
+You are an expert data visualization and SQL assistant. Turn the user request into precise instructions for writing a SQLite query and choosing a chart, and describe the request's metadata.
+
+USER REQUEST: "{user_prompt}"
+
+AVAILABLE DATA CONTEXT:
+{data_context}
+
+DATABASE SCHEMA:
+{schema_context}
+
+The instructions must:
+- Name the exact tables and columns to use (only ones listed in the schema)
+- State the filters, aggregations, grouping and ordering needed
+- Recommend the best chart type with its x-axis and y-axis columns
+- Stay concise (under 200 words)
+
+Return ONLY a JSON object with this exact structure:
+{{
+  "enhanced_prompt": "<the instructions as a single string>",
+  "metadata": {{
+    "confidence_score": <float between 0-1 indicating how well the request can be fulfilled>,
+    "suggested_chart_types": [<list of recommended chart types>],
+    "data_requirements": [<list of key data elements needed>],
+    "complexity_level": "<simple|moderate|complex>",
+    "estimated_load_time": "<fast|moderate|slow>"
+  }}
+}}
+
+Return only valid JSON, no additional text.
+"""
@@ -3,6 +3,7 @@ from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 import json
 import numpy as np
+import threading
 
 from .query_executor import QueryExecutionResult
 from .sql_generator import SQLGenerationResult
@@ -18,10 +19,25 @@ class ProcessedData:
     error_message: Optional[str] = None
 
 class DataProcessor:
-    """Process query results into chart-ready data with transformations"""
+    """
+    Process query results into chart-ready data with transformations
+    
+    The processing log is kept per thread so one instance can serve
+    concurrent jobs.
+    """
     
     def __init__(self):
-        self.processing_log = []
+        self._local = threading.local()
+    
+    @property
+    def processing_log(self) -> List[str]:
+        if not hasattr(self._local, 'processing_log'):
+            self._local.processing_log = []
+        return self._local.processing_log
+    
+    @processing_log.setter
+    def processing_log(self, value: List[str]):
+        self._local.processing_log = value
     
     def process_query_results(
         self, 
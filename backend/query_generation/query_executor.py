@@ -3,7 +3,7 @@ from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 import pandas as pd
 
-from database import DatabaseManager
+from database import DatabaseManager, IndexAdvisor
 from .sql_generator import SQLGenerator, SQLGenerationResult
 
 @dataclass
@@ -20,8 +20,9 @@ class QueryExecutionResult:
 class QueryExecutor:
     """Execute SQL queries with automatic error handling and retry logic"""
     
-    def __init__(self, db_manager: DatabaseManager = None):
+    def __init__(self, db_manager: DatabaseManager = None, index_advisor: Optional[IndexAdvisor] = None):
         self.db_manager = db_manager or DatabaseManager()
+        self.index_advisor = index_advisor
         self.sql_generator = SQLGenerator()
         self.max_retry_attempts = 3
     
@@ -43,7 +44,20 @@ class QueryExecutor:
         if not sql_result.success:
             return sql_result, []
         
-        # Execute all generated queries
+        return sql_result, self.execute_generated_sql(sql_result, schema_context)
+    
+    def execute_generated_sql(self, sql_result: SQLGenerationResult, schema_context: str) -> List[QueryExecutionResult]:
+        """
+        Execute previously generated SQL queries
+        
+        Args:
+            sql_result: SQL generation result (possibly cached)
+            schema_context: Database schema information
+            
+        Returns:
+            Query execution results, one per generated query
+        """
+        
         execution_results = []
         
         for i, query in enumerate(sql_result.queries):
@@ -58,7 +72,7 @@ class QueryExecutor:
             else:
                 print(f"❌ Query {i+1} failed: {result.error_message}")
         
-        return sql_result, execution_results
+        return execution_results
     
     def _execute_single_query(self, query: str, schema_context: str) -> QueryExecutionResult:
         """
@@ -93,6 +107,13 @@ class QueryExecutor:
                     
                     execution_time = time.time() - start_time
                     
+                    # Feed column usage to the index advisor (monitoring must never fail the query)
+                    if self.index_advisor is not None:
+                        try:
+                            self.index_advisor.record_query(current_query, execution_time)
+                        except Exception as e:
+                            print(f"⚠️  Index advisor failed to record query: {e}")
+                    
                     return QueryExecutionResult(
                         data=data,
                         columns=columns,
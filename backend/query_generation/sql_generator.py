@@ -1,10 +1,11 @@
-import groq
 import re
 from typing import Dict, Any, List, Optional, Tuple
 import os
 from dotenv import load_dotenv
 from dataclasses import dataclass
 
+from utils import get_llm_client
+
 load_dotenv()
 
 @dataclass
@@ -20,7 +21,7 @@ class SQLGenerator:
     """Generate and validate SQL queries from enhanced prompts"""
     
     def __init__(self):
-        self.client = groq.Groq(api_key=os.getenv('GROQ_API_KEY'))
+        self.client = get_llm_client()
         
         # SQL validation patterns
         self.dangerous_patterns = [
@@ -0,0 +1,60 @@
+"""
+Unit tests for IndexAdvisor index creation
+"""
+
+import unittest
+import sys
+import sqlite3
+import tempfile
+from unittest.mock import patch
+from pathlib import Path
+
+# Add backend directory to path so we can import database
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database import DatabaseManager, IndexAdvisor
+
+class TestCreateIndex(unittest.TestCase):
+    """Test cases for IndexAdvisor._create_index"""
+
+    def setUp(self):
+        """Create a small sales table with a recorded filter query"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self.temp_dir.name) / "test.db")
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('CREATE TABLE sales (region TEXT, amount REAL)')
+            conn.executemany('INSERT INTO sales VALUES (?, ?)', [(f"r{i % 50}", i) for i in range(200)])
+
+        self.advisor = IndexAdvisor(DatabaseManager(self.db_path), min_hits=1, min_rows=100)
+        self.advisor.record_query("SELECT SUM(amount) FROM sales WHERE region = 'r1'", 0.01)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _auto_indexes(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return [row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'auto_idx_%'"
+            )]
+
+    def test_failed_benchmark_drops_index(self):
+        """An index whose after-benchmark fails is dropped rather than left untracked"""
+        with patch.object(IndexAdvisor, '_time_query', side_effect=[5.0, sqlite3.OperationalError("database is locked")]):
+            name = self.advisor._create_index('sales', 'region')
+
+        self.assertIsNone(name)
+        self.assertEqual(self._auto_indexes(), [])
+        self.assertEqual(self.advisor._indexes, {})
+
+    def test_created_index_is_tracked(self):
+        """A successful index is both in the database and tracked"""
+        with patch.object(IndexAdvisor, '_time_query', side_effect=[5.0, 1.0]):
+            name = self.advisor._create_index('sales', 'region')
+
+        self.assertEqual(name, 'auto_idx_sales_region')
+        self.assertEqual(self._auto_indexes(), [name])
+        self.assertIn(name, self.advisor._indexes)
+
+if __name__ == '__main__':
+    unittest.main()
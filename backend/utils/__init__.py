@@ -0,0 +1,15 @@
+from .lru_cache import LRUCache
+from .hashing import normalize_prompt, stable_hash, file_sha256
+from .pipeline_cache import PipelineCache
+from .single_flight import SingleFlight
+from .worker_pool import WorkerPool, WorkerPoolFullError
+from .llm_backends import LLMBackend, GroqBackend, StubLLMBackend, create_llm_backend
+from .llm_client import LLMClient, get_llm_client
+from .sketches import RunningMoments, HyperLogLog, TDigest, ReservoirSample
+
+__all__ = [
+    'LRUCache', 'normalize_prompt', 'stable_hash', 'file_sha256', 'PipelineCache', 'SingleFlight',
+    'WorkerPool', 'WorkerPoolFullError', 'LLMBackend', 'GroqBackend',
+    'StubLLMBackend', 'create_llm_backend', 'LLMClient', 'get_llm_client',
+    'RunningMoments', 'HyperLogLog', 'TDigest', 'ReservoirSample'
+]
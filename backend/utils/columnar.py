@@ -0,0 +1,147 @@
+from pathlib import Path
+from typing import Any, Iterator, List, Optional
+
+import pandas as pd
+
+# Optional Parquet / Arrow IPC (Feather) support
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+COLUMNAR_EXTENSIONS = {'.parquet', '.feather', '.arrow'}
+
+def is_columnar_file(file_path: str) -> bool:
+    return Path(file_path).suffix.lower() in COLUMNAR_EXTENSIONS
+
+def _require_pyarrow():
+    if not HAS_PYARROW:
+        raise ImportError("Parquet/Feather support requires pyarrow: pip install pyarrow")
+
+def read_columnar_schema(file_path: str) -> "pa.Schema":
+    """Read a Parquet/Feather file's schema without reading data"""
+    _require_pyarrow()
+
+    if Path(file_path).suffix.lower() == '.parquet':
+        return pq.read_schema(file_path, memory_map=True)
+
+    with pa.memory_map(file_path, 'r') as source:
+        return pa.ipc.open_file(source).schema
+
+def iter_record_batches(
+    file_path: str,
+    columns: Optional[List[str]] = None,
+    batch_size: int = 65536
+) -> Iterator["pa.RecordBatch"]:
+    """
+    Stream a Parquet or Arrow IPC (Feather v2) file as record batches
+
+    Files are memory-mapped and only the projected columns are decoded, so
+    memory stays proportional to one batch regardless of file size.
+
+    Args:
+        file_path: Path to a .parquet, .feather or .arrow file
+        columns: Column names to read (None for all)
+        batch_size: Maximum rows per batch
+    """
+    _require_pyarrow()
+
+    if Path(file_path).suffix.lower() == '.parquet':
+        parquet_file = pq.ParquetFile(file_path, memory_map=True)
+        yield from parquet_file.iter_batches(batch_size=batch_size, columns=columns)
+        return
+
+    with pa.memory_map(file_path, 'r') as source:
+        reader = pa.ipc.open_file(source)
+        for index in range(reader.num_record_batches):
+            batch = reader.get_batch(index)
+            if columns is not None:
+                batch = batch.select(columns)
+            # Slices are zero-copy views into the mapped file
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size)
+
+def read_columnar(file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read a Parquet/Feather file (memory-mapped, projected) into a DataFrame"""
+    _require_pyarrow()
+
+    if Path(file_path).suffix.lower() == '.parquet':
+        table = pq.read_table(file_path, columns=columns, memory_map=True)
+    else:
+        with pa.memory_map(file_path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(columns)
+
+    return table.to_pandas()
+
+def sqlite_type(arrow_type: "pa.DataType") -> str:
+    """SQLite column type for an Arrow type, declared as pandas' to_sql declares it"""
+    if pa.types.is_boolean(arrow_type) or pa.types.is_integer(arrow_type) or pa.types.is_duration(arrow_type):
+        return 'INTEGER'
+    if pa.types.is_timestamp(arrow_type):
+        return 'TIMESTAMP'
+    if pa.types.is_date(arrow_type):
+        return 'DATE'
+    if pa.types.is_time(arrow_type):
+        return 'TIME'
+    if pa.types.is_floating(arrow_type) or pa.types.is_decimal(arrow_type):
+        return 'REAL'
+    if pa.types.is_binary(arrow_type) or pa.types.is_large_binary(arrow_type):
+        return 'BLOB'
+    return 'TEXT'
+
+def batch_to_sqlite_columns(batch: "pa.RecordBatch") -> List[List[Any]]:
+    """
+    Convert a record batch to per-column Python value lists that sqlite3 can bind
+
+    Decimal and nested values are cast or rendered to strings in Arrow first,
+    temporal values are rendered as pandas' to_sql stores them (see
+    _temporal_values), and dictionary-encoded columns are decoded.
+    """
+    columns = []
+
+    for column in batch.columns:
+        arrow_type = column.type
+        if pa.types.is_dictionary(arrow_type):
+            column = column.dictionary_decode()
+            arrow_type = column.type
+
+        if pa.types.is_temporal(arrow_type):
+            columns.append(_temporal_values(column))
+            continue
+
+        if pa.types.is_decimal(arrow_type):
+            column = pc.cast(column, pa.float64())
+        elif pa.types.is_nested(arrow_type):
+            column = pa.array([None if value is None else str(value) for value in column.to_pylist()], type=pa.string())
+
+        columns.append(column.to_pylist())
+
+    return columns
+
+def _temporal_values(column: "pa.Array") -> List[Any]:
+    """
+    Render temporal values the way pandas' to_sql writes them to SQLite
+
+    Generated filters like WHERE order_date = '2020-01-01 00:00:00' then match a
+    Parquet load the same as a CSV/Excel one: timestamps as str(datetime)
+    truncated to microseconds ('YYYY-MM-DD HH:MM:SS', fraction and UTC offset
+    only when present), dates as 'YYYY-MM-DD', times as 'HH:MM:SS.ffffff' and
+    durations as integer nanoseconds.
+    """
+    arrow_type = column.type
+
+    if pa.types.is_date(arrow_type):
+        return pc.cast(column, pa.string()).to_pylist()
+    if pa.types.is_duration(arrow_type):
+        return pc.cast(pc.cast(column, pa.duration('ns')), pa.int64()).to_pylist()
+    if pa.types.is_time(arrow_type):
+        return [None if value is None else value.strftime('%H:%M:%S.%f') for value in column.to_pylist()]
+
+    # Nanosecond values would come back as pd.Timestamp with nine fractional digits
+    column = pc.cast(column, pa.timestamp('us', tz=arrow_type.tz), safe=False)
+    return [None if value is None else str(value) for value in column.to_pylist()]
@@ -0,0 +1,132 @@
+import os
+import sys
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Ingestion memory optimization (set INGEST_OPTIMIZE_DTYPES=false to keep pandas defaults)
+INGEST_OPTIMIZE_DTYPES = os.getenv("INGEST_OPTIMIZE_DTYPES", "true").lower() == "true"
+
+CATEGORY_MAX_RATIO = 0.5
+CATEGORY_MAX_UNIQUE = 10000
+SAMPLE_ROWS = 10000
+
+def category_columns(
+    sample: pd.DataFrame,
+    max_ratio: float = CATEGORY_MAX_RATIO,
+    max_unique: int = CATEGORY_MAX_UNIQUE
+) -> List[str]:
+    """
+    Pick text columns worth storing as category from a row sample
+
+    A column qualifies when its distinct values are at most max_ratio of the
+    sampled non-null rows and at most max_unique.
+    """
+    columns = []
+
+    for col in sample.columns:
+        dtype = sample[col].dtype
+        if not (pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)):
+            continue
+
+        values = sample[col].dropna()
+        unique_count = values.nunique()
+        if len(values) and unique_count <= max_unique and unique_count / len(values) <= max_ratio:
+            columns.append(col)
+
+    return columns
+
+def read_csv_optimized(file_path: str, sample_rows: int = SAMPLE_ROWS, **read_kwargs) -> pd.DataFrame:
+    """
+    Read a CSV with low-cardinality text columns parsed straight into category
+
+    The first sample_rows rows decide which columns become categories, so the
+    full read never materializes one Python string per cell for them.
+    Category conversion is lossless, so a biased sample only costs memory.
+    """
+    sample = pd.read_csv(file_path, nrows=sample_rows, **read_kwargs)
+    dtype = {col: 'category' for col in category_columns(sample)}
+    return pd.read_csv(file_path, dtype=dtype or None, **read_kwargs)
+
+def optimize_dtypes(
+    df: pd.DataFrame,
+    sample_rows: int = SAMPLE_ROWS,
+    downcast_floats: bool = False,
+    seed: int = 0
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Shrink a DataFrame's memory footprint compared to pandas' default dtypes
+
+    Integers are downcast to the smallest type holding their min/max and
+    low-cardinality text columns (judged on a row sample) become category.
+    Floats are only downcast to float32 when requested and lossless, since
+    values are written to SQLite as-is.
+
+    Args:
+        df: DataFrame to optimize (may already contain category columns from read_csv_optimized)
+        sample_rows: Rows sampled to judge cardinality
+        downcast_floats: Also try float64 -> float32
+        seed: Sampling seed
+
+    Returns:
+        Tuple of (optimized DataFrame, memory report against default dtypes)
+    """
+    memory_before = sum(_default_memory_usage(df[col]) for col in df.columns) + int(df.index.memory_usage())
+    sample = df.sample(n=sample_rows, random_state=seed) if len(df) > sample_rows else df
+    to_category = set(category_columns(sample))
+    optimized = {}
+    conversions = {
+        col: "object -> category" for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)
+    }
+
+    for col in df.columns:
+        series = df[col]
+        dtype = series.dtype
+
+        if pd.api.types.is_bool_dtype(dtype):
+            continue
+
+        if pd.api.types.is_integer_dtype(dtype):
+            converted = pd.to_numeric(series, downcast='integer')
+
+        elif pd.api.types.is_float_dtype(dtype):
+            converted = series
+            if downcast_floats and dtype == np.float64:
+                candidate = series.astype(np.float32)
+                if np.array_equal(candidate.to_numpy(dtype=np.float64), series.to_numpy(), equal_nan=True):
+                    converted = candidate
+
+        elif col in to_category:
+            converted = series.astype('category')
+
+        else:
+            continue
+
+        if converted.dtype != dtype:
+            optimized[col] = converted
+            conversions[col] = f"{dtype} -> {converted.dtype}"
+
+    if optimized:
+        df = df.assign(**optimized)
+
+    memory_after = int(df.memory_usage(deep=True).sum())
+    report = {
+        'memory_before': memory_before,
+        'memory_after': memory_after,
+        'memory_saved': memory_before - memory_after,
+        'memory_saved_pct': round((1 - memory_after / memory_before) * 100, 1) if memory_before else 0.0,
+        'conversions': conversions
+    }
+
+    return df, report
+
+def _default_memory_usage(series: pd.Series) -> int:
+    """Deep memory the column would use with default dtypes (category columns as Python strings)"""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return int(series.memory_usage(deep=True, index=False))
+
+    # One 8-byte pointer per row plus each row's string object, as pandas counts object columns
+    counts = series.value_counts(sort=False, dropna=False)
+    object_bytes = sum(sys.getsizeof(value) * int(count) for value, count in counts.items())
+    return 8 * len(series) + object_bytes
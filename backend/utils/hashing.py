@@ -0,0 +1,31 @@
+import hashlib
+import json
+import re
+from typing import Any, Optional
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize a user prompt so trivially different spellings share cache entries"""
+    normalized = prompt.strip().lower()
+    normalized = re.sub(r'\s+', ' ', normalized)
+    return normalized.rstrip('.?! ')
+
+def stable_hash(*parts: Any) -> str:
+    """Deterministic short hash of arbitrary JSON-serializable parts"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+def file_sha256(file_path: str, limit: Optional[int] = None, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's contents (only the first limit bytes when given), read in chunks"""
+    digest = hashlib.sha256()
+    remaining = limit
+    
+    with open(file_path, 'rb') as f:
+        while remaining is None or remaining > 0:
+            chunk = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+    
+    return digest.hexdigest()
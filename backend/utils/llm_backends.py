@@ -0,0 +1,378 @@
+import json
+import os
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import groq
+
+from .hashing import stable_hash
+
+class LLMBackend(ABC):
+    """Transport behind LLMClient: performs a single chat completion call"""
+
+    name = "base"
+
+    @abstractmethod
+    def create(self, **kwargs) -> Any:
+        """
+        Run chat.completions.create
+
+        Returns:
+            A completion with .choices[0].message.content and .usage, or an
+            iterator of chunks with .choices[0].delta.content when stream=True
+        """
+        raise NotImplementedError
+
+class GroqBackend(LLMBackend):
+    """Real Groq API calls through one shared HTTP client"""
+
+    name = "groq"
+
+    def __init__(self, api_key: Optional[str] = None):
+        # Retries are handled by LLMClient so they go through the rate limiter
+        self.client = groq.Groq(api_key=api_key or os.getenv('GROQ_API_KEY'), max_retries=0)
+
+    def create(self, **kwargs) -> Any:
+        return self.client.chat.completions.create(**kwargs)
+
+class RecordingBackend(LLMBackend):
+    """Pass calls through to another backend and append each response to a JSONL file"""
+
+    name = "recording"
+
+    def __init__(self, backend: LLMBackend, record_path: str):
+        self.backend = backend
+        self.record_path = record_path
+        self.name = f"{backend.name}+recording"
+        self._lock = threading.Lock()
+
+        record_dir = os.path.dirname(record_path)
+        if record_dir:
+            os.makedirs(record_dir, exist_ok=True)
+
+    def create(self, **kwargs) -> Any:
+        response = self.backend.create(**kwargs)
+
+        if kwargs.get('stream'):
+            return self._record_stream(response, kwargs)
+
+        self._write(kwargs, response.choices[0].message.content or "")
+        return response
+
+    def _record_stream(self, stream: Any, kwargs: Dict[str, Any]) -> Iterator[Any]:
+        parts = []
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+            yield chunk
+        self._write(kwargs, "".join(parts))
+
+    def _write(self, kwargs: Dict[str, Any], content: str):
+        record = {
+            'key': recording_key(kwargs.get('model'), kwargs.get('messages')),
+            'model': kwargs.get('model'),
+            'content': content
+        }
+        with self._lock:
+            with open(self.record_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def recording_key(model: Optional[str], messages: Any) -> str:
+    """Key a recorded response by model and exact prompt messages"""
+    return stable_hash(model, messages)
+
+class LatencyModel:
+    """
+    Sample simulated call latency from a distribution spec
+
+    Specs: "fixed:SECONDS", "uniform:LOW,HIGH" or "lognormal:MEDIAN,SIGMA".
+    """
+
+    def __init__(self, spec: str = "fixed:0", seed: Optional[int] = None):
+        self.spec = spec
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        kind, _, params = spec.partition(':')
+        self.kind = kind.strip().lower()
+        self.params = [float(p) for p in params.split(',') if p.strip()]
+
+        expected_params = {'fixed': 1, 'uniform': 2, 'lognormal': 2}
+        if self.kind not in expected_params or len(self.params) != expected_params[self.kind]:
+            raise ValueError(f"Invalid latency spec: {spec}")
+
+    def sample(self) -> float:
+        with self._lock:
+            if self.kind == 'fixed':
+                return self.params[0]
+            if self.kind == 'uniform':
+                return self._random.uniform(self.params[0], self.params[1])
+            median, sigma = self.params
+            return median * self._random.lognormvariate(0, sigma)
+
+class StubLLMBackend(LLMBackend):
+    """
+    Offline stand-in for Groq used for load testing
+
+    Replays responses from a JSONL recording (see RecordingBackend) when the
+    exact prompt was recorded; otherwise synthesizes a response that parses
+    for the pipeline stage that sent the prompt. Latency is simulated from a
+    LatencyModel, plus per-token time when tokens_per_second is set.
+    """
+
+    name = "stub"
+
+    def __init__(
+        self,
+        recordings_path: Optional[str] = None,
+        latency: Optional[LatencyModel] = None,
+        tokens_per_second: float = 0
+    ):
+        self.latency = latency or LatencyModel()
+        self.tokens_per_second = tokens_per_second
+        self.recordings: Dict[str, str] = {}
+        self.replayed = 0
+        self.synthesized = 0
+        self._lock = threading.Lock()  # create() is called from many worker threads
+
+        if recordings_path and os.path.exists(recordings_path):
+            with open(recordings_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self.recordings[record['key']] = record['content']
+
+        self.synthesizers: List[tuple[str, Callable[[str], str]]] = [
+            ('"enhanced_prompt":', self._synthesize_enhancement),
+            ("You are an expert SQL developer", self._synthesize_sql),
+            ("Fix this SQL query that failed", self._synthesize_fixed_sql),
+            ("Explain this SQL query", lambda prompt: "Retrieves and summarizes the requested records."),
+            ("extract key metadata", self._synthesize_metadata),
+            ("expert React developer", self._synthesize_component),
+            ("suggest 5-7 common analysis queries", self._synthesize_questions),
+        ]
+
+    def create(self, **kwargs) -> Any:
+        messages = kwargs.get('messages') or []
+        prompt = "\n".join(str(message.get('content', '')) for message in messages)
+
+        content = self.recordings.get(recording_key(kwargs.get('model'), messages))
+        replayed = content is not None
+        if not replayed:
+            content = self._synthesize(prompt)
+
+        with self._lock:
+            if replayed:
+                self.replayed += 1
+            else:
+                self.synthesized += 1
+
+        usage = SimpleNamespace(
+            prompt_tokens=max(1, len(prompt) // 4),
+            completion_tokens=max(1, len(content) // 4),
+            total_tokens=max(1, len(prompt) // 4) + max(1, len(content) // 4)
+        )
+
+        time.sleep(self.latency.sample())
+
+        if kwargs.get('stream'):
+            return self._stream(content, usage)
+
+        time.sleep(self._generation_time(content))
+        message = SimpleNamespace(role="assistant", content=content)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")],
+            usage=usage,
+            model=kwargs.get('model')
+        )
+
+    def _stream(self, content: str, usage: Any) -> Iterator[Any]:
+        pieces = [content[i:i + 16] for i in range(0, len(content), 16)]
+
+        for piece in pieces:
+            time.sleep(self._generation_time(piece))
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(index=0, delta=SimpleNamespace(content=piece), finish_reason=None)],
+                x_groq=None
+            )
+
+        yield SimpleNamespace(
+            choices=[SimpleNamespace(index=0, delta=SimpleNamespace(content=None), finish_reason="stop")],
+            x_groq=SimpleNamespace(usage=usage)
+        )
+
+    def _generation_time(self, text: str) -> float:
+        if self.tokens_per_second <= 0:
+            return 0.0
+        return (len(text) / 4) / self.tokens_per_second
+
+    def _synthesize(self, prompt: str) -> str:
+        for marker, synthesizer in self.synthesizers:
+            if marker in prompt:
+                return synthesizer(prompt)
+
+        # Prompt enhancement, descriptions and insights are free text
+        request = re.search(r'USER REQUEST:\s*"([^"]*)"', prompt)
+        if request:
+            return f"Create a chart that answers: {request.group(1)}. Use the exact table and column names from the schema."
+        return "Stub response for offline testing."
+
+    def _parse_schema(self, prompt: str) -> Dict[str, List[tuple[str, str]]]:
+        """Pull tables and typed columns out of a SchemaAnalyzer context block"""
+        tables: Dict[str, List[tuple[str, str]]] = {}
+        current = None
+
+        for line in prompt.splitlines():
+            table_match = re.match(r'\s*Table:\s*(\w+)\s*$', line)
+            if table_match:
+                current = table_match.group(1)
+                tables.setdefault(current, [])
+                continue
+
+            column_match = re.match(r'\s+-\s+(\w+)\s+\((\w*)\)\s*$', line)
+            if column_match and current:
+                tables[current].append((column_match.group(1), column_match.group(2).upper()))
+
+        return tables
+
+    def _synthesize_sql(self, prompt: str) -> str:
+        tables = self._parse_schema(prompt)
+        table_name, columns = next(iter(tables.items()), ("sqlite_master", [("name", "TEXT")]))
+
+        numeric = [name for name, col_type in columns if col_type in ('INTEGER', 'REAL', 'NUMERIC', 'FLOAT')]
+        categorical = [name for name, col_type in columns if name not in numeric]
+
+        x_axis = categorical[0] if categorical else (columns[0][0] if columns else "name")
+
+        if numeric:
+            y_axis = numeric[0]
+            query = (
+                f"SELECT {x_axis}, SUM({y_axis}) AS {y_axis} FROM {table_name} "
+                f"GROUP BY {x_axis} ORDER BY {y_axis} DESC LIMIT 20"
+            )
+        else:
+            y_axis = "count"
+            query = f"SELECT {x_axis}, COUNT(*) AS count FROM {table_name} GROUP BY {x_axis} ORDER BY count DESC LIMIT 20"
+
+        return json.dumps({
+            "queries": [query],
+            "processing_steps": [{
+                "step": 1,
+                "description": f"Aggregate {y_axis} by {x_axis}",
+                "type": "aggregation",
+                "details": "Grouped in SQL"
+            }],
+            "chart_config": {
+                "chart_type": "bar",
+                "x_axis": x_axis,
+                "y_axis": y_axis,
+                "title": f"{y_axis.replace('_', ' ').title()} by {x_axis.replace('_', ' ').title()}",
+                "color_scheme": "default"
+            }
+        })
+
+    def _synthesize_fixed_sql(self, prompt: str) -> str:
+        match = re.search(r'FAILED QUERY:\s*\n(.*?)\n\s*\nERROR MESSAGE:', prompt, re.DOTALL)
+        return match.group(1).strip() if match else "SELECT name FROM sqlite_master"
+
+    def _synthesize_metadata(self, prompt: str) -> str:
+        return json.dumps(self._metadata())
+
+    def _synthesize_enhancement(self, prompt: str) -> str:
+        request = re.search(r'USER REQUEST:\s*"([^"]*)"', prompt)
+        user_request = request.group(1) if request else "the request"
+        return json.dumps({
+            "enhanced_prompt": f"Create a chart that answers: {user_request}. Use the exact table and column names from the schema.",
+            "metadata": self._metadata()
+        })
+
+    def _metadata(self) -> Dict[str, Any]:
+        return {
+            "confidence_score": 0.8,
+            "suggested_chart_types": ["bar", "line"],
+            "data_requirements": ["category column", "numeric measure"],
+            "complexity_level": "simple",
+            "estimated_load_time": "fast"
+        }
+
+    def _synthesize_component(self, prompt: str) -> str:
+        def config_value(label: str, default: str) -> str:
+            match = re.search(rf'- {label}:\s*(.+)', prompt)
+            return match.group(1).strip() if match else default
+
+        x_axis = config_value('X-Axis', 'x')
+        y_axis = config_value('Y-Axis', 'y')
+        title = re.sub(r'[^\w\s\-,.:()%&/]', '', config_value('Title', 'Chart'))
+
+        component_code = f"""const StubChart = ({{ data = [] }}) => {{
+  if (!data || data.length === 0) {{
+    return <div style={{{{width: '100%', height: '400px'}}}}>No data available</div>;
+  }}
+
+  return (
+    <div style={{{{width: '100%', height: '400px', padding: '16px'}}}}>
+      <h2 style={{{{fontSize: '1.25rem', fontWeight: 'bold', marginBottom: '16px', textAlign: 'center'}}}}>
+        {title}
+      </h2>
+      <ResponsiveContainer width="100%" height="90%">
+        <BarChart data={{data}}>
+          <CartesianGrid strokeDasharray="3 3" />
+          <XAxis dataKey="{x_axis}" />
+          <YAxis />
+          <Tooltip />
+          <Legend />
+          <Bar dataKey="{y_axis}" fill="#8884d8" />
+        </BarChart>
+      </ResponsiveContainer>
+    </div>
+  );
+}};"""
+
+        return json.dumps({
+            "component_code": component_code,
+            "component_name": "StubChart",
+            "chart_type": "bar"
+        })
+
+    def _synthesize_questions(self, prompt: str) -> str:
+        return "\n".join([
+            "Show me totals by category",
+            "What are the top 10 records",
+            "How do values change over time"
+        ])
+
+def create_llm_backend() -> LLMBackend:
+    """
+    Create the LLM backend selected by environment variables
+
+    LLM_BACKEND: "groq" (default) or "stub" (offline, for load testing)
+    LLM_STUB_RECORDINGS: JSONL file of recorded responses to replay
+    LLM_STUB_LATENCY: latency spec, e.g. "lognormal:0.8,0.4" (see LatencyModel)
+    LLM_STUB_TOKENS_PER_SECOND: simulated generation speed (0 = instant)
+    LLM_STUB_SEED: seed for reproducible latency samples
+    LLM_RECORD_PATH: append every real response to this JSONL file for later replay
+    """
+    backend_name = os.getenv('LLM_BACKEND', 'groq').lower()
+
+    if backend_name == 'stub':
+        seed = os.getenv('LLM_STUB_SEED')
+        backend: LLMBackend = StubLLMBackend(
+            recordings_path=os.getenv('LLM_STUB_RECORDINGS'),
+            latency=LatencyModel(os.getenv('LLM_STUB_LATENCY', 'fixed:0'), seed=int(seed) if seed else None),
+            tokens_per_second=float(os.getenv('LLM_STUB_TOKENS_PER_SECOND', '0'))
+        )
+    elif backend_name == 'groq':
+        backend = GroqBackend()
+    else:
+        raise ValueError(f"Unsupported LLM_BACKEND: {backend_name}")
+
+    record_path = os.getenv('LLM_RECORD_PATH')
+    if record_path:
+        backend = RecordingBackend(backend, record_path)
+
+    return backend
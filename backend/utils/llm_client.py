@@ -0,0 +1,373 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+import groq
+from dotenv import load_dotenv
+
+from .llm_backends import LLMBackend, GroqBackend, create_llm_backend
+
+load_dotenv()
+
+RETRYABLE_ERRORS = (
+    groq.RateLimitError,
+    groq.InternalServerError,
+    groq.APIConnectionError,
+    groq.APITimeoutError,
+)
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at capacity per minute
+
+    Acquiring blocks until enough tokens are available. Consumption beyond the
+    current balance is allowed (the bucket goes into debt) so actual usage
+    reported after a call can be charged without blocking the caller.
+    """
+
+    def __init__(self, capacity_per_minute: float):
+        self.capacity = float(capacity_per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Wait until amount tokens are available and take them; returns seconds waited"""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+    def consume(self, amount: float):
+        """Charge (or refund, if negative) tokens without waiting"""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+class ModelMetrics:
+    """Latency and token usage for one model"""
+
+    def __init__(self, window: int = 500):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.throttled_seconds = 0.0
+        self.latencies: Deque[float] = deque(maxlen=window)
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3)
+
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'retries': self.retries,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'throttled_seconds': round(self.throttled_seconds, 3),
+            'latency_p50': percentile(0.5),
+            'latency_p95': percentile(0.95),
+            'latency_avg': round(sum(latencies) / len(latencies), 3) if latencies else None
+        }
+
+class ManagedStream:
+    """
+    Iterator over a streamed completion that holds one LLMClient concurrency slot
+
+    The slot is released exactly once: when the stream is exhausted or fails,
+    on close(), when leaving a `with` block, or when the stream is garbage
+    collected, so callers that stop early (or never iterate) can't leak it.
+    """
+
+    def __init__(self, stream: Any, on_close: Callable[[Any], None]):
+        self._source = stream
+        self._chunks = iter(stream)
+        self._on_close = on_close
+        self._usage = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> "ManagedStream":
+        return self
+
+    def __next__(self) -> Any:
+        if self._closed:
+            raise StopIteration
+
+        try:
+            chunk = next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+
+        x_groq = getattr(chunk, 'x_groq', None)
+        if x_groq is not None and getattr(x_groq, 'usage', None) is not None:
+            self._usage = x_groq.usage
+        return chunk
+
+    def close(self):
+        """Stop the underlying stream and release the concurrency slot (idempotent)"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        try:
+            close_source = getattr(self._source, 'close', None)
+            if close_source is not None:
+                close_source()
+        finally:
+            self._on_close(self._usage)
+
+    def __enter__(self) -> "ManagedStream":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+class _Completions:
+    def __init__(self, llm_client: "LLMClient"):
+        self._llm_client = llm_client
+
+    def create(self, **kwargs) -> Any:
+        return self._llm_client.create_chat_completion(**kwargs)
+
+class _Chat:
+    def __init__(self, llm_client: "LLMClient"):
+        self.completions = _Completions(llm_client)
+
+class LLMClient:
+    """
+    Process-wide Groq client with rate limiting, retries and metrics
+
+    One backend (normally a single groq.Groq instance) is shared so HTTP
+    connections are kept alive across pipeline stages and jobs. Each model gets
+    its own request and token buckets (Groq limits are per model), concurrent
+    calls are capped, and 429/5xx/connection errors are retried with
+    exponential backoff.
+
+    Exposes client.chat.completions.create(...) so it is a drop-in replacement
+    for groq.Groq at call sites.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[LLMBackend] = None,
+        requests_per_minute: float = 30,
+        tokens_per_minute: float = 0,
+        max_concurrency: int = 8,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0
+    ):
+        self.backend = backend or GroqBackend()
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.chat = _Chat(self)
+
+        self._concurrency = threading.BoundedSemaphore(max_concurrency)
+        self._request_buckets: Dict[str, TokenBucket] = {}
+        self._token_buckets: Dict[str, TokenBucket] = {}
+        self._metrics: Dict[str, ModelMetrics] = {}
+        self._lock = threading.Lock()
+
+    def create_chat_completion(self, **kwargs) -> Any:
+        """
+        Call chat.completions.create through the limiter with retries
+
+        Args:
+            **kwargs: Arguments for groq chat.completions.create
+
+        Returns:
+            The completion, or a ManagedStream of chunks when stream=True
+            (close it, or use it as a context manager, if not fully consumed)
+        """
+        model = kwargs.get('model', 'unknown')
+        estimated_tokens = self._estimate_prompt_tokens(kwargs.get('messages', []))
+        metrics = self._model_metrics(model)
+
+        attempt = 0
+        while True:
+            self._concurrency.acquire()
+            released = False
+
+            try:
+                waited = self._throttle(model, estimated_tokens)
+                started_at = time.perf_counter()
+                response = self.backend.create(**kwargs)
+
+                if kwargs.get('stream'):
+                    released = True  # The stream wrapper releases the slot when it is consumed or closed
+                    return ManagedStream(
+                        response,
+                        lambda usage: self._finish_stream(model, estimated_tokens, started_at, waited, usage)
+                    )
+
+                self._record_call(model, estimated_tokens, started_at, waited, getattr(response, 'usage', None))
+                return response
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    self._record_error(metrics)
+                    raise
+                delay = self._backoff_delay(attempt, e)
+                print(f"LLM call to {model} failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                with self._lock:
+                    metrics.retries += 1
+                    metrics.throttled_seconds += waited
+            except Exception:
+                self._record_error(metrics)
+                raise
+            finally:
+                if not released:
+                    self._concurrency.release()
+
+            # Back off without holding a concurrency slot so other callers aren't starved
+            time.sleep(delay)
+            attempt += 1
+
+    def _finish_stream(self, model: str, estimated_tokens: int, started_at: float, waited: float, usage: Any):
+        self._concurrency.release()
+        self._record_call(model, estimated_tokens, started_at, waited, usage)
+
+    def _throttle(self, model: str, estimated_tokens: int) -> float:
+        """Block until the model's request and token budgets allow another call"""
+        waited = 0.0
+
+        with self._lock:
+            request_bucket = self._request_buckets.get(model)
+            if request_bucket is None and self.requests_per_minute > 0:
+                request_bucket = self._request_buckets[model] = TokenBucket(self.requests_per_minute)
+
+            token_bucket = self._token_buckets.get(model)
+            if token_bucket is None and self.tokens_per_minute > 0:
+                token_bucket = self._token_buckets[model] = TokenBucket(self.tokens_per_minute)
+
+        if request_bucket is not None:
+            waited += request_bucket.acquire(1)
+        if token_bucket is not None:
+            waited += token_bucket.acquire(estimated_tokens)
+
+        return waited
+
+    def _backoff_delay(self, attempt: int, error: Exception) -> float:
+        """Exponential backoff with jitter, honoring Retry-After when Groq sends one"""
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('retry-after') if response is not None else None
+
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _record_call(self, model: str, estimated_tokens: int, started_at: float, waited: float, usage: Any):
+        latency = time.perf_counter() - started_at
+        prompt_tokens = getattr(usage, 'prompt_tokens', None) or estimated_tokens
+        completion_tokens = getattr(usage, 'completion_tokens', None) or 0
+
+        # Charge what the call actually used beyond the upfront prompt estimate
+        token_bucket = self._token_buckets.get(model)
+        if token_bucket is not None:
+            token_bucket.consume(prompt_tokens + completion_tokens - estimated_tokens)
+
+        metrics = self._model_metrics(model)
+        with self._lock:
+            metrics.calls += 1
+            metrics.prompt_tokens += prompt_tokens
+            metrics.completion_tokens += completion_tokens
+            metrics.throttled_seconds += waited
+            metrics.latencies.append(latency)
+
+    def _record_error(self, metrics: ModelMetrics):
+        with self._lock:
+            metrics.errors += 1
+
+    def _model_metrics(self, model: str) -> ModelMetrics:
+        with self._lock:
+            if model not in self._metrics:
+                self._metrics[model] = ModelMetrics()
+            return self._metrics[model]
+
+    def _estimate_prompt_tokens(self, messages: Any) -> int:
+        """Rough token count (~4 characters per token) used before Groq reports usage"""
+        characters = sum(len(str(message.get('content', ''))) for message in messages or [])
+        return max(1, characters // 4)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get per-model call, latency and token metrics"""
+        with self._lock:
+            models = list(self._metrics.items())
+
+        return {
+            'backend': self.backend.name,
+            'requests_per_minute': self.requests_per_minute,
+            'tokens_per_minute': self.tokens_per_minute,
+            'models': {model: metrics.snapshot() for model, metrics in models}
+        }
+
+_llm_client: Optional[LLMClient] = None
+_llm_client_lock = threading.Lock()
+
+def get_llm_client() -> LLMClient:
+    """
+    Get the process-wide LLM client, creating it on first use
+
+    The backend is chosen by create_llm_backend (LLM_BACKEND=groq|stub) and
+    limits come from environment variables:
+    LLM_REQUESTS_PER_MINUTE / LLM_TOKENS_PER_MINUTE: per-model budgets (0 disables;
+        requests default to 30, or unlimited with LLM_BACKEND=stub so load tests
+        measure the pipeline rather than the limiter)
+    LLM_MAX_CONCURRENCY: maximum in-flight calls
+    LLM_MAX_RETRIES: retries on 429/5xx/connection errors
+    """
+    global _llm_client
+
+    if _llm_client is None:
+        with _llm_client_lock:
+            if _llm_client is None:
+                default_rpm = '0' if os.getenv('LLM_BACKEND', 'groq').lower() == 'stub' else '30'
+                _llm_client = LLMClient(
+                    backend=create_llm_backend(),
+                    requests_per_minute=float(os.getenv('LLM_REQUESTS_PER_MINUTE', default_rpm)),
+                    tokens_per_minute=float(os.getenv('LLM_TOKENS_PER_MINUTE', '0')),
+                    max_concurrency=int(os.getenv('LLM_MAX_CONCURRENCY', '8')),
+                    max_retries=int(os.getenv('LLM_MAX_RETRIES', '4'))
+                )
+
+    return _llm_client
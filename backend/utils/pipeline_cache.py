@@ -0,0 +1,68 @@
+from typing import Any, Dict, Optional, Tuple
+
+from .hashing import normalize_prompt, stable_hash
+from .lru_cache import LRUCache
+
+class PipelineCache:
+    """
+    Staged cache for the chart generation pipeline
+    
+    Stage 1 (plan): prompt enhancement + generated SQL, keyed by
+    (normalized prompt, schema version). Survives data reloads.
+    
+    Stage 2 (component): the generated component code, keyed by
+    (normalized prompt, schema version). Components read rows from a
+    `data` prop, so the code survives data reloads as well.
+    
+    Stage 3 (result): the finished component plus its dataset, keyed by
+    (normalized prompt, schema version, data version).
+    """
+    
+    def __init__(self, max_size: int = 256, ttl_seconds: Optional[float] = 3600):
+        self.plans = LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self.components = LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self.results = LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+    
+    def plan_key(self, user_prompt: str, schema_version: str) -> str:
+        return stable_hash('plan', normalize_prompt(user_prompt), schema_version)
+    
+    def result_key(self, user_prompt: str, schema_version: str, data_version: str, variant: str = "") -> str:
+        return stable_hash('result', normalize_prompt(user_prompt), schema_version, data_version, variant)
+    
+    def get_plan(self, user_prompt: str, schema_version: str) -> Optional[Tuple[Any, Any]]:
+        """Get cached (enhancement_result, sql_result) for a prompt"""
+        return self.plans.get(self.plan_key(user_prompt, schema_version))
+    
+    def set_plan(self, user_prompt: str, schema_version: str, enhancement_result: Any, sql_result: Any):
+        """Cache the enhancement and SQL generation stages"""
+        self.plans.set(self.plan_key(user_prompt, schema_version), (enhancement_result, sql_result))
+    
+    def get_component(self, user_prompt: str, schema_version: str, variant: str = "") -> Optional[Dict[str, Any]]:
+        """Get cached component code (without data) for a prompt"""
+        return self.components.get(stable_hash('component', normalize_prompt(user_prompt), schema_version, variant))
+    
+    def set_component(self, user_prompt: str, schema_version: str, component: Dict[str, Any], variant: str = ""):
+        """Cache component code independently of the data it renders"""
+        self.components.set(stable_hash('component', normalize_prompt(user_prompt), schema_version, variant), component)
+    
+    def get_result(self, user_prompt: str, schema_version: str, data_version: str, variant: str = "") -> Optional[Dict[str, Any]]:
+        """Get the cached finished component for a prompt (variant: e.g. generation mode)"""
+        return self.results.get(self.result_key(user_prompt, schema_version, data_version, variant))
+    
+    def set_result(self, user_prompt: str, schema_version: str, data_version: str, result: Dict[str, Any], variant: str = ""):
+        """Cache the finished component"""
+        self.results.set(self.result_key(user_prompt, schema_version, data_version, variant), result)
+    
+    def clear(self):
+        """Drop all cached stages"""
+        self.plans.clear()
+        self.components.clear()
+        self.results.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get per-stage cache statistics"""
+        return {
+            'plans': self.plans.stats(),
+            'components': self.components.stats(),
+            'results': self.results.stats()
+        }
@@ -0,0 +1,59 @@
+import threading
+from typing import Dict, List, Optional
+
+class SingleFlight:
+    """
+    Track in-flight computations so identical requests share a single run
+    
+    The first member to join a key becomes the leader and performs the work;
+    later members attach to the same flight until the leader finishes it.
+    """
+    
+    def __init__(self):
+        self._flights: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+    
+    def join(self, key: str, member_id: str) -> bool:
+        """
+        Attach a member to the flight for key
+        
+        Args:
+            key: Identity of the computation
+            member_id: Identifier of the joining request (e.g. job ID)
+            
+        Returns:
+            True if the member is the leader and must start the computation
+        """
+        with self._lock:
+            members = self._flights.get(key)
+            
+            if members is None:
+                self._flights[key] = [member_id]
+                return True
+            
+            members.append(member_id)
+            return False
+    
+    def leader(self, key: str) -> Optional[str]:
+        """Get the leader of an in-flight computation (None if not in flight)"""
+        with self._lock:
+            members = self._flights.get(key)
+            return members[0] if members else None
+    
+    def members(self, key: str) -> List[str]:
+        """Get a snapshot of all members attached to an in-flight computation"""
+        with self._lock:
+            return list(self._flights.get(key, []))
+    
+    def finish(self, key: str) -> List[str]:
+        """
+        Close the flight for key
+        
+        Returns:
+            All members that were attached, so their results can be published
+        """
+        with self._lock:
+            return self._flights.pop(key, [])
+    
+    def __len__(self) -> int:
+        return len(self._flights)
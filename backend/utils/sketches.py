@@ -0,0 +1,188 @@
+import math
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+class RunningMoments:
+    """Exact count/min/max/mean/std over a stream of numeric chunks (Chan's parallel update)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def update(self, values: np.ndarray):
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        chunk_count = len(values)
+        chunk_mean = float(values.mean())
+        chunk_m2 = float(((values - chunk_mean) ** 2).sum())
+
+        total = self.count + chunk_count
+        delta = chunk_mean - self.mean
+        self.mean += delta * chunk_count / total
+        self.m2 += chunk_m2 + delta ** 2 * self.count * chunk_count / total
+        self.count = total
+
+        chunk_min, chunk_max = float(values.min()), float(values.max())
+        self.min = chunk_min if self.min is None else min(self.min, chunk_min)
+        self.max = chunk_max if self.max is None else max(self.max, chunk_max)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (matches pandas' ddof=1)"""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else float('nan')
+
+class HyperLogLog:
+    """
+    Approximate distinct counter (HyperLogLog with small-range correction)
+
+    Uses 2**precision registers; the standard error is about
+    1.04 / sqrt(2**precision) (~0.8% at the default precision of 14).
+    """
+
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.register_count = 1 << precision
+        self.registers = np.zeros(self.register_count, dtype=np.uint8)
+
+    def update(self, values: Any):
+        """Add a batch of non-null values"""
+        hashes = pd.util.hash_array(np.asarray(values))
+        if len(hashes) == 0:
+            return
+
+        value_bits = 64 - self.precision
+        index = (hashes >> np.uint64(value_bits)).astype(np.int64)
+        remainder = hashes & np.uint64((1 << value_bits) - 1)
+
+        # Rank = position of the leftmost 1-bit in the remaining bits (exact in float64 since value_bits < 53)
+        rank = np.full(len(hashes), value_bits + 1, dtype=np.uint8)
+        nonzero = remainder > 0
+        rank[nonzero] = value_bits - np.floor(np.log2(remainder[nonzero].astype(np.float64))).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+
+    def count(self) -> int:
+        m = self.register_count
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+
+        zero_registers = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zero_registers > 0:
+            estimate = m * math.log(m / zero_registers)
+
+        return int(round(estimate))
+
+class TDigest:
+    """
+    Approximate quantiles of a numeric stream (merging t-digest)
+
+    Each batch is merged into the centroids in one vectorized pass: points are
+    sorted and grouped so every centroid spans at most one unit of the k1 scale
+    function, keeping roughly `compression` centroids with the best accuracy
+    at the tails.
+    """
+
+    def __init__(self, compression: float = 200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def update(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        self.min = float(values.min()) if self.min is None else min(self.min, float(values.min()))
+        self.max = float(values.max()) if self.max is None else max(self.max, float(values.max()))
+
+        means = np.concatenate([self.means, values])
+        weights = np.concatenate([self.weights, np.ones(len(values))])
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+
+        # Bucket by the k1 scale of each point's left quantile
+        cumulative = np.cumsum(weights)
+        total = cumulative[-1]
+        q_left = (cumulative - weights) / total
+        k = self.compression / (2 * math.pi) * np.arcsin(2 * q_left - 1)
+        buckets = np.floor(k - k[0]).astype(np.int64)
+
+        starts = np.flatnonzero(np.diff(buckets, prepend=-1))
+        bucket_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / bucket_weights
+        self.weights = bucket_weights
+
+    def quantile(self, q: float) -> Optional[float]:
+        if len(self.means) == 0:
+            return None
+
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], centers, [total]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(q * total, positions, values))
+
+class ReservoirSample:
+    """
+    Uniform random sample of rows from a stream of DataFrame chunks (Algorithm R)
+
+    Replacement slots for a whole chunk are drawn at once; when several rows
+    land in the same slot the latest one wins, exactly as in the sequential
+    algorithm.
+    """
+
+    def __init__(self, size: int = 10000, seed: Optional[int] = None):
+        self.size = size
+        self.seen = 0
+        self.sample: Optional[pd.DataFrame] = None
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, chunk: pd.DataFrame):
+        chunk = chunk.reset_index(drop=True)
+
+        # Fill the reservoir first
+        if self.sample is None or len(self.sample) < self.size:
+            free = self.size - (0 if self.sample is None else len(self.sample))
+            head = chunk.iloc[:free]
+            self.sample = head if self.sample is None else pd.concat([self.sample, head], ignore_index=True)
+            self.seen += len(head)
+            chunk = chunk.iloc[free:].reset_index(drop=True)
+            if chunk.empty:
+                return
+
+        positions = np.arange(self.seen, self.seen + len(chunk))
+        slots = (self._rng.random(len(chunk)) * (positions + 1)).astype(np.int64)
+        self.seen += len(chunk)
+
+        accepted = np.flatnonzero(slots < self.size)
+        if len(accepted) == 0:
+            return
+
+        replacements = pd.Series(slots[accepted], index=accepted).drop_duplicates(keep='last')
+        incoming = chunk.iloc[replacements.index.to_numpy()]
+        incoming.index = replacements.to_numpy()
+
+        self.sample = pd.concat([self.sample.drop(index=incoming.index), incoming]).sort_index()
+
+def describe_quantiles(moments: RunningMoments, digest: TDigest) -> Dict[str, Optional[float]]:
+    """describe()-style summary from exact moments and approximate quartiles"""
+    return {
+        'count': float(moments.count),
+        'mean': moments.mean if moments.count else float('nan'),
+        'std': moments.std,
+        'min': moments.min,
+        '25%': digest.quantile(0.25),
+        '50%': digest.quantile(0.5),
+        '75%': digest.quantile(0.75),
+        'max': moments.max
+    }
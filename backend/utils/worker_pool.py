@@ -0,0 +1,94 @@
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+class WorkerPoolFullError(Exception):
+    """Raised when the worker pool's queue depth limit is reached"""
+    pass
+
+class WorkerPool:
+    """
+    Bounded executor for blocking pipeline work
+    
+    A thread pool runs I/O-bound jobs (LLM calls, SQLite) off the event loop.
+    At most max_workers jobs run concurrently and at most max_queue_depth more
+    may wait; further submissions are rejected instead of queueing unboundedly.
+    An optional process pool offloads CPU-heavy steps (pandas processing).
+    """
+    
+    def __init__(self, max_workers: int = 4, max_queue_depth: int = 32, process_workers: int = 0):
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.process_workers = process_workers
+        
+        self.thread_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chart-worker")
+        self.process_pool: Optional[ProcessPoolExecutor] = (
+            ProcessPoolExecutor(max_workers=process_workers) if process_workers > 0 else None
+        )
+        
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue_depth)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._rejected = 0
+    
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Submit a job to the thread pool
+        
+        Raises:
+            WorkerPoolFullError: If running + queued jobs already hit the limit
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise WorkerPoolFullError(
+                f"Worker pool is at capacity ({self.max_workers} running, {self.max_queue_depth} queued)"
+            )
+        
+        with self._lock:
+            self._active += 1
+        
+        try:
+            future = self.thread_pool.submit(fn, *args, **kwargs)
+        except Exception:
+            self._release()
+            raise
+        
+        future.add_done_callback(lambda _: self._release())
+        return future
+    
+    def run_cpu_bound(self, fn: Callable, *args) -> Any:
+        """
+        Run a CPU-heavy function, in the process pool when one is configured
+        
+        Must be called from a worker thread; fn and its arguments must be picklable.
+        """
+        if self.process_pool is None:
+            return fn(*args)
+        return self.process_pool.submit(fn, *args).result()
+    
+    def _release(self):
+        with self._lock:
+            self._active -= 1
+        self._slots.release()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get pool utilization statistics"""
+        with self._lock:
+            active = self._active
+            rejected = self._rejected
+        
+        return {
+            'max_workers': self.max_workers,
+            'max_queue_depth': self.max_queue_depth,
+            'process_workers': self.process_workers,
+            'running': min(active, self.max_workers),
+            'queued': max(0, active - self.max_workers),
+            'rejected': rejected
+        }
+    
+    def shutdown(self, wait: bool = False):
+        """Stop accepting work and release executor resources"""
+        self.thread_pool.shutdown(wait=wait, cancel_futures=True)
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=wait, cancel_futures=True)
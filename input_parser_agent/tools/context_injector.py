@@ -16,6 +16,13 @@ try:
 except ImportError:
     HAS_GROQ = False
 
+# Share the backend's pooled, rate-limited client when the backend is importable
+try:
+    from utils.llm_client import get_llm_client
+    HAS_SHARED_LLM_CLIENT = True
+except ImportError:
+    HAS_SHARED_LLM_CLIENT = False
+
 @dataclass
 class SessionContext:
     """Session context information"""
@@ -88,6 +95,8 @@ class ContextInjector:
             return None
         
         try:
+            if HAS_SHARED_LLM_CLIENT:
+                return get_llm_client()
             return Groq(api_key=api_key)
         except Exception as e:
             print(f"⚠️  Failed to initialize Groq: {e}")
@@ -8,6 +8,7 @@ import toast from 'react-hot-toast'
 interface ChartState {
   componentCode: string | null
   componentName: string | null
+  chartData: Record<string, any>[]
   isLoading: boolean
   jobId: string | null
   progress: number
@@ -17,6 +18,7 @@ export default function Canvas() {
   const [chartState, setChartState] = useState<ChartState>({
     componentCode: null,
     componentName: null,
+    chartData: [],
     isLoading: false,
     jobId: null,
     progress: 0
@@ -54,7 +56,8 @@ export default function Canvas() {
         isLoading: true,
         progress: 0,
         componentCode: null,
-        componentName: null
+        componentName: null,
+        chartData: []
       }))
 
       // Start chart generation
@@ -67,8 +70,8 @@ export default function Canvas() {
 
       toast.success('Chart generation started!')
 
-      // Poll for results
-      const result = await apiService.pollJobStatus(
+      // Stream progress until the result is ready
+      const result = await apiService.streamJobStatus(
         jobResponse.job_id,
         (status) => {
           setChartState(prev => ({
@@ -94,8 +97,8 @@ export default function Canvas() {
       
       // Extract component name from the code using regex
       const extractComponentName = (code: string): string => {
-        // Match pattern: const ComponentName = () => {
-        const componentNameMatch = code.match(/const\s+(\w+)\s*=\s*\(\s*\)\s*=>\s*{/)
+        // Match pattern: const ComponentName = () => { or const ComponentName = ({ data }) => {
+        const componentNameMatch = code.match(/const\s+(\w+)\s*=\s*\(\s*(?:\{[^)]*\})?\s*\)\s*=>\s*{/)
         if (componentNameMatch && componentNameMatch[1]) {
           return componentNameMatch[1]
         }
@@ -166,6 +169,7 @@ export default function Canvas() {
         ...prev,
         componentCode: result,
         componentName: componentName,
+        chartData: finalStatus.chart_data || [],
         isLoading: false,
         progress: 100
       }))
@@ -252,6 +256,7 @@ export default function Canvas() {
           <ComponentRenderer 
             componentCode={chartState.componentCode}
             componentName={chartState.componentName}
+            data={chartState.chartData}
           />
         )}
 
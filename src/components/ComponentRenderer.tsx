@@ -8,6 +8,7 @@ import toast from 'react-hot-toast'
 interface ComponentRendererProps {
   componentCode: string
   componentName: string
+  data?: Record<string, any>[]
 }
 
 // Make Recharts components available globally for the dynamic components
@@ -40,8 +41,8 @@ const rechartsComponents = {
   // Add more as needed
 }
 
-export default function ComponentRenderer({ componentCode, componentName }: ComponentRendererProps) {
-  const [RenderedComponent, setRenderedComponent] = useState<React.ComponentType | null>(null)
+export default function ComponentRenderer({ componentCode, componentName, data = [] }: ComponentRendererProps) {
+  const [RenderedComponent, setRenderedComponent] = useState<React.ComponentType<{ data: Record<string, any>[] }> | null>(null)
   const [error, setError] = useState<string | null>(null)
   const [isLoading, setIsLoading] = useState(true)
   const isMountedRef = useRef(true)
@@ -167,7 +168,7 @@ export default function ComponentRenderer({ componentCode, componentName }: Comp
         console.log('Component code preview:', componentCode.substring(0, 200) + '...')
 
         // Step 6: Create a wrapper component with error boundary and debugging
-        const SafeComponent = () => {
+        const SafeComponent = ({ data }: { data: Record<string, any>[] }) => {
           const [hasError, setHasError] = useState(false)
           const [debugInfo, setDebugInfo] = useState<string>('')
 
@@ -202,7 +203,7 @@ export default function ComponentRenderer({ componentCode, componentName }: Comp
 
           try {
             console.log('Attempting to render component...')
-            const result = <Component />
+            const result = <Component data={data} />
             console.log('Component rendered, result:', result)
             
             // Debug: Check what the component actually rendered
@@ -361,7 +362,7 @@ export default function ComponentRenderer({ componentCode, componentName }: Comp
             .bg-gray-100 { background-color: #f3f4f6 !important; }
             .rounded { border-radius: 0.25rem !important; }
           `}</style>
-          <RenderedComponent />
+          <RenderedComponent data={data} />
         </div>
       </React.Suspense>
     </div>
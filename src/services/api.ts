@@ -3,6 +3,7 @@ const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/a
 export interface ChartGenerationRequest {
   prompt: string;
   container_id?: number;
+  generation_mode?: 'auto' | 'template' | 'llm';
 }
 
 export interface AsyncJobResponse {
@@ -16,6 +17,8 @@ export interface JobStatusResponse {
   status: 'pending' | 'processing' | 'completed' | 'failed';
   progress?: number;
   result?: string;
+  chart_data?: Record<string, any>[];
+  partial_result?: string;
   error_message?: string;
   created_at: string;
   completed_at?: string;
@@ -107,6 +110,53 @@ class ApiService {
     }
   }
 
+  // Stream job status over Server-Sent Events, falling back to polling if the stream fails
+  async streamJobStatus(
+    jobId: string,
+    onProgress?: (status: JobStatusResponse) => void
+  ): Promise<string> {
+    if (typeof window === 'undefined' || typeof EventSource === 'undefined') {
+      return this.pollJobStatus(jobId, onProgress);
+    }
+
+    return new Promise((resolve, reject) => {
+      const source = new EventSource(`${API_BASE_URL}/job-events/${jobId}`);
+      let settled = false;
+
+      const settle = (callback: () => void) => {
+        settled = true;
+        source.close();
+        callback();
+      };
+
+      source.onmessage = (event: MessageEvent) => {
+        const status: JobStatusResponse = JSON.parse(event.data);
+
+        if (onProgress) {
+          onProgress(status);
+        }
+
+        if (status.status === 'completed') {
+          if (status.result) {
+            settle(() => resolve(status.result as string));
+          } else {
+            settle(() => reject(new Error('Job completed but no result returned')));
+          }
+        } else if (status.status === 'failed') {
+          settle(() => reject(new Error(status.error_message || 'Job failed')));
+        }
+      };
+
+      source.onerror = () => {
+        if (settled) {
+          return;
+        }
+        // Stream unavailable or dropped - continue with polling
+        settle(() => this.pollJobStatus(jobId, onProgress).then(resolve, reject));
+      };
+    });
+  }
+
   // Utility method for polling job status
   async pollJobStatus(
     jobId: string, 